@@ -7,6 +7,7 @@ from alembic import context
 
 from app.core.config import get_settings
 from app.core.database import Base
+import app.models  # noqa: F401  registra todos os modelos para o autogenerate
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -38,7 +39,7 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = get_settings().database_url
+    url = get_settings().DATABASE_URL
     context.configure(
         url=url,
         target_metadata=target_metadata,
@@ -58,7 +59,7 @@ def run_migrations_online() -> None:
 
     """
     configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = get_settings().database_url
+    configuration["sqlalchemy.url"] = get_settings().DATABASE_URL
     connectable = engine_from_config(
         configuration,
         prefix="sqlalchemy.",
@@ -0,0 +1,26 @@
+"""index processing_logs.user_id for the per-user counts in AdminService
+
+Revision ID: 0df3ece0368b
+Revises: ec52249cb45f
+Create Date: 2026-10-18 06:38:33.550316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0df3ece0368b'
+down_revision: Union[str, None] = 'ec52249cb45f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_processing_logs_user_id'), 'processing_logs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_processing_logs_user_id'), table_name='processing_logs')
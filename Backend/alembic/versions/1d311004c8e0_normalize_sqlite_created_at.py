@@ -0,0 +1,46 @@
+"""normalize created_at on SQLite to a single text format
+
+No SQLite, CURRENT_TIMESTAMP gravava 'AAAA-MM-DD HH:MM:SS' e o SQLAlchemy
+'AAAA-MM-DD HH:MM:SS.ffffff'; a paginação por cursor compara a coluna como
+texto, direto no índice (created_at, id). Completa as linhas antigas e troca o
+server_default por app.core.database.utcnow. Nos demais bancos não faz nada.
+
+Revision ID: 1d311004c8e0
+Revises: 0df3ece0368b
+Create Date: 2026-10-18 06:46:57.498144
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d311004c8e0'
+down_revision: Union[str, None] = '0df3ece0368b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'forms', 'form_responses', 'processing_logs')
+SQLITE_NOW = "(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
+
+def _set_default(default: str) -> None:
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column('created_at', existing_type=sa.DateTime(timezone=True), server_default=sa.text(default))
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+    _set_default(SQLITE_NOW)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _set_default('CURRENT_TIMESTAMP')
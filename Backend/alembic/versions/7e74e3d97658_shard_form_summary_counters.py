@@ -0,0 +1,47 @@
+"""shard form summary counters
+
+Acrescenta form_summary_counters.shard à chave única: cada envio soma seus
+incrementos num shard sorteado, e a leitura agrupa os shards. Os contadores
+existentes ficam no shard 0; o downgrade junta os shards antes de restaurar a
+chave antiga.
+
+Revision ID: 7e74e3d97658
+Revises: dfab491ec0d0
+Create Date: 2026-10-18 06:54:02.683513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e74e3d97658'
+down_revision: Union[str, None] = 'dfab491ec0d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEY = ['form_id', 'kind', 'field_id', 'bucket']
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('form_summary_counters') as batch:
+        batch.add_column(sa.Column('shard', sa.SmallInteger(), server_default='0', nullable=False))
+        batch.drop_constraint('uq_form_summary_counters_key', type_='unique')
+        batch.create_unique_constraint('uq_form_summary_counters_key', [*KEY, 'shard'])
+
+
+def downgrade() -> None:
+    # Soma os shards numa linha nova (shard -1) e apaga as demais
+    op.execute(
+        "INSERT INTO form_summary_counters "
+        "(form_id, kind, field_id, bucket, shard, count, value_sum, value_min, value_max) "
+        "SELECT form_id, kind, field_id, bucket, -1, SUM(count), SUM(value_sum), MIN(value_min), MAX(value_max) "
+        "FROM form_summary_counters GROUP BY form_id, kind, field_id, bucket"
+    )
+    op.execute("DELETE FROM form_summary_counters WHERE shard != -1")
+    with op.batch_alter_table('form_summary_counters') as batch:
+        batch.drop_constraint('uq_form_summary_counters_key', type_='unique')
+        batch.create_unique_constraint('uq_form_summary_counters_key', KEY)
+        batch.drop_column('shard')
@@ -0,0 +1,53 @@
+"""store forms fields version
+
+Guarda em forms.fields_version o hash dos campos, calculado na escrita, para
+que o cache de validadores não serialize e hasheie o JSON a cada submissão.
+Preenche as linhas existentes com o mesmo hash de app.models.form.
+
+Revision ID: dfab491ec0d0
+Revises: 1d311004c8e0
+Create Date: 2026-10-18 06:50:46.149151
+
+"""
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dfab491ec0d0'
+down_revision: Union[str, None] = '1d311004c8e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _fields_version(fields) -> str:
+    # Cópia de app.models.form.fields_version: a migração não importa o modelo
+    payload = json.dumps(fields or [], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('forms', sa.Column('fields_version', sa.String(length=32), nullable=True))
+    _backfill_fields_version()
+
+
+def downgrade() -> None:
+    op.drop_column('forms', 'fields_version')
+
+
+def _backfill_fields_version() -> None:
+    forms = sa.table(
+        'forms',
+        sa.column('id', sa.Integer),
+        sa.column('fields', sa.JSON),
+        sa.column('fields_version', sa.String),
+    )
+    bind = op.get_bind()
+    for form_id, fields in bind.execute(sa.select(forms.c.id, forms.c.fields)).all():
+        bind.execute(
+            forms.update().where(forms.c.id == form_id).values(fields_version=_fields_version(fields))
+        )
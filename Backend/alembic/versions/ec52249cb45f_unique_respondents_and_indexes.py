@@ -0,0 +1,142 @@
+"""unique respondents, normalized answers, summary counters and keyset indexes
+
+Adiciona form_responses.unique_respondent_id, preenchido como em
+FormService._unique_respondents_statement (a primeira resposta de cada
+usuário nos formulários com one_response_per_user), antes de criar o índice
+único. response_answers e form_summary_counters começam vazias: recrie-as por
+formulário com ResponseAnswerService.rebuild e POST /forms/{id}/summary/rebuild.
+
+Revision ID: ec52249cb45f
+Revises: fad329416961
+Create Date: 2026-10-18 06:36:56.917152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ec52249cb45f'
+down_revision: Union[str, None] = 'fad329416961'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    op.create_table('security_audit_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('admin_id', sa.Integer(), nullable=False),
+    sa.Column('target_user_id', sa.Integer(), nullable=True),
+    sa.Column('details', sa.JSON(), nullable=False),
+    sa.Column('ip_address', sa.String(length=45), nullable=False),
+    sa.Column('geolocation', sa.JSON(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_security_audit_logs_timestamp_admin_id', 'security_audit_logs', ['timestamp', 'admin_id'], unique=False)
+    op.create_table('revoked_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(length=64), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('jti')
+    )
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+    op.create_table('form_summary_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('form_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('field_id', sa.String(length=100), nullable=False),
+    sa.Column('bucket', sa.String(length=255), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('value_sum', sa.Float(), nullable=True),
+    sa.Column('value_min', sa.Float(), nullable=True),
+    sa.Column('value_max', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('form_id', 'kind', 'field_id', 'bucket', name='uq_form_summary_counters_key')
+    )
+    op.create_table('response_answers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('response_id', sa.Integer(), nullable=False),
+    sa.Column('form_id', sa.Integer(), nullable=False),
+    sa.Column('field_id', sa.String(length=100), nullable=False),
+    sa.Column('value_text', sa.String(length=255), nullable=True),
+    sa.Column('value_number', sa.Float(), nullable=True),
+    sa.Column('value_date', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['response_id'], ['form_responses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_response_answers_form_id_field_id_value_number', 'response_answers', ['form_id', 'field_id', 'value_number'], unique=False)
+    op.create_index('ix_response_answers_form_id_field_id_value_text', 'response_answers', ['form_id', 'field_id', 'value_text'], unique=False)
+    op.create_index(op.f('ix_response_answers_response_id'), 'response_answers', ['response_id'], unique=False)
+    op.add_column('form_responses', sa.Column('unique_respondent_id', sa.Integer(), nullable=True))
+    _backfill_unique_respondents()
+    op.create_index('ix_form_responses_form_id_created_at_id', 'form_responses', ['form_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_form_responses_form_id_id', 'form_responses', ['form_id', 'id'], unique=False)
+    op.create_index('uq_form_responses_unique_respondent', 'form_responses', ['form_id', 'unique_respondent_id'], unique=True)
+    op.create_index('ix_forms_created_at_id', 'forms', ['created_at', 'id'], unique=False)
+    op.create_index('ix_forms_owner_id_created_at_id', 'forms', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_processing_logs_created_at_id', 'processing_logs', ['created_at', 'id'], unique=False)
+    op.create_index(op.f('ix_user_sessions_user_id'), 'user_sessions', ['user_id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def _backfill_unique_respondents() -> None:
+    forms = sa.table('forms', sa.column('id', sa.Integer), sa.column('settings', sa.JSON))
+    responses = sa.table(
+        'form_responses',
+        sa.column('id', sa.Integer),
+        sa.column('form_id', sa.Integer),
+        sa.column('respondent_id', sa.Integer),
+        sa.column('unique_respondent_id', sa.Integer),
+    )
+    bind = op.get_bind()
+    # O padrão de one_response_per_user é True (FormService._enforces_one_response)
+    enforced = [
+        form_id for form_id, settings in bind.execute(sa.select(forms.c.id, forms.c.settings))
+        if (settings or {}).get('one_response_per_user', True)
+    ]
+    for start in range(0, len(enforced), BACKFILL_BATCH_SIZE):
+        form_ids = enforced[start:start + BACKFILL_BATCH_SIZE]
+        # Respostas duplicadas anteriores ficam sem marca para o índice único valer
+        first_responses = (
+            sa.select(sa.func.min(responses.c.id))
+            .where(responses.c.form_id.in_(form_ids), responses.c.respondent_id.is_not(None))
+            .group_by(responses.c.form_id, responses.c.respondent_id)
+        )
+        bind.execute(
+            responses.update()
+            .where(responses.c.id.in_(first_responses))
+            .values(unique_respondent_id=responses.c.respondent_id)
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index(op.f('ix_user_sessions_user_id'), table_name='user_sessions')
+    op.drop_index('ix_processing_logs_created_at_id', table_name='processing_logs')
+    op.drop_index('ix_forms_owner_id_created_at_id', table_name='forms')
+    op.drop_index('ix_forms_created_at_id', table_name='forms')
+    op.drop_index('uq_form_responses_unique_respondent', table_name='form_responses')
+    op.drop_index('ix_form_responses_form_id_id', table_name='form_responses')
+    op.drop_index('ix_form_responses_form_id_created_at_id', table_name='form_responses')
+    op.drop_column('form_responses', 'unique_respondent_id')
+    op.drop_index(op.f('ix_response_answers_response_id'), table_name='response_answers')
+    op.drop_index('ix_response_answers_form_id_field_id_value_text', table_name='response_answers')
+    op.drop_index('ix_response_answers_form_id_field_id_value_number', table_name='response_answers')
+    op.drop_table('response_answers')
+    op.drop_table('form_summary_counters')
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+    op.drop_index('ix_security_audit_logs_timestamp_admin_id', table_name='security_audit_logs')
+    op.drop_table('security_audit_logs')
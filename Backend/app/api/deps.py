@@ -1,12 +1,12 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from sqlalchemy.orm import Session
 from app.core.config import get_settings
 from app.core.database import get_db
-from app.models.user import User
-from app.services.auth_service import AuthService
+from app.services.auth_cache import AuthIdentity, identity_cache, subject_user_id, token_cache
+from app.services.token_revocation import revocation_store
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -14,9 +14,12 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
-) -> User:
+) -> AuthIdentity:
     """
     Obtém o usuário atual a partir do token JWT
+
+    Claims e atributos de autorização vêm de cache; o banco só é consultado
+    na primeira vez que o token/usuário é visto.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -25,26 +28,27 @@ def get_current_user(
     )
     
     try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
+        payload = token_cache.decode(token)
     except JWTError:
         raise credentials_exception
+
+    user_id = subject_user_id(payload)
+    if user_id is None:
+        raise credentials_exception
+
+    revocation_store.sync(db)
+    if revocation_store.is_revoked(payload):
+        raise credentials_exception
         
-    user = db.query(User).filter(User.id == user_id).first()
+    user = identity_cache.get(db, user_id)
     if user is None:
         raise credentials_exception
         
     return user
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthIdentity = Depends(get_current_user),
+) -> AuthIdentity:
     """
     Verifica se o usuário atual está ativo
     """
@@ -56,8 +60,8 @@ def get_current_active_user(
     return current_user
 
 def get_current_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthIdentity = Depends(get_current_user),
+) -> AuthIdentity:
     """
     Verifica se o usuário atual é um administrador
     """
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.auth_service import AuthService
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import oauth2_scheme
+from app.core.database import get_async_db
+from app.services.auth_cache import subject_user_id, token_cache
+from app.services.auth_service import AsyncAuthService
+from app.services.token_revocation import revocation_store
 from app.schemas.token import Token
 from app.schemas.user import UserCreate, UserResponse
 
@@ -10,31 +14,37 @@ router = APIRouter()
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login para obter token de acesso
     """
-    user = AuthService.authenticate_user(db, form_data.username, form_data.password)
+    user = await AsyncAuthService.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return AuthService.create_token(user)
+    return await AsyncAuthService.create_session_tokens(
+        db,
+        user,
+        request.headers.get("user-agent", ""),
+        request.client.host if request.client else ""
+    )
 
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
-    current_token: str,
-    db: Session = Depends(get_db)
+    refresh_token: str = Body(..., embed=True),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Atualiza o token de acesso
+    Troca o refresh token por um novo par de tokens (rotação)
     """
     try:
-        new_token = AuthService.refresh_token(db, current_token)
+        new_token = await AsyncAuthService.refresh_token(db, refresh_token)
         return new_token
     except ValueError as e:
         raise HTTPException(
@@ -43,16 +53,39 @@ async def refresh_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+@router.post("/logout")
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Revoga o token de acesso atual e encerra a sessão de refresh
+    """
+    try:
+        claims = token_cache.decode(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    await revocation_store.revoke_token_async(db, claims)
+    token_cache.discard(token)
+    user_id = subject_user_id(claims)
+    if claims.get("sid") is not None and user_id is not None:
+        await AsyncAuthService.end_session(db, user_id, claims["sid"])
+    return {"message": "Logged out"}
+
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Registra um novo usuário
     """
     # Verifica se o email já está em uso
-    if AuthService.get_user_by_email(db, user_data.email):
+    if await AsyncAuthService.get_user_by_email(db, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -60,7 +93,7 @@ async def register(
     
     # Cria o usuário
     try:
-        user = AuthService.create_user(db, user_data)
+        user = await AsyncAuthService.create_user(db, user_data)
         return user
     except ValueError as e:
         raise HTTPException(
@@ -1,85 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.core.database import get_db
-from app.services.form_service import FormService
-from app.schemas.form import Form, FormCreate, FormUpdate, FormResponse
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Optional, Tuple
+from app.core.config import get_settings
+from app.core.database import get_async_db
+from app.services.form_service import AsyncFormService
+from app.schemas.form import (
+    Form,
+    FormCreate,
+    FormUpdate,
+    FormResponse,
+    FormSummary,
+    CrossTab,
+    PercentileSummary,
+    DateHistogram,
+    BulkSubmissionError,
+    BulkSubmissionResult,
+)
 from app.middleware.auth_middleware import verify_token
+from app.utils.compression import select_encoding
+from app.utils.etag import CACHE_CONTROL, encoded_etag, etag_matches, make_etag, not_modified
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
+settings = get_settings()
 router = APIRouter()
 
 @router.post("/", response_model=Form)
 async def create_form(
     form_data: FormCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(verify_token)
 ):
     """Cria um novo formulário."""
-    return FormService.create_form(db, form_data, current_user["id"])
+    return await AsyncFormService.create_form(db, form_data, current_user["id"])
 
 @router.get("/", response_model=List[Form])
 async def list_forms(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[dict] = Depends(verify_token)
 ):
-    """Lista todos os formulários acessíveis ao usuário."""
+    """
+    Lista todos os formulários acessíveis ao usuário.
+
+    Com `cursor` (vazio na primeira página) usa paginação por cursor e
+    devolve o cursor da próxima página no cabeçalho X-Next-Cursor.
+    """
     user_id = current_user["id"] if current_user else None
-    return FormService.get_forms(db, user_id, skip, limit)
+    last_updated, total = await AsyncFormService.get_forms_version(db, user_id)
+    etag = make_etag("forms", user_id, last_updated, total, skip, limit, cursor, weak=True)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    if cursor is None:
+        return await AsyncFormService.get_forms(db, user_id, skip, limit)
+
+    forms, next_cursor = await AsyncFormService.get_forms_page(db, user_id, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return forms
 
 @router.get("/{form_id}", response_model=Form)
 async def get_form(
     form_id: int,
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[dict] = Depends(verify_token)
 ):
     """Obtém um formulário específico."""
     user_id = current_user["id"] if current_user else None
-    return FormService.get_form(db, form_id, user_id)
+    cached = await AsyncFormService.get_form_definition(db, form_id, user_id)
+    encoding = select_encoding(accept_encoding)
+    if len(cached.body) < settings.COMPRESSION_MINIMUM_SIZE:
+        encoding = None
+    etag = encoded_etag(cached.etag, encoding)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    # Corpo já serializado (e comprimido) no cache: evita validar,
+    # serializar e comprimir a cada visualização
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    body = cached.body
+    if encoding:
+        body = cached.encoded(encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.get("/user/forms", response_model=List[Form])
 async def get_user_forms(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(verify_token)
 ):
     """Lista todos os formulários do usuário."""
-    return FormService.get_user_forms(db, current_user["id"], skip, limit)
+    last_updated, total = await AsyncFormService.get_user_forms_version(db, current_user["id"])
+    etag = make_etag("user-forms", current_user["id"], last_updated, total, skip, limit, cursor, weak=True)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    if cursor is None:
+        return await AsyncFormService.get_user_forms(db, current_user["id"], skip, limit)
+
+    forms, next_cursor = await AsyncFormService.get_user_forms_page(db, current_user["id"], cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return forms
 
 @router.put("/{form_id}", response_model=Form)
 async def update_form(
     form_id: int,
     form_data: FormUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(verify_token)
 ):
     """Atualiza um formulário existente."""
-    return FormService.update_form(db, form_id, form_data, current_user["id"])
+    return await AsyncFormService.update_form(db, form_id, form_data, current_user["id"])
 
 @router.delete("/{form_id}")
 async def delete_form(
     form_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(verify_token)
 ):
     """Exclui um formulário."""
-    await FormService.delete_form(db, form_id, current_user["id"])
+    await AsyncFormService.delete_form(db, form_id, current_user["id"])
     return {"message": "Form deleted successfully"}
 
 @router.post("/{form_id}/submit", response_model=FormResponse)
 async def submit_form_response(
     form_id: int,
     answers: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[dict] = Depends(verify_token),
     email: Optional[str] = None,
     metadata: Optional[dict] = None
 ):
     """Submete uma resposta para um formulário."""
     user_id = current_user["id"] if current_user else None
-    return await FormService.submit_form_response(
+    return await AsyncFormService.submit_response(
         db,
         form_id,
         answers,
@@ -88,19 +160,180 @@ async def submit_form_response(
         metadata
     )
 
+def _parse_bulk_body(
+    body: bytes,
+    content_type: str
+) -> Tuple[List[Tuple[int, Any]], List[BulkSubmissionError]]:
+    """Lê um lote em JSON (array) ou NDJSON (um objeto por linha)."""
+    items: List[Tuple[int, Any]] = []
+    errors: List[BulkSubmissionError] = []
+
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        lines = [line for line in body.splitlines() if line.strip()]
+        for index, line in enumerate(lines):
+            try:
+                items.append((index, json.loads(line)))
+            except ValueError:
+                errors.append(BulkSubmissionError(index=index, detail="Invalid JSON"))
+        return items, errors
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid JSON body"
+        )
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array of submissions"
+        )
+    return list(enumerate(payload)), errors
+
+async def _read_bulk_body(request: Request) -> bytes:
+    """Lê o corpo do lote recusando-o assim que passar de BULK_SUBMISSION_MAX_BYTES."""
+    limit = settings.BULK_SUBMISSION_MAX_BYTES
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"A batch may contain at most {limit} bytes"
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > limit:
+        raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+@router.post("/{form_id}/submit/bulk", response_model=BulkSubmissionResult)
+async def submit_form_responses_bulk(
+    form_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(verify_token)
+):
+    """Submete um lote de respostas (JSON array ou NDJSON); restrito ao dono do formulário ou a administradores."""
+    items, parse_errors = _parse_bulk_body(
+        await _read_bulk_body(request),
+        request.headers.get("content-type", "")
+    )
+    if len(items) + len(parse_errors) > settings.BULK_SUBMISSION_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.BULK_SUBMISSION_MAX_ITEMS} submissions"
+        )
+
+    result = await AsyncFormService.submit_responses_bulk(
+        db, form_id, items, current_user["id"], current_user.get("is_admin", False)
+    )
+    if parse_errors:
+        result.errors = sorted(parse_errors + result.errors, key=lambda error: error.index)
+        result.rejected += len(parse_errors)
+    return result
+
 @router.get("/{form_id}/responses", response_model=List[FormResponse])
 async def get_form_responses(
     form_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(verify_token)
 ):
     """Obtém todas as respostas de um formulário."""
-    return await FormService.get_form_responses(
+    if cursor is None:
+        return await AsyncFormService.get_form_responses(
+            db,
+            form_id,
+            current_user["id"],
+            skip,
+            limit
+        )
+
+    responses, next_cursor = await AsyncFormService.get_form_responses_page(
         db,
         form_id,
         current_user["id"],
-        skip,
+        cursor,
         limit
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return responses
+
+@router.get("/{form_id}/summary", response_model=FormSummary)
+async def get_form_summary(
+    form_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(verify_token)
+):
+    """Resumo das respostas: histogramas por opção, estatísticas numéricas e respostas por dia."""
+    return await AsyncFormService.get_summary(db, form_id, current_user["id"])
+
+@router.post("/{form_id}/summary/rebuild", response_model=FormSummary)
+async def rebuild_form_summary(
+    form_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(verify_token)
+):
+    """Recalcula os contadores do resumo a partir de todas as respostas."""
+    return await AsyncFormService.rebuild_summary(db, form_id, current_user["id"])
+
+@router.get("/{form_id}/analytics/crosstab", response_model=CrossTab)
+async def get_form_crosstab(
+    form_id: int,
+    row_field: str,
+    column_field: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(verify_token)
+):
+    """Tabulação cruzada entre dois campos de escolha."""
+    snapshot = await AsyncFormService.get_analytics_snapshot(db, form_id, current_user["id"])
+    return snapshot.crosstab(row_field, column_field)
+
+@router.get("/{form_id}/analytics/percentiles", response_model=PercentileSummary)
+async def get_form_percentiles(
+    form_id: int,
+    field_id: str,
+    q: List[float] = Query(default=[25, 50, 75, 90, 99]),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(verify_token)
+):
+    """Percentis de um campo numérico."""
+    snapshot = await AsyncFormService.get_analytics_snapshot(db, form_id, current_user["id"])
+    return snapshot.percentiles(field_id, q)
+
+@router.get("/{form_id}/analytics/histogram", response_model=DateHistogram)
+async def get_form_date_histogram(
+    form_id: int,
+    field_id: Optional[str] = None,
+    interval: str = "day",
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(verify_token)
+):
+    """Histograma por data de um campo de data ou, sem field_id, da data de envio."""
+    snapshot = await AsyncFormService.get_analytics_snapshot(db, form_id, current_user["id"])
+    return snapshot.date_histogram(field_id, interval)
+
+@router.get("/{form_id}/responses/export")
+async def export_form_responses(
+    form_id: int,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(verify_token)
+):
+    """Exporta todas as respostas de um formulário (CSV ou NDJSON) em streaming."""
+    content = await AsyncFormService.export_responses(db, form_id, current_user["id"], export_format)
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="form-{form_id}-responses.{export_format}"'
+        }
+    )
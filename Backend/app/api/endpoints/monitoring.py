@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Response, status
+from fastapi.responses import JSONResponse
+from app.core.instrumentation import metrics
+from app.services.health_service import HealthService
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Métricas do processo no formato de exposição do Prometheus."""
+    return Response(content=metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/health")
+def health():
+    """Liveness: o processo está respondendo."""
+    return HealthService.liveness()
+
+
+@router.get("/health/ready")
+def readiness():
+    """Readiness: pools, filas e event loop com folga; 503 caso contrário."""
+    report = HealthService.readiness()
+    status_code = status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(report, status_code=status_code)
@@ -1,31 +1,40 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_admin_user
-from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.services.auth_cache import AuthIdentity, identity_cache
 from app.services.user_service import UserService
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
 @router.get("/users", response_model=List[UserResponse])
 def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthIdentity = Depends(get_current_admin_user)
 ):
     """
     Retorna lista de usuários (apenas para administradores)
     """
-    users = UserService.get_users(db, skip=skip, limit=limit)
+    if cursor is None:
+        users = UserService.get_users(db, skip=skip, limit=limit)
+        return users
+
+    users, next_cursor = UserService.get_users_page(db, cursor=cursor, limit=limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return users
 
 @router.post("/users", response_model=UserResponse)
 def create_user(
     user: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthIdentity = Depends(get_current_admin_user)
 ):
     """
     Cria um novo usuário (apenas para administradores)
@@ -42,7 +51,7 @@ def create_user(
 def get_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthIdentity = Depends(get_current_admin_user)
 ):
     """
     Retorna detalhes de um usuário específico (apenas para administradores)
@@ -60,7 +69,7 @@ def update_user(
     user_id: int,
     user: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthIdentity = Depends(get_current_admin_user)
 ):
     """
     Atualiza um usuário (apenas para administradores)
@@ -71,13 +80,15 @@ def update_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return UserService.update_user(db=db, user_id=user_id, user=user)
+    updated_user = UserService.update_user(db=db, user_id=user_id, user=user)
+    identity_cache.invalidate(user_id)
+    return updated_user
 
 @router.delete("/users/{user_id}")
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthIdentity = Depends(get_current_admin_user)
 ):
     """
     Remove um usuário (apenas para administradores)
@@ -89,4 +100,5 @@ def delete_user(
             detail="User not found"
         )
     UserService.delete_user(db=db, user_id=user_id)
+    identity_cache.invalidate(user_id)
     return {"message": "User deleted successfully"}
@@ -12,10 +12,94 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     
+    PASSWORD_HASH_ROUNDS: int = 12  # custo do bcrypt; alterar força rehash no login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_IDENTITY_CACHE_SIZE: int = 10000
+    AUTH_IDENTITY_CACHE_TTL: int = 30  # segundos
+    TOKEN_REVOCATION_SYNC_INTERVAL: int = 5  # segundos entre leituras da tabela de revogação
+
     # Configurações do banco de dados
     DATABASE_URL: str = "sqlite:///./app.db"
+    DB_ECHO: bool = False  # True para debug SQL
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # segundos
+    DB_POOL_TIMEOUT: int = 30  # segundos
+    DB_CREATE_TABLES: bool = True  # create_all no startup; desligue quando o esquema vier do Alembic
+
+    # Ajustes do SQLite (aplicados via PRAGMA a cada conexão)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Configurações de cache
+    FORM_VALIDATOR_CACHE_SIZE: int = 512
+    FORM_CACHE_SIZE: int = 1024
+    # Outros workers não recebem a invalidação: o TTL limita por quanto tempo
+    # servem uma definição antiga (inclusive is_public e dono) após uma edição
+    FORM_CACHE_TTL: int = 30  # segundos
+    USER_AGENT_CACHE_SIZE: int = 4096  # User-Agents já interpretados
+
+    # Compressão de respostas (gzip, ou brotli se instalado)
+    COMPRESSION_MINIMUM_SIZE: int = 500  # bytes
+
+    # Tabela normalizada de respostas (response_answers) para agregações em SQL
+    NORMALIZED_ANSWERS_ENABLED: bool = True
+
+    # Snapshots colunares para análises (tabulação cruzada, percentis, histogramas)
+    ANALYTICS_SNAPSHOT_CACHE_SIZE: int = 32
+    ANALYTICS_CHUNK_SIZE: int = 5000
+
+    # Contadores do resumo de respostas, divididos em linhas por formulário para
+    # que envios simultâneos não disputem a mesma linha (somadas na leitura)
+    FORM_SUMMARY_SHARDS: int = 16
+
+    # Respondentes que já enviaram (one_response_per_user), verificados antes do banco
+    SUBMISSION_DEDUP_CACHE_SIZE: int = 100000
+
+    # Configurações de ingestão em lote
+    BULK_SUBMISSION_MAX_ITEMS: int = 10000
+    BULK_SUBMISSION_MAX_BYTES: int = 10 * 1024 * 1024
+
+    # Configurações de exportação
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Limite de requisições (token bucket por IP e por usuário)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "100/minute"
+    RATE_LIMIT_LOGIN: str = "5/minute"
+    RATE_LIMIT_SUBMIT: str = "10/minute"
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | sqlite (compartilhado entre workers)
+    RATE_LIMIT_SQLITE_PATH: str = "./ratelimit.db"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    
+    # Log de auditoria (gravado em lote em segundo plano)
+    AUDIT_LOG_BATCH_SIZE: int = 100
+    AUDIT_LOG_FLUSH_INTERVAL: float = 1.0  # segundos
+    AUDIT_LOG_MAX_QUEUE: int = 10000  # com o banco fora do ar, o excedente é descartado
+    AUDIT_LOG_OVERFLOW: str = "drop"  # drop | block
     
+    # Logs de processamento em modo buffer
+    PROCESSING_LOG_BATCH_SIZE: int = 200
+    PROCESSING_LOG_FLUSH_INTERVAL: float = 1.0  # segundos
+    PROCESSING_LOG_MAX_QUEUE: int = 10000
+    PROCESSING_LOG_OVERFLOW: str = "drop"  # drop | block
+    
+    # Métricas (Prometheus em /metrics) e cabeçalho Server-Timing
+    METRICS_ENABLED: bool = True
+    METRICS_SERVER_TIMING: bool = False
+    METRICS_SLOW_QUERY_MS: float = 100.0
+    METRICS_SLOW_QUERY_SAMPLES: int = 50
+
+    # Probes de saúde (/health e /health/ready)
+    HEALTH_LOOP_LAG_INTERVAL: float = 0.5  # segundos entre medições do atraso do event loop
+    HEALTH_MAX_LOOP_LAG: float = 1.0  # acima disso a instância deixa de estar pronta
+
     # Configurações de CORS
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:3000",  # Frontend
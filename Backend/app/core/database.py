@@ -1,7 +1,13 @@
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
-from sqlalchemy import create_engine
-from app.core.config import get_settings
+from sqlalchemy import DateTime, create_engine, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.config import Settings, get_settings
+from app.core.instrumentation import instrument_engine, metrics
 
 settings = get_settings()
 
@@ -9,17 +15,127 @@ class Base(DeclarativeBase):
     """Base class para todos os modelos SQLAlchemy"""
     pass
 
+class utcnow(FunctionElement):
+    """
+    Instante atual para default/server_default das colunas de data ordenáveis.
+
+    No SQLite as datas são texto: CURRENT_TIMESTAMP grava 'AAAA-MM-DD HH:MM:SS'
+    e o SQLAlchemy grava 'AAAA-MM-DD HH:MM:SS.ffffff'. Gerar sempre o segundo
+    formato deixa a coluna ordenável como está, usando os índices (created_at, id).
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+@compiles(utcnow)
+def _utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    return "(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
+def get_async_database_url(url: str) -> str:
+    """Converte a URL síncrona para o driver assíncrono equivalente."""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url[len("postgres://"):]
+    return url
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+def _engine_options(url: str, settings: Settings) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,  # Verifica a conexão antes de usar
+        "echo": settings.DB_ECHO,
+    }
+
+    if _is_sqlite(url):
+        if not url.startswith("sqlite+aiosqlite"):
+            options["connect_args"] = {"check_same_thread": False}
+        # Bancos em memória usam um pool próprio do dialeto
+        if _is_sqlite_memory(url):
+            return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+def _register_sqlite_pragmas(engine: Engine, settings: Settings, memory: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL evita o fsync do rollback journal a cada commit e permite
+        # leituras concorrentes com uma escrita em andamento
+        if not memory:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.close()
+
+def create_db_engine(settings: Settings) -> Engine:
+    """Cria o engine síncrono a partir das configurações."""
+    url = settings.DATABASE_URL
+    engine = create_engine(url, **_engine_options(url, settings))
+    if _is_sqlite(url):
+        _register_sqlite_pragmas(engine, settings, _is_sqlite_memory(url))
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine, metrics)
+    return engine
+
+def create_async_db_engine(settings: Settings) -> AsyncEngine:
+    """Cria o engine assíncrono (aiosqlite / asyncpg) a partir das configurações."""
+    url = get_async_database_url(settings.DATABASE_URL)
+    options = _engine_options(url, settings)
+    if "pool_size" in options:
+        # O aiosqlite usa NullPool por padrão; o pool precisa ser explícito
+        options["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **options)
+    if _is_sqlite(url):
+        _register_sqlite_pragmas(engine.sync_engine, settings, _is_sqlite_memory(url))
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine.sync_engine, metrics)
+    return engine
+
+def _pool_stats(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    # Apenas QueuePool/AsyncAdaptedQueuePool expõem contadores
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Estatísticas dos pools de conexão para monitoramento."""
+    return {
+        "sync": _pool_stats(engine),
+        "async": _pool_stats(async_engine.sync_engine),
+    }
+
 # Criar o engine do banco de dados
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Apenas para SQLite
-    pool_pre_ping=True,  # Verifica a conexão antes de usar
-    echo=False  # Set to True para debug SQL
-)
+engine = create_db_engine(settings)
 
 # Criar a sessão
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def create_tables(bind: Engine = None) -> None:
+    """Cria as tabelas que faltam. Para desenvolvimento e testes; em produção use o Alembic."""
+    import app.models  # noqa: F401  registra todos os modelos no metadata
+    Base.metadata.create_all(bind=bind or engine)
+
 # Dependency para injeção da sessão do banco de dados
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -27,3 +143,18 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+# Engine assíncrono (aiosqlite / asyncpg) para os endpoints async
+async_engine = create_async_db_engine(settings)
+
+# expire_on_commit=False evita lazy loads implícitos depois do commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Dependency assíncrona para injeção da sessão do banco de dados
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,199 @@
+import hashlib
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Limites superiores (segundos) dos buckets de latência das requisições e do SQL
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Limites dos buckets de comandos SQL por requisição
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SLOW_QUERY_MAX_LENGTH = 1000
+
+LabelSet = Tuple[str, ...]
+
+
+class Histogram:
+    """Histograma cumulativo no formato do Prometheus, uma série por conjunto de labels."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Iterable[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelSet, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: LabelSet, value: float) -> None:
+        # Por série: contagem por bucket (+Inf no fim), soma e total
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> Dict[LabelSet, List[float]]:
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self.snapshot().items()):
+            base = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = base + "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {cumulative:g}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-1]:g}')
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{suffix} {series[-1]:g}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestStats:
+    """Comandos SQL e tempo de banco acumulados durante uma requisição."""
+
+    __slots__ = ("path", "statements", "sql_time")
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.statements = 0
+        self.sql_time = 0.0
+
+
+class SlowQuery:
+    __slots__ = ("statement", "fingerprint", "duration", "path", "timestamp")
+
+    def __init__(self, statement: str, duration: float, path: Optional[str]):
+        self.statement = statement[:SLOW_QUERY_MAX_LENGTH]
+        # Os comandos chegam parametrizados: o texto já identifica a consulta
+        self.fingerprint = hashlib.blake2b(statement.encode(), digest_size=8).hexdigest()
+        self.duration = duration
+        self.path = path
+        self.timestamp = time.time()
+
+
+class Metrics:
+    """Métricas em memória do processo, expostas em /metrics."""
+
+    def __init__(self, slow_query_threshold: float = 0.1, slow_query_samples: int = 50):
+        self.slow_query_threshold = slow_query_threshold
+        self.request_latency = Histogram(
+            "http_request_duration_seconds", "Latência das requisições HTTP por rota.",
+            ("method", "route", "status"), LATENCY_BUCKETS
+        )
+        self.request_statements = Histogram(
+            "http_request_sql_statements", "Comandos SQL executados por requisição.",
+            ("method", "route"), STATEMENT_BUCKETS
+        )
+        self.request_sql_time = Histogram(
+            "http_request_sql_duration_seconds", "Tempo gasto em SQL por requisição.",
+            ("method", "route"), LATENCY_BUCKETS
+        )
+        self.sql_latency = Histogram(
+            "sql_statement_duration_seconds", "Latência de cada comando SQL.", (), LATENCY_BUCKETS
+        )
+        self.slow_queries: Deque[SlowQuery] = deque(maxlen=slow_query_samples)
+        self._current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+    def start_request(self, path: Optional[str] = None) -> RequestStats:
+        """Começa a contar os comandos SQL do contexto atual (a requisição)."""
+        stats = RequestStats(path)
+        self._current.set(stats)
+        return stats
+
+    def record_statement(self, statement: str, duration: float) -> None:
+        self.sql_latency.observe((), duration)
+        stats = self._current.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.sql_time += duration
+        if duration >= self.slow_query_threshold:
+            self.slow_queries.append(SlowQuery(statement, duration, stats.path if stats else None))
+
+    def record_request(self, method: str, route: str, status_code: int, duration: float, stats: RequestStats) -> None:
+        self.request_latency.observe((method, route, str(status_code)), duration)
+        self.request_statements.observe((method, route), stats.statements)
+        self.request_sql_time.observe((method, route), stats.sql_time)
+
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus (0.0.4)."""
+        lines: List[str] = []
+        for histogram in (self.request_latency, self.request_statements, self.request_sql_time, self.sql_latency):
+            lines.extend(histogram.render())
+        lines.append("# HELP sql_slow_queries_sampled Comandos lentos guardados (GET /admin/metrics/slow-queries).")
+        lines.append("# TYPE sql_slow_queries_sampled gauge")
+        lines.append(f"sql_slow_queries_sampled {len(self.slow_queries)}")
+        return "\n".join(lines) + "\n"
+
+    def slow_query_report(self) -> List[Dict[str, Any]]:
+        """Amostras de comandos lentos agrupadas por fingerprint, da mais lenta para a mais rápida."""
+        groups: Dict[str, Dict[str, Any]] = {}
+        for sample in list(self.slow_queries):
+            group = groups.get(sample.fingerprint)
+            if group is None:
+                group = groups[sample.fingerprint] = {
+                    "fingerprint": sample.fingerprint,
+                    "statement": sample.statement,
+                    "count": 0,
+                    "max_duration": 0.0,
+                    "total_duration": 0.0,
+                    "paths": [],
+                    "last_seen": sample.timestamp,
+                }
+            group["count"] += 1
+            group["max_duration"] = max(group["max_duration"], sample.duration)
+            group["total_duration"] += sample.duration
+            group["last_seen"] = max(group["last_seen"], sample.timestamp)
+            if sample.path is not None and sample.path not in group["paths"]:
+                group["paths"].append(sample.path)
+        return sorted(groups.values(), key=lambda group: group["max_duration"], reverse=True)
+
+    def clear(self) -> None:
+        for histogram in (self.request_latency, self.request_statements, self.request_sql_time, self.sql_latency):
+            histogram.clear()
+        self.slow_queries.clear()
+
+
+def instrument_engine(engine: Engine, registry: Metrics) -> None:
+    """Cronometra cada comando executado pelo engine (use engine.sync_engine para async)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        registry.record_statement(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def discard_timer(context):
+        # Comando que falhou não chega ao after_cursor_execute
+        if context.connection is not None and context.cursor is not None:
+            starts = context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+
+metrics = Metrics(settings.METRICS_SLOW_QUERY_MS / 1000, settings.METRICS_SLOW_QUERY_SAMPLES)
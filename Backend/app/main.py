@@ -1,11 +1,48 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import users, auth, forms, processing_logs
+from app.api.deps import get_current_admin_user
+from app.api.endpoints import users, auth, forms, monitoring, processing_logs
 from app.core.config import get_settings
-from app.core.database import Base, engine
+from app.core.database import create_tables
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.routes import admin
+from app.services.audit_log_service import audit_log_writer
+from app.services.health_service import loop_monitor
+from app.services.password_hasher import password_hasher
+from app.services.processing_log_service import processing_log_writer
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepara o esquema, inicia os gravadores em lote e esvazia as filas no desligamento."""
+    # Fora da importação: importar o módulo (workers, testes) não abre conexão
+    if settings.DB_CREATE_TABLES:
+        create_tables()
+    audit_log_writer.start()
+    processing_log_writer.start()
+    loop_monitor.start()
+    yield
+    # Cada etapa roda mesmo que a anterior falhe
+    for name, stop in (
+        ("loop_monitor", loop_monitor.stop),
+        ("processing_log_writer", processing_log_writer.stop),
+        ("audit_log_writer", audit_log_writer.stop),
+    ):
+        try:
+            await stop()
+        except Exception:
+            logger.exception("Falha ao encerrar %s", name)
+    password_hasher.shutdown()
+
+
 # Criar a aplicação FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -13,6 +50,7 @@ app = FastAPI(
     description="API para gerenciamento de formulários e monitoramento de segurança",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Adicionar middleware CORS
@@ -24,14 +62,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comprimir respostas (gzip/brotli) acima do tamanho mínimo
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# Limitar requisições por IP/usuário (roda antes dos demais, exceto as métricas)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, settings=settings)
+
+# Latência e SQL por rota (mais externo: mede também as requisições recusadas)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.METRICS_SERVER_TIMING)
+
 # Incluir rotas
 app.include_router(auth.router, prefix=settings.API_V1_STR, tags=["auth"])
 app.include_router(users.router, prefix=settings.API_V1_STR, tags=["users"])
 app.include_router(forms.router, prefix=settings.API_V1_STR, tags=["forms"])
 app.include_router(processing_logs.router, prefix=settings.API_V1_STR, tags=["logs"])
-
-# Criar tabelas do banco de dados
-Base.metadata.create_all(bind=engine)
+app.include_router(monitoring.router, tags=["monitoring"])
+# Exige administrador em todas as rotas, inclusive nas que não declaram a dependência
+app.include_router(admin.router, prefix=settings.API_V1_STR, dependencies=[Depends(get_current_admin_user)])
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,12 +3,16 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from typing import Optional
-from ..config import get_settings
+from ..core.config import get_settings
 from ..models.user import User
 from sqlalchemy.orm import Session
 from ..database import get_db
+from ..services.auth_cache import identity_cache, subject_user_id, token_cache
+from ..services.token_revocation import issued_at, revocation_store
 import ipaddress
-from user_agents import parse
+import uuid
+from ..utils.fingerprint import FINGERPRINT_HEADERS, request_fingerprint
+from ..utils.user_agent import user_agent_info
 
 security = HTTPBearer()
 settings = get_settings()
@@ -21,17 +25,15 @@ class AdminAuthMiddleware:
     async def __call__(self, credentials: HTTPAuthorizationCredentials = Security(security),
                       db: Session = Depends(get_db)):
         try:
-            # Verifica o token JWT
-            payload = jwt.decode(credentials.credentials, 
-                               self.settings.SECRET_KEY, 
-                               algorithms=[self.settings.ALGORITHM])
+            # Verifica o token JWT (claims em cache até o exp)
+            payload = token_cache.decode(credentials.credentials)
             
-            user_id: int = payload.get("sub")
+            user_id = subject_user_id(payload)
             if user_id is None:
                 raise HTTPException(status_code=401, detail="Token inválido")
 
             # Verifica se o usuário existe e é admin
-            user = db.query(User).filter(User.id == user_id).first()
+            user = identity_cache.get(db, user_id)
             if not user or not user.is_admin:
                 raise HTTPException(status_code=403, 
                                   detail="Acesso restrito a administradores")
@@ -46,16 +48,19 @@ class AdminAuthMiddleware:
                               detail="Não foi possível validar as credenciais")
 
     def _is_token_blacklisted(self, token: str, db: Session) -> bool:
-        # Implementar verificação de blacklist
-        return False
+        revocation_store.sync(db)
+        return revocation_store.is_revoked(token_cache.decode(token))
 
 admin_auth = AdminAuthMiddleware()
 
 def create_admin_token(user_id: int) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    now = datetime.utcnow()
+    expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     data = {
         "sub": str(user_id),
         "exp": expire,
+        "iat": issued_at(now),
+        "jti": uuid.uuid4().hex,
         "type": "admin"
     }
     return jwt.encode(data, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -70,13 +75,15 @@ def validate_ip_address(ip: str) -> bool:
 def get_client_info(request) -> dict:
     """Extrai informações seguras do cliente"""
     user_agent_string = request.headers.get("user-agent", "")
-    user_agent = parse(user_agent_string)
+    user_agent = user_agent_info(user_agent_string)
     
     return {
         "ip": request.client.host,
         "user_agent": user_agent_string,
-        "browser": user_agent.browser.family,
-        "os": user_agent.os.family,
-        "device": user_agent.device.family,
-        "headers": dict(request.headers),
+        "browser": user_agent.browser,
+        "os": user_agent.os,
+        "device": user_agent.device,
+        "fingerprint": request_fingerprint(request),
+        # Só os cabeçalhos da fingerprint: nada de Authorization ou Cookie
+        "headers": {name: request.headers[name] for name in FINGERPRINT_HEADERS if name in request.headers},
     }
@@ -1,7 +1,9 @@
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.services.auth_service import AuthService
-from app.core.database import SessionLocal
+from jose import JWTError
+from app.core.database import AsyncSessionLocal
+from app.services.auth_cache import identity_cache, subject_user_id, token_cache
+from app.services.token_revocation import revocation_store
 
 security = HTTPBearer()
 
@@ -12,14 +14,34 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = security) ->
             detail="Invalid authorization code."
         )
 
-    db = SessionLocal()
     try:
-        user = AuthService.get_current_user(db, credentials.credentials)
-        return {"user": user}
-    except HTTPException as e:
-        raise e
-    finally:
-        db.close()
+        payload = token_cache.decode(credentials.credentials)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+
+    user_id = subject_user_id(payload)
+    user = None
+    if user_id is not None:
+        user = identity_cache.peek(user_id)
+        if user is None or revocation_store.needs_sync():
+            # Só abre sessão quando algum dos caches precisa do banco
+            async with AsyncSessionLocal() as db:
+                await revocation_store.sync_async(db)
+                user = await identity_cache.get_async(db, user_id)
+    if user is None or revocation_store.is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return user.as_dict()
 
 class AuthMiddleware:
     async def __call__(self, request: Request, call_next):
@@ -0,0 +1,65 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.instrumentation import Metrics, RequestStats, metrics
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """Caminho declarado da rota (ex.: /api/v1/forms/{form_id}), para não explodir a cardinalidade."""
+    router = getattr(scope.get("app"), "router", None)
+    partial = None
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+def server_timing(stats: RequestStats, duration: float) -> str:
+    return (
+        f"app;dur={duration * 1000:.1f}, "
+        f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.statements} queries"'
+    )
+
+
+class MetricsMiddleware:
+    """
+    Mede latência, número de comandos SQL e tempo de SQL de cada requisição,
+    agrupados por rota. Com server_timing, devolve os valores no cabeçalho
+    Server-Timing (visível nas ferramentas de desenvolvedor do navegador).
+    """
+
+    def __init__(self, app: ASGIApp, registry: Metrics = metrics, server_timing: bool = False):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = self.registry.start_request(scope.get("path"))
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(stats, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            self.registry.record_request(
+                scope["method"], route_template(scope), status_code, time.perf_counter() - started, stats
+            )
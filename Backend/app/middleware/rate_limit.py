@@ -0,0 +1,257 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Pattern, Sequence, Tuple
+import anyio
+from jose import JWTError
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import Settings
+from app.services.auth_cache import token_cache
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Sondas de liveness/readiness e o scrape de métricas não podem receber 429
+MONITORING_PATHS = r"^/(health(/ready)?|metrics)/?$"
+
+
+def parse_rate(rate: str) -> Tuple[float, float]:
+    """Converte "100/minute" em (capacidade, tokens por segundo)."""
+    amount, _, period = rate.partition("/")
+    seconds = _PERIODS[period.strip().rstrip("s")]
+    capacity = float(amount)
+    return capacity, capacity / seconds
+
+
+class RateLimitBackend(ABC):
+    """Armazena o estado dos token buckets (tokens restantes, último acesso)."""
+
+    @abstractmethod
+    def take(self, keys: Sequence[str], capacity: float, refill_rate: float, now: float) -> Tuple[bool, float]:
+        """
+        Consome um token de cada bucket, atomicamente: se algum estiver vazio,
+        nenhum é cobrado. Retorna (permitido, segundos até haver token em todos).
+        """
+
+    async def acquire(self, keys: Sequence[str], capacity: float, refill_rate: float, now: float) -> Tuple[bool, float]:
+        """Versão para o event loop; backends que bloqueiam rodam take() em uma thread."""
+        return self.take(keys, capacity, refill_rate, now)
+
+    @staticmethod
+    def _refill(state: Optional[Tuple[float, float]], capacity: float, refill_rate: float, now: float) -> float:
+        if state is None:
+            return capacity
+        tokens, updated = state
+        return min(capacity, tokens + max(0.0, now - updated) * refill_rate)
+
+    @staticmethod
+    def _charge(levels: List[float], refill_rate: float) -> Tuple[bool, List[float], float]:
+        retry_after = max(((1 - tokens) / refill_rate for tokens in levels if tokens < 1), default=0.0)
+        if retry_after:
+            return False, levels, retry_after
+        return True, [tokens - 1 for tokens in levels], 0.0
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Backend local ao processo, O(1) por verificação.
+
+    A memória é limitada: acima de max_keys o bucket usado há mais tempo é
+    descartado (ele estaria cheio de novo de qualquer forma, na maioria dos casos).
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, keys: Sequence[str], capacity: float, refill_rate: float, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            levels = [self._refill(self._buckets.get(key), capacity, refill_rate, now) for key in keys]
+            allowed, levels, retry_after = self._charge(levels, refill_rate)
+            for key, tokens in zip(keys, levels):
+                self._buckets[key] = (tokens, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, retry_after
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Backend compartilhado entre workers da mesma máquina via um arquivo SQLite.
+
+    Serve como substituto local de um armazenamento compartilhado (ex.: Redis):
+    cada verificação é uma transação BEGIN IMMEDIATE sobre uma linha.
+    """
+
+    def __init__(self, path: str, max_idle_seconds: float = 3600):
+        self.path = path
+        self.max_idle_seconds = max_idle_seconds
+        self._local = threading.local()
+        self._last_cleanup = 0.0
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, keys: Sequence[str], capacity: float, refill_rate: float, now: float) -> Tuple[bool, float]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            levels = [
+                self._refill(
+                    conn.execute("SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)).fetchone(),
+                    capacity, refill_rate, now
+                )
+                for key in keys
+            ]
+            allowed, levels, retry_after = self._charge(levels, refill_rate)
+            conn.executemany(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                [(key, tokens, now) for key, tokens in zip(keys, levels)]
+            )
+            # Limita o tamanho da tabela removendo buckets ociosos
+            if now - self._last_cleanup > self.max_idle_seconds:
+                conn.execute(
+                    "DELETE FROM rate_limit_buckets WHERE updated < ?", (now - self.max_idle_seconds,)
+                )
+                self._last_cleanup = now
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, retry_after
+
+    async def acquire(self, keys: Sequence[str], capacity: float, refill_rate: float, now: float) -> Tuple[bool, float]:
+        # BEGIN IMMEDIATE pode esperar até 5 s pelo lock de outro worker
+        return await anyio.to_thread.run_sync(self.take, keys, capacity, refill_rate, now)
+
+
+class RateLimitRule:
+    __slots__ = ("name", "method", "pattern", "capacity", "refill_rate")
+
+    def __init__(self, name: str, method: Optional[str], pattern: str, rate: str):
+        self.name = name
+        self.method = method
+        self.pattern: Pattern = re.compile(pattern)
+        self.capacity, self.refill_rate = parse_rate(rate)
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method is None or self.method == method) and self.pattern.match(path) is not None
+
+
+def default_rules(settings: Settings) -> List[RateLimitRule]:
+    """Orçamentos por rota: restritos em login/submissão, folgados no resto."""
+    api = re.escape(settings.API_V1_STR)
+    return [
+        RateLimitRule("login", "POST", rf"^{api}/login$", settings.RATE_LIMIT_LOGIN),
+        RateLimitRule("register", "POST", rf"^{api}/register$", settings.RATE_LIMIT_LOGIN),
+        RateLimitRule("submit", "POST", rf"^{api}/\d+/submit(/bulk)?$", settings.RATE_LIMIT_SUBMIT),
+        RateLimitRule("default", None, r"", settings.RATE_LIMIT_DEFAULT),
+    ]
+
+
+def create_backend(settings: Settings) -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteRateLimitBackend(settings.RATE_LIMIT_SQLITE_PATH)
+    return InMemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+class RateLimitMiddleware:
+    """
+    Limita requisições com token buckets por IP e por usuário autenticado.
+
+    Rotas de monitoramento (exempt) nunca são limitadas. Nas demais, a
+    primeira regra que casa com método e caminho define o orçamento; cada
+    requisição consome um token do bucket do IP e, com um JWT válido, também
+    do bucket do usuário. Recusada por um deles, não é cobrada no outro.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        settings: Settings,
+        backend: Optional[RateLimitBackend] = None,
+        rules: Optional[List[RateLimitRule]] = None,
+        exempt: str = MONITORING_PATHS
+    ):
+        self.app = app
+        self.settings = settings
+        self.backend = backend if backend is not None else create_backend(settings)
+        self.rules = rules or default_rules(settings)
+        self.exempt: Pattern = re.compile(exempt)
+
+    def _match(self, method: str, path: str) -> Optional[RateLimitRule]:
+        if self.exempt.match(path):
+            return None
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def _user_id(self, headers: Headers) -> Optional[str]:
+        authorization = headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            payload = token_cache.decode(token)
+        except JWTError:
+            return None
+        return payload.get("sub")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        now = time.monotonic() if isinstance(self.backend, InMemoryRateLimitBackend) else time.time()
+        client = scope.get("client")
+        keys = [f"{rule.name}:ip:{client[0] if client else 'unknown'}"]
+        user_id = self._user_id(Headers(scope=scope))
+        if user_id is not None:
+            keys.append(f"{rule.name}:user:{user_id}")
+
+        allowed, retry_after = await self.backend.acquire(keys, rule.capacity, rule.refill_rate, now)
+        if not allowed:
+            await self._reject(send, retry_after)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _reject(self, send: Send, retry_after: float) -> None:
+        body = json.dumps({"detail": "Too Many Requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, int(retry_after + 0.999))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
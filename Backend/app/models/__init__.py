@@ -1,6 +1,10 @@
 from .user import User
 from .form import Form
 from .form_response import FormResponse
+from .form_summary import FormSummaryCounter
+from .response_answer import ResponseAnswer
 from .processing_log import ProcessingLog
+from .revoked_token import RevokedToken
+from .security_audit_log import SecurityAuditLog
 
-__all__ = ['User', 'Form', 'FormResponse', 'ProcessingLog']
+__all__ = ['User', 'Form', 'FormResponse', 'FormSummaryCounter', 'ResponseAnswer', 'ProcessingLog', 'RevokedToken', 'SecurityAuditLog']
@@ -1,10 +1,12 @@
+import hashlib
+import json
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from sqlalchemy import String, JSON, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, JSON, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy.sql import func
 import enum
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 class FieldType(str, enum.Enum):
     TEXT = "text"
@@ -26,15 +28,31 @@ class ValidationRule(str, enum.Enum):
     MAX_VALUE = "max_value"
     PATTERN = "pattern"
 
+def fields_version(fields: Optional[List[Dict[str, Any]]]) -> str:
+    """
+    Hash do conteúdo dos campos. Muda a cada alteração das regras, ao contrário
+    de updated_at (resolução de segundos) e do id (reaproveitado pelo SQLite).
+    """
+    payload = json.dumps(fields or [], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
 class Form(Base):
     """Modelo de formulário"""
     __tablename__ = "forms"
+    __table_args__ = (
+        # Paginação por cursor (created_at, id)
+        Index("ix_forms_created_at_id", "created_at", "id"),
+        Index("ix_forms_owner_id_created_at_id", "owner_id", "created_at", "id"),
+    )
 
     # Campos principais
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(String(1000))
     fields: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # fields_version(fields), calculado na escrita: caches derivados dos campos
+    # (validador, snapshots de análise) comparam só esta string
+    fields_version: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     settings: Mapped[Dict[str, Any]] = mapped_column(
         JSON,
         nullable=False,
@@ -50,7 +68,8 @@ class Form(Base):
     # Campos de controle
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now()
+        default=utcnow(),
+        server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -72,8 +91,14 @@ class Form(Base):
     owner: Mapped["User"] = relationship(back_populates="forms")
     responses: Mapped[List["FormResponse"]] = relationship(
         back_populates="form",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
+    @validates("fields")
+    def _track_fields_version(self, key: str, fields: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.fields_version = fields_version(fields)
+        return fields
+
     def __repr__(self) -> str:
         return f"<Form {self.title}>"
@@ -1,13 +1,21 @@
 from datetime import datetime
-from typing import Dict, Any, Optional
-from sqlalchemy import String, JSON, DateTime, ForeignKey
+from typing import Dict, Any, List, Optional
+from sqlalchemy import String, JSON, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 class FormResponse(Base):
     """Modelo de resposta do formulário"""
     __tablename__ = "form_responses"
+    __table_args__ = (
+        # Paginação por cursor (created_at, id)
+        Index("ix_form_responses_form_id_created_at_id", "form_id", "created_at", "id"),
+        # Último id por formulário e leitura incremental dos snapshots de análise
+        Index("ix_form_responses_form_id_id", "form_id", "id"),
+        # Uma resposta por usuário: preenchido só quando o formulário exige (NULLs não conflitam)
+        Index("uq_form_responses_unique_respondent", "form_id", "unique_respondent_id", unique=True),
+    )
 
     # Campos principais
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -16,6 +24,7 @@ class FormResponse(Base):
         ForeignKey("users.id"),
         nullable=True
     )
+    unique_respondent_id: Mapped[Optional[int]] = mapped_column(nullable=True)
     respondent_email: Mapped[Optional[str]] = mapped_column(
         String(255),
         nullable=True
@@ -25,7 +34,8 @@ class FormResponse(Base):
     # Campos de controle
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now()
+        default=utcnow(),
+        server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -41,6 +51,13 @@ class FormResponse(Base):
     # Relacionamentos
     form: Mapped["Form"] = relationship(back_populates="responses")
     respondent: Mapped[Optional["User"]] = relationship()
+    # passive_deletes: as linhas são apagadas em lote (ver FormService.delete_form)
+    # ou pelo ON DELETE CASCADE, sem carregá-las antes
+    answer_rows: Mapped[List["ResponseAnswer"]] = relationship(
+        back_populates="response",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
 
     def __repr__(self) -> str:
         return f"<FormResponse form_id={self.form_id}>"
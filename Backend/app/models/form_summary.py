@@ -0,0 +1,32 @@
+from typing import Optional
+from sqlalchemy import String, Float, ForeignKey, SmallInteger, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class FormSummaryCounter(Base):
+    """
+    Contadores agregados das respostas de um formulário
+
+    kind indica o tipo do contador: "total" (respostas), "day" (respostas por
+    dia, bucket = data ISO), "option" (respostas por opção, bucket = valor) e
+    "number" (count/soma/mín/máx de um campo numérico). Cada contador é
+    dividido em até FORM_SUMMARY_SHARDS linhas (shard), somadas na leitura.
+    """
+    __tablename__ = "form_summary_counters"
+    __table_args__ = (
+        UniqueConstraint("form_id", "kind", "field_id", "bucket", "shard", name="uq_form_summary_counters_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    form_id: Mapped[int] = mapped_column(ForeignKey("forms.id", ondelete="CASCADE"))
+    kind: Mapped[str] = mapped_column(String(10))
+    field_id: Mapped[str] = mapped_column(String(100), default="")
+    bucket: Mapped[str] = mapped_column(String(255), default="")
+    shard: Mapped[int] = mapped_column(SmallInteger, default=0, server_default="0")
+    count: Mapped[int] = mapped_column(default=0)
+    value_sum: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    value_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    value_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<FormSummaryCounter {self.kind} {self.field_id}={self.bucket}>"
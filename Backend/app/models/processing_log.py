@@ -1,17 +1,21 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, DateTime, ForeignKey, Text
+from sqlalchemy import String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 class ProcessingLog(Base):
     """Modelo de log de processamento"""
     __tablename__ = "processing_logs"
+    __table_args__ = (
+        # Paginação por cursor (created_at, id)
+        Index("ix_processing_logs_created_at_id", "created_at", "id"),
+    )
 
     # Campos principais
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     action: Mapped[str] = mapped_column(String(50))
     details: Mapped[str] = mapped_column(Text)
     status: Mapped[str] = mapped_column(String(20))
@@ -20,7 +24,8 @@ class ProcessingLog(Base):
     # Campos de auditoria
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now()
+        default=utcnow(),
+        server_default=utcnow()
     )
     
     # Relacionamentos
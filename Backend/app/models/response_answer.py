@@ -0,0 +1,38 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import String, Date, Float, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.database import Base
+
+class ResponseAnswer(Base):
+    """
+    Modelo normalizado de resposta: uma linha por campo (ou por opção marcada)
+
+    Permite agregações por campo em SQL sem ler o JSON de cada resposta.
+    """
+    __tablename__ = "response_answers"
+    __table_args__ = (
+        # Contagens por opção/valor
+        Index("ix_response_answers_form_id_field_id_value_text", "form_id", "field_id", "value_text"),
+        # min/max/média de campos numéricos
+        Index("ix_response_answers_form_id_field_id_value_number", "form_id", "field_id", "value_number"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    response_id: Mapped[int] = mapped_column(
+        ForeignKey("form_responses.id", ondelete="CASCADE"),
+        index=True
+    )
+    form_id: Mapped[int] = mapped_column(ForeignKey("forms.id", ondelete="CASCADE"))
+    field_id: Mapped[str] = mapped_column(String(100))
+
+    # Valores tipados (apenas a coluna do tipo do campo é preenchida)
+    value_text: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    value_number: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    value_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+
+    # Relacionamentos
+    response: Mapped["FormResponse"] = relationship(back_populates="answer_rows")
+
+    def __repr__(self) -> str:
+        return f"<ResponseAnswer {self.field_id}={self.value_text or self.value_number}>"
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class RevokedToken(Base):
+    """
+    Modelo de revogação de tokens
+
+    Com jti, revoga um único token; sem jti, revoga todos os tokens do
+    usuário emitidos antes de revoked_at.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    jti: Mapped[Optional[str]] = mapped_column(String(64), unique=True, nullable=True)
+    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)
+    # Depois desta data o token já expirou e a linha pode ser removida
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<RevokedToken {self.jti or self.user_id}>"
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, DateTime, JSON, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class SecurityAuditLog(Base):
+    """Modelo de log de auditoria das ações administrativas"""
+    __tablename__ = "security_audit_logs"
+    __table_args__ = (
+        # Consultas por intervalo de datas, opcionalmente por administrador
+        Index("ix_security_audit_logs_timestamp_admin_id", "timestamp", "admin_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    action: Mapped[str] = mapped_column(String(50))
+    admin_id: Mapped[int] = mapped_column()
+    target_user_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    details: Mapped[dict] = mapped_column(JSON)
+    ip_address: Mapped[str] = mapped_column(String(45))
+    geolocation: Mapped[dict] = mapped_column(JSON)
+
+    def __repr__(self) -> str:
+        return f"<SecurityAuditLog {self.action}>"
@@ -1,13 +1,17 @@
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import String, DateTime, JSON, ForeignKey
+from sqlalchemy import String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 class User(Base):
     """Modelo de usuário"""
     __tablename__ = "users"
+    __table_args__ = (
+        # Paginação por cursor (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     # Campos principais
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -20,7 +24,8 @@ class User(Base):
     # Campos de auditoria
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
-        server_default=func.now()
+        default=utcnow(),
+        server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
@@ -49,7 +54,7 @@ class UserSession(Base):
     __tablename__ = "user_sessions"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     session_id: Mapped[str] = mapped_column(String(255), unique=True)
     user_agent: Mapped[str] = mapped_column(String(255))
     ip_address: Mapped[str] = mapped_column(String(45))
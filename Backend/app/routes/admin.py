@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from ..api.deps import get_current_admin_user
+from ..core.instrumentation import metrics
 from ..database import get_db
-from ..models.user import User, UserSession
-from ..schemas.user import AdminUserView
+from ..models.user import User
+from ..schemas.user import AdminUserView, UserResponse, UserSessionView
 from ..schemas.security import SecurityAlert, UserSecurityProfile, SecurityAuditLog
+from ..services.admin_service import AdminService
+from ..services.audit_log_service import AuditLogService
+from ..services.auth_cache import AuthIdentity, identity_cache
+from ..services.token_revocation import revocation_store
+from ..utils.pagination import NEXT_CURSOR_HEADER
 from datetime import datetime
 import json
 
@@ -15,7 +22,11 @@ def get_client_info(request: Request) -> dict:
     return {
         "ip": request.client.host,
         "user_agent": request.headers.get("user-agent", ""),
-        "headers": dict(request.headers)
+        # Credenciais não vão para o log de auditoria
+        "headers": {
+            key: value for key, value in request.headers.items()
+            if key not in ("authorization", "cookie")
+        }
     }
 
 def log_admin_action(db: Session, admin_id: int, action: str, details: dict):
@@ -24,24 +35,32 @@ def log_admin_action(db: Session, admin_id: int, action: str, details: dict):
         timestamp=datetime.utcnow(),
         action=action,
         admin_id=admin_id,
+        target_user_id=details.get("target_user_id"),
         details=details,
         ip_address=details.get("ip", "unknown"),
         geolocation={}  # You would normally get this from a geolocation service
     )
-    # In a real application, you would save this to the database
-    print(f"Admin Action Log: {log.model_dump_json()}")
+    # Enfileirado: a ação administrativa não espera pelo INSERT
+    AuditLogService.record(**log.model_dump())
 
 @router.get("/users", response_model=List[AdminUserView])
-async def get_all_users(request: Request, db: Session = Depends(get_db)):
-    """Lista todos os usuários com informações detalhadas de segurança"""
-    # Note: Removed admin auth temporarily for testing
-    users = db.query(User).all()
+async def get_all_users(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Lista os usuários com informações detalhadas de segurança, paginados por cursor"""
+    users, next_cursor = AdminService.list_user_views(db, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return users
 
 @router.get("/users/{user_id}", response_model=AdminUserView)
 async def get_user_details(user_id: int, request: Request, db: Session = Depends(get_db)):
     """Obtém detalhes completos de um usuário específico"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = AdminService.get_user_view(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return user
@@ -51,7 +70,8 @@ async def block_user(
     user_id: int,
     reason: str,
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_admin: AuthIdentity = Depends(get_current_admin_user)
 ):
     """Bloqueia um usuário"""
     user = db.query(User).filter(User.id == user_id).first()
@@ -62,13 +82,15 @@ async def block_user(
     user.blocked_reason = reason
     
     # Log da ação administrativa
-    log_admin_action(db, 1, "block_user", {
+    log_admin_action(db, current_admin.id, "block_user", {
         **get_client_info(request),
         "target_user_id": user_id,
         "reason": reason
     })
     
     db.commit()
+    identity_cache.invalidate(user_id)
+    revocation_store.revoke_user(db, user_id)
     return {"message": "Usuário bloqueado com sucesso"}
 
 @router.get("/security/alerts", response_model=List[SecurityAlert])
@@ -90,21 +112,12 @@ async def get_security_alerts(db: Session = Depends(get_db)):
 async def get_audit_logs(
     start_date: datetime = None,
     end_date: datetime = None,
+    admin_id: Optional[int] = None,
+    limit: int = 100,
     db: Session = Depends(get_db)
 ):
     """Obtém logs de auditoria de segurança"""
-    # For testing, return mock data
-    return [
-        SecurityAuditLog(
-            timestamp=datetime.utcnow(),
-            action="user_view",
-            admin_id=1,
-            target_user_id=2,
-            details={"page": "user_details"},
-            ip_address="127.0.0.1",
-            geolocation={"city": "Test City", "country": "Test Country"}
-        )
-    ]
+    return AuditLogService.get_logs(db, start_date, end_date, admin_id, limit)
 
 @router.get("/security/suspicious-activities")
 async def get_suspicious_activities(
@@ -114,20 +127,25 @@ async def get_suspicious_activities(
     # Implementar lógica de busca de atividades suspeitas
     return []
 
+@router.get("/metrics/slow-queries")
+async def get_slow_queries():
+    """Comandos SQL lentos amostrados neste processo (ver METRICS_SLOW_QUERY_MS), agrupados por fingerprint"""
+    return metrics.slow_query_report()
+
 @router.post("/security/investigate/{user_id}")
 async def investigate_user(
     user_id: int,
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_admin: AuthIdentity = Depends(get_current_admin_user)
 ):
     """Inicia uma investigação detalhada de um usuário"""
-    user = db.query(User).filter(User.id == user_id).first()
+    # Usuário e sessões em duas consultas (selectinload), sem N+1
+    user = AdminService.get_user_with_sessions(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
-    # Coleta informações detalhadas do usuário
-    sessions = db.query(UserSession).filter(UserSession.user_id == user_id).all()
-    
+    sessions = [UserSessionView.model_validate(session) for session in user.sessions]
     investigation_data = {
         "user_id": user_id,
         "sessions": [
@@ -139,12 +157,13 @@ async def investigate_user(
             }
             for session in sessions
         ],
-        "risk_score": user.risk_score,
-        "suspicious_activities": user.suspicious_activities
+        "suspicious_activities": [
+            session.model_dump(mode="json") for session in sessions if session.is_suspicious
+        ]
     }
     
     # Log da investigação
-    log_admin_action(db, 1, "investigate_user", {
+    log_admin_action(db, current_admin.id, "investigate_user", {
         **get_client_info(request),
         "target_user_id": user_id,
         "investigation_data": investigation_data
@@ -152,36 +171,11 @@ async def investigate_user(
     
     return investigation_data
 
-admin_router = APIRouter(prefix="/admin", tags=["admin"])
-
-@admin_router.get("/users", response_model=List[User])
-def get_all_users(
-    db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
-):
-    """Retorna todos os usuários do sistema"""
-    return db.query(User).all()
-
-@admin_router.get("/users/{user_id}", response_model=User)
-def get_user_details(
-    user_id: int,
-    db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
-):
-    """Retorna detalhes de um usuário específico"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuário não encontrado"
-        )
-    return user
-
-@admin_router.put("/users/{user_id}/toggle-status", response_model=User)
+@router.put("/users/{user_id}/toggle-status", response_model=UserResponse)
 def toggle_user_status(
     user_id: int,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: AuthIdentity = Depends(get_current_admin_user)
 ):
     """Alterna o status ativo/inativo de um usuário"""
     user = db.query(User).filter(User.id == user_id).first()
@@ -200,4 +194,7 @@ def toggle_user_status(
     user.is_active = not user.is_active
     db.commit()
     db.refresh(user)
+    identity_cache.invalidate(user_id)
+    if not user.is_active:
+        revocation_store.revoke_user(db, user_id)
     return user
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, validator
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import date, datetime
 from app.models.form import FieldType, ValidationRule
 
 class FormFieldValidation(BaseModel):
@@ -72,3 +72,63 @@ class FormResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class FormSubmission(BaseModel):
+    answers: Dict[str, Any]
+    email: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+class BulkSubmissionError(BaseModel):
+    index: int
+    detail: str
+
+class BulkSubmissionResult(BaseModel):
+    accepted: int
+    rejected: int
+    errors: List[BulkSubmissionError]
+
+class NumericSummary(BaseModel):
+    count: int
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+
+class FieldSummary(BaseModel):
+    field_id: str
+    label: str
+    type: FieldType
+    options: Optional[Dict[str, int]] = None
+    stats: Optional[NumericSummary] = None
+
+class DailyCount(BaseModel):
+    date: date
+    count: int
+
+class FormSummary(BaseModel):
+    form_id: int
+    total_responses: int
+    fields: List[FieldSummary]
+    daily: List[DailyCount]
+
+class CrossTab(BaseModel):
+    row_field: str
+    column_field: str
+    rows: List[str]
+    columns: List[str]
+    counts: List[List[int]]
+    total: int
+
+class PercentileSummary(BaseModel):
+    field_id: str
+    count: int
+    mean: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]
+
+class HistogramBucket(BaseModel):
+    start: date
+    count: int
+
+class DateHistogram(BaseModel):
+    field_id: Optional[str] = None
+    interval: str
+    buckets: List[HistogramBucket]
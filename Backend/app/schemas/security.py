@@ -1,11 +1,23 @@
 from pydantic import BaseModel
 from datetime import datetime
+from enum import Enum
 from typing import Optional, List
 
+class AlertType(str, Enum):
+    SUSPICIOUS_LOGIN = "suspicious_login"
+    MULTIPLE_IPS = "multiple_ips"
+    VPN_DETECTED = "vpn_detected"
+
+class AlertSeverity(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
 class SecurityAlert(BaseModel):
     user_id: int
-    alert_type: str  # suspicious_login, multiple_ips, vpn_detected, etc
-    severity: str    # low, medium, high, critical
+    alert_type: str  # AlertType: suspicious_login, multiple_ips, vpn_detected, etc
+    severity: str    # AlertSeverity: low, medium, high, critical
     details: dict
     timestamp: datetime
     resolved: bool = False
@@ -47,3 +59,6 @@ class SecurityAuditLog(BaseModel):
     details: dict
     ip_address: str
     geolocation: dict
+
+    class Config:
+        from_attributes = True
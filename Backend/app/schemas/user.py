@@ -25,3 +25,21 @@ class UserResponse(UserBase):
 
 class UserInDB(UserResponse):
     hashed_password: str
+
+class AdminUserView(UserResponse):
+    """Usuário com contadores agregados, montado por uma única consulta."""
+    session_count: int = 0
+    form_count: int = 0
+    processing_log_count: int = 0
+    last_activity: Optional[datetime] = None
+
+class UserSessionView(BaseModel):
+    ip_address: str
+    location: Optional[dict] = None
+    user_agent: str
+    created_at: datetime
+    last_activity: Optional[datetime] = None
+    is_suspicious: bool = False
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,74 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, load_only, selectinload
+from app.models.form import Form
+from app.models.processing_log import ProcessingLog
+from app.models.user import User, UserSession
+from app.utils.pagination import keyset_paginate
+
+# Colunas de User expostas em AdminUserView (sem hashed_password)
+USER_VIEW_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.is_active,
+    User.is_admin,
+    User.created_at,
+    User.updated_at,
+    User.last_login,
+)
+SESSION_VIEW_COLUMNS = (
+    UserSession.ip_address,
+    UserSession.location,
+    UserSession.user_agent,
+    UserSession.created_at,
+    UserSession.last_activity,
+    UserSession.is_suspicious,
+)
+
+
+def _per_user(aggregate, column):
+    """
+    Subconsulta escalar correlacionada com User: é avaliada só para os usuários
+    da página, pelo índice em user_id, em vez de agregar a tabela inteira.
+    """
+    return select(aggregate).where(column == User.id).correlate(User).scalar_subquery()
+
+
+class AdminService:
+    """
+    Consultas das telas administrativas. Cada uma emite um número fixo de
+    comandos SQL, independente de quantos usuários, sessões ou formulários
+    existam: contadores vêm de subconsultas e relacionamentos de selectinload.
+    """
+
+    @staticmethod
+    def _user_views_query(db: Session):
+        return db.query(
+            *USER_VIEW_COLUMNS,
+            _per_user(func.count(), UserSession.user_id).label("session_count"),
+            _per_user(func.count(), Form.owner_id).label("form_count"),
+            _per_user(func.count(), ProcessingLog.user_id).label("processing_log_count"),
+            _per_user(func.max(UserSession.last_activity), UserSession.user_id).label("last_activity"),
+        )
+
+    @staticmethod
+    def list_user_views(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List, Optional[str]]:
+        """Usuários com contadores de sessões/formulários/logs em uma consulta por página."""
+        return keyset_paginate(AdminService._user_views_query(db), User, cursor, limit)
+
+    @staticmethod
+    def get_user_view(db: Session, user_id: int):
+        return AdminService._user_views_query(db).filter(User.id == user_id).first()
+
+    @staticmethod
+    def get_user_with_sessions(db: Session, user_id: int) -> Optional[User]:
+        """Usuário e suas sessões em duas consultas, carregando só as colunas usadas."""
+        return db.scalar(
+            select(User)
+            .options(
+                load_only(User.id, User.email, User.is_active),
+                selectinload(User.sessions).load_only(*SESSION_VIEW_COLUMNS),
+            )
+            .where(User.id == user_id)
+        )
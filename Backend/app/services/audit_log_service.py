@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.models.security_audit_log import SecurityAuditLog
+from app.services.batch_writer import BatchWriter
+
+settings = get_settings()
+
+audit_log_writer = BatchWriter(
+    SecurityAuditLog,
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL,
+    max_queue=settings.AUDIT_LOG_MAX_QUEUE,
+    overflow=settings.AUDIT_LOG_OVERFLOW
+)
+
+
+class AuditLogService:
+    @staticmethod
+    def record(
+        admin_id: int,
+        action: str,
+        details: dict,
+        ip_address: str,
+        target_user_id: Optional[int] = None,
+        geolocation: Optional[dict] = None,
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """Enfileira o evento; a gravação é feita em lote em segundo plano."""
+        audit_log_writer.enqueue({
+            "timestamp": timestamp or datetime.utcnow(),
+            "action": action,
+            "admin_id": admin_id,
+            "target_user_id": target_user_id,
+            "details": details,
+            "ip_address": ip_address,
+            "geolocation": geolocation or {},
+        })
+
+    @staticmethod
+    def get_logs(
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        admin_id: Optional[int] = None,
+        limit: int = 100
+    ) -> List[SecurityAuditLog]:
+        """Logs do intervalo [start_date, end_date], mais recentes primeiro."""
+        query = select(SecurityAuditLog)
+        if start_date is not None:
+            query = query.where(SecurityAuditLog.timestamp >= start_date)
+        if end_date is not None:
+            query = query.where(SecurityAuditLog.timestamp <= end_date)
+        if admin_id is not None:
+            query = query.where(SecurityAuditLog.admin_id == admin_id)
+        query = query.order_by(SecurityAuditLog.timestamp.desc(), SecurityAuditLog.id.desc()).limit(limit)
+        return list(db.scalars(query))
@@ -0,0 +1,173 @@
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+from cachetools import TLRUCache, TTLCache
+from jose import jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.models.user import User
+
+settings = get_settings()
+
+
+class AuthIdentity:
+    """Atributos de autorização do usuário autenticado (sem carregar o modelo)."""
+
+    __slots__ = ("id", "is_active", "is_admin")
+
+    def __init__(self, id: int, is_active: bool, is_admin: bool):
+        self.id = id
+        self.is_active = is_active
+        self.is_admin = is_admin
+
+    def __getitem__(self, key: str) -> Any:
+        # Compatível com os endpoints que usam current_user["id"]
+        return getattr(self, key)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "is_active": self.is_active, "is_admin": self.is_admin}
+
+
+def _cache_stats(entries, hits: int, misses: int) -> Dict[str, Any]:
+    total = hits + misses
+    return {
+        "size": len(entries),
+        "maxsize": entries.maxsize,
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _claims_expiry(key: bytes, claims: Dict[str, Any], now: float) -> float:
+    exp = claims.get("exp")
+    if exp is None:
+        return now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return float(exp)
+
+
+class TokenClaimsCache:
+    """
+    Claims de JWTs já verificados, por hash do token, válidos até o exp.
+
+    Tokens inválidos nunca são armazenados: a verificação completa acontece
+    na primeira vez que cada token é visto.
+    """
+
+    def __init__(self, maxsize: int):
+        self._entries: TLRUCache = TLRUCache(maxsize=maxsize, ttu=_claims_expiry, timer=time.time)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Retorna as claims do token; levanta JWTError se ele for inválido."""
+        key = _token_key(token)
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is not None:
+                self.hits += 1
+                return claims
+            self.misses += 1
+
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        with self._lock:
+            self._entries[key] = claims
+        return claims
+
+    def discard(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(_token_key(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return _cache_stats(self._entries, self.hits, self.misses)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class UserIdentityCache:
+    """
+    Cache curto (TTL) de is_active/is_admin por id de usuário.
+
+    Alterações feitas por este processo invalidam a entrada na hora; em outros
+    workers a mudança aparece em no máximo AUTH_IDENTITY_CACHE_TTL segundos.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, user_id: int) -> Optional[AuthIdentity]:
+        """Consulta apenas o cache, sem acessar o banco."""
+        with self._lock:
+            identity = self._entries.get(user_id)
+            if identity is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return identity
+
+    def _put(self, row) -> Optional[AuthIdentity]:
+        if row is None:
+            return None
+        identity = AuthIdentity(row.id, row.is_active, row.is_admin)
+        with self._lock:
+            self._entries[identity.id] = identity
+        return identity
+
+    def get(self, db: Session, user_id: int) -> Optional[AuthIdentity]:
+        identity = self.peek(user_id)
+        if identity is not None:
+            return identity
+        row = db.execute(_identity_query(user_id)).first()
+        return self._put(row)
+
+    async def get_async(self, db: AsyncSession, user_id: int) -> Optional[AuthIdentity]:
+        identity = self.peek(user_id)
+        if identity is not None:
+            return identity
+        row = (await db.execute(_identity_query(user_id))).first()
+        return self._put(row)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return _cache_stats(self._entries, self.hits, self.misses)
+
+
+def _identity_query(user_id: int):
+    return select(User.id, User.is_active, User.is_admin).where(User.id == user_id)
+
+
+def subject_user_id(claims: Dict[str, Any]) -> Optional[int]:
+    """Extrai o id do usuário da claim sub, ou None se ausente/inválida."""
+    try:
+        return int(claims["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+token_cache = TokenClaimsCache(settings.AUTH_TOKEN_CACHE_SIZE)
+identity_cache = UserIdentityCache(settings.AUTH_IDENTITY_CACHE_SIZE, settings.AUTH_IDENTITY_CACHE_TTL)
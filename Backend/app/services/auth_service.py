@@ -1,16 +1,21 @@
+import hashlib
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.core.config import get_settings
-from app.models.user import User
+from app.models.user import User, UserSession
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.schemas.token import Token, TokenData
 from app.schemas.user import UserCreate, UserResponse
+from app.services.password_hasher import password_hasher, pwd_context
+from app.services.token_revocation import issued_at, revocation_store
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+REFRESH_AUDIENCE = "refresh"
 
 class AuthService:
     @staticmethod
@@ -22,22 +27,85 @@ class AuthService:
         return pwd_context.hash(password)
 
     @staticmethod
-    def create_token(user: User) -> Token:
+    def create_token(user: User, session: Optional[UserSession] = None) -> Token:
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        data = {"sub": str(user.id)}
+        if session is not None:
+            data["sid"] = session.id
         access_token = AuthService.create_access_token(
-            data={"sub": str(user.id)},
+            data=data,
             expires_delta=access_token_expires
         )
-        return Token(access_token=access_token, token_type="bearer")
+        refresh_token = None
+        if session is not None:
+            refresh_token = AuthService.create_refresh_token(user.id, session.id, session.session_id)
+        return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token)
+
+    @staticmethod
+    def create_refresh_token(user_id: int, session_id: int, jti: str) -> str:
+        """
+        Refresh token de longa duração ligado a uma UserSession.
+
+        O jti corrente fica em UserSession.session_id; a audiência "refresh"
+        impede que ele seja aceito como token de acesso.
+        """
+        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        return jwt.encode(
+            {"sub": str(user_id), "sid": session_id, "jti": jti, "exp": expire, "aud": REFRESH_AUDIENCE},
+            settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM
+        )
+
+    @staticmethod
+    def decode_refresh_token(token: str) -> Tuple[int, int, str]:
+        """Valida o refresh token e retorna (user_id, id da sessão, jti)."""
+        try:
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+                audience=REFRESH_AUDIENCE
+            )
+            if payload.get("aud") != REFRESH_AUDIENCE:
+                raise ValueError("Invalid token")
+            return int(payload["sub"]), int(payload["sid"]), payload["jti"]
+        except (JWTError, KeyError, TypeError):
+            raise ValueError("Invalid token")
+
+    @staticmethod
+    def new_session(user: User, user_agent: str, ip_address: str) -> UserSession:
+        return UserSession(
+            user_id=user.id,
+            session_id=uuid.uuid4().hex,
+            user_agent=user_agent[:255],
+            ip_address=ip_address[:45],
+            browser_fingerprint=hashlib.sha256(user_agent.encode()).hexdigest()
+        )
+
+    @staticmethod
+    def rotate_statement(session_id: int, jti: str, new_jti: str):
+        """
+        Troca o jti da sessão só se o apresentado ainda for o corrente.
+
+        Feito como UPDATE condicional para que dois refresh simultâneos com o
+        mesmo token não sejam ambos aceitos.
+        """
+        return (
+            update(UserSession)
+            .where(UserSession.id == session_id, UserSession.session_id == jti)
+            .values(session_id=new_jti, last_activity=func.now())
+        )
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         to_encode = data.copy()
+        now = datetime.utcnow()
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.utcnow() + timedelta(minutes=15)
-        to_encode.update({"exp": expire})
+            expire = now + timedelta(minutes=15)
+        # jti identifica o token na lista de revogação
+        to_encode.update({"exp": expire, "iat": issued_at(now), "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(
             to_encode,
             settings.SECRET_KEY,
@@ -54,8 +122,12 @@ class AuthService:
         user = AuthService.get_user_by_email(db, email)
         if not user:
             return None
-        if not AuthService.verify_password(password, user.hashed_password):
+        valid, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+        if not valid:
             return None
+        if new_hash:
+            user.hashed_password = new_hash
+            db.commit()
         return user
 
     @staticmethod
@@ -73,21 +145,107 @@ class AuthService:
         return db_user
 
     @staticmethod
-    def refresh_token(db: Session, current_token: str) -> Token:
-        try:
-            payload = jwt.decode(
-                current_token,
-                settings.SECRET_KEY,
-                algorithms=[settings.ALGORITHM]
-            )
-            user_id: str = payload.get("sub")
-            if user_id is None:
-                raise ValueError("Invalid token")
-            
-            user = db.query(User).filter(User.id == int(user_id)).first()
-            if user is None:
-                raise ValueError("User not found")
-                
-            return AuthService.create_token(user)
-        except JWTError:
+    def create_session_tokens(db: Session, user: User, user_agent: str, ip_address: str) -> Token:
+        session = AuthService.new_session(user, user_agent, ip_address)
+        db.add(session)
+        db.commit()
+        return AuthService.create_token(user, session)
+
+    @staticmethod
+    def refresh_token(db: Session, refresh_token: str) -> Token:
+        """
+        Rotaciona o refresh token da sessão e emite um novo par de tokens.
+
+        Reapresentar um refresh token já rotacionado indica vazamento: a sessão
+        é encerrada e os tokens de acesso do usuário são revogados.
+        """
+        user_id, session_id, jti = AuthService.decode_refresh_token(refresh_token)
+        new_jti = uuid.uuid4().hex
+        result = db.execute(AuthService.rotate_statement(session_id, jti, new_jti))
+        if result.rowcount != 1:
+            db.rollback()
+            session = db.get(UserSession, session_id)
+            if session is not None and session.user_id == user_id:
+                db.delete(session)
+                db.commit()
+                revocation_store.revoke_user(db, user_id)
             raise ValueError("Invalid token")
+        db.commit()
+
+        user = db.get(User, user_id)
+        if user is None or not user.is_active:
+            raise ValueError("User not found")
+        session = db.get(UserSession, session_id)
+        return AuthService.create_token(user, session)
+
+
+class AsyncAuthService:
+    """Variante assíncrona de AuthService para uso com AsyncSession."""
+
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        return await db.scalar(select(User).where(User.email == email))
+
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+        user = await AsyncAuthService.get_user_by_email(db, email)
+        if not user:
+            return None
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            # Custo do bcrypt mudou: regrava o hash com a configuração atual
+            user.hashed_password = new_hash
+            await db.commit()
+        return user
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
+        hashed_password = await password_hasher.hash(user_data.password)
+        db_user = User(
+            email=user_data.email,
+            hashed_password=hashed_password,
+            full_name=user_data.full_name,
+            is_active=True
+        )
+        db.add(db_user)
+        await db.commit()
+        await db.refresh(db_user)
+        return db_user
+
+    @staticmethod
+    async def create_session_tokens(db: AsyncSession, user: User, user_agent: str, ip_address: str) -> Token:
+        session = AuthService.new_session(user, user_agent, ip_address)
+        db.add(session)
+        await db.commit()
+        return AuthService.create_token(user, session)
+
+    @staticmethod
+    async def refresh_token(db: AsyncSession, refresh_token: str) -> Token:
+        user_id, session_id, jti = AuthService.decode_refresh_token(refresh_token)
+        new_jti = uuid.uuid4().hex
+        result = await db.execute(AuthService.rotate_statement(session_id, jti, new_jti))
+        if result.rowcount != 1:
+            await db.rollback()
+            session = await db.get(UserSession, session_id)
+            if session is not None and session.user_id == user_id:
+                # Reuso de refresh token já rotacionado: encerra a sessão
+                await db.delete(session)
+                await db.commit()
+                await revocation_store.revoke_user_async(db, user_id)
+            raise ValueError("Invalid token")
+        await db.commit()
+
+        user = await db.get(User, user_id)
+        if user is None or not user.is_active:
+            raise ValueError("User not found")
+        session = await db.get(UserSession, session_id)
+        return AuthService.create_token(user, session)
+
+    @staticmethod
+    async def end_session(db: AsyncSession, user_id: int, session_id: int) -> None:
+        await db.execute(
+            delete(UserSession).where(UserSession.id == session_id, UserSession.user_id == user_id)
+        )
+        await db.commit()
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Type
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+from app.core.database import AsyncSessionLocal, Base
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+# Falhas do banco como um todo (fora do ar, travado): o lote volta para a
+# fila sem limite de tentativas. As demais costumam vir de uma linha ruim.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, ConnectionError, TimeoutError)
+
+
+class BatchWriter:
+    """
+    Acumula linhas em memória e as insere em lote numa tarefa de fundo.
+
+    O flush acontece quando a fila atinge batch_size ou a cada flush_interval
+    segundos, o que vier primeiro. enqueue() pode ser chamado de qualquer thread.
+
+    Com max_queue a fila é limitada. Quando cheia, a política "drop" descarta
+    a nova linha (contada em dropped) e "block" faz o chamador esperar por
+    espaço: put() grava um lote no próprio chamador; enqueue() vindo de outra
+    thread espera o flusher, até block_timeout segundos.
+
+    Um lote recusado por outro motivo que não TRANSIENT_ERRORS (ex.: violação
+    de restrição) é tentado max_retries vezes e depois dividido ao meio até
+    isolar as linhas recusadas, que são descartadas e contadas em failed.
+    """
+
+    def __init__(
+        self,
+        model: Type[Base],
+        batch_size: int,
+        flush_interval: float,
+        session_factory=None,
+        max_queue: Optional[int] = None,
+        overflow: str = OVERFLOW_DROP,
+        block_timeout: float = 5.0,
+        max_retries: int = 3
+    ):
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError(f"Invalid overflow policy: {overflow}")
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.max_retries = max_retries
+        self.dropped = 0
+        self.failed = 0
+        self._failures = 0
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _is_full(self) -> bool:
+        return self.max_queue is not None and len(self._queue) >= self.max_queue
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Enfileira sem esperar pelo banco; retorna False se a linha foi descartada."""
+        with self._lock:
+            if self._is_full():
+                # Bloquear dentro do event loop impediria o próprio flush
+                can_block = (
+                    self.overflow == OVERFLOW_BLOCK
+                    and self._loop is not None
+                    and not self._in_loop()
+                )
+                if can_block:
+                    self._loop.call_soon_threadsafe(self._wakeup.set)
+                    self._space.wait_for(lambda: not self._is_full(), timeout=self.block_timeout)
+                if self._is_full():
+                    self.dropped += 1
+                    return False
+            self._queue.append(row)
+            ready = len(self._queue) >= self.batch_size
+        if ready:
+            self._notify()
+        return True
+
+    async def put(self, row: Dict[str, Any]) -> bool:
+        """Versão para código assíncrono: com "block", grava um lote para abrir espaço."""
+        if self.overflow == OVERFLOW_BLOCK:
+            while self._is_full():
+                await self.flush(max_batches=1)
+        return self.enqueue(row)
+
+    def _notify(self) -> None:
+        if self._loop is None or self._wakeup is None:
+            return
+        if self._in_loop():
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            count = min(len(self._queue), self.batch_size)
+            batch = [self._queue.popleft() for _ in range(count)]
+            self._space.notify_all()
+            return batch
+
+    def _requeue(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._queue.extendleft(reversed(rows))
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        async with self.session_factory() as db:
+            await db.execute(insert(self.model), rows)
+            await db.commit()
+
+    async def _insert_isolating(self, batch: List[Dict[str, Any]]) -> int:
+        """Grava o lote dividindo-o ao meio até isolar as linhas recusadas; retorna as gravadas."""
+        written = 0
+        pending = [batch]
+        while pending:
+            rows = pending.pop()
+            try:
+                await self._insert(rows)
+            except TRANSIENT_ERRORS:
+                # O banco caiu no meio: o que falta volta para a fila, na ordem
+                self._requeue(rows + [row for part in reversed(pending) for row in part])
+                raise
+            except Exception:
+                if len(rows) == 1:
+                    self.failed += 1
+                    logger.exception("Linha de %s descartada após falhas repetidas", self.model.__tablename__)
+                    continue
+                middle = len(rows) // 2
+                pending.extend((rows[middle:], rows[:middle]))
+                continue
+            written += len(rows)
+        return written
+
+    async def flush(self, max_batches: Optional[int] = None) -> int:
+        """Grava a fila (ou até max_batches lotes); retorna o número de linhas inseridas."""
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batches += 1
+            batch = self._take_batch()
+            if not batch:
+                return total
+            try:
+                await self._insert(batch)
+                written = len(batch)
+            except TRANSIENT_ERRORS:
+                self._requeue(batch)
+                raise
+            except Exception:
+                self._failures += 1
+                if self._failures < self.max_retries:
+                    # Devolve o lote à fila para a próxima tentativa
+                    self._requeue(batch)
+                    raise
+                written = await self._insert_isolating(batch)
+            self._failures = 0
+            total += written
+            self.written += written
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Falha ao gravar lote de %s", self.model.__tablename__)
+
+    def start(self) -> None:
+        """Inicia o flusher em segundo plano (chamado no startup da aplicação)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Para o flusher e grava o que restou na fila. Não levanta exceção: no
+        desligamento, uma falha do banco é registrada em log e as linhas que
+        não foram gravadas são perdidas.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+        self._wakeup = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception(
+                "Falha ao gravar a fila de %s no desligamento; %d linhas perdidas",
+                self.model.__tablename__, self.pending
+            )
@@ -0,0 +1,443 @@
+import math
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import anyio
+import numpy as np
+from cachetools import LRUCache
+from fastapi import HTTPException, status
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.models.form import FieldType, Form
+from app.models.form_response import FormResponse
+from app.schemas.form import CrossTab, DateHistogram, HistogramBucket, PercentileSummary
+from app.services.form_validator import EMPTY_VALUES, form_fields_version, get_form_validator
+
+settings = get_settings()
+
+CHOICE_TYPES = (FieldType.SELECT, FieldType.RADIO)
+MULTI_CHOICE_TYPES = (FieldType.MULTISELECT, FieldType.CHECKBOX)
+HISTOGRAM_INTERVALS = ("day", "week", "month", "year")
+DEFAULT_PERCENTILES = (25.0, 50.0, 75.0, 90.0, 99.0)
+NOT_A_DATE = np.datetime64("NaT", "D")
+# Ids são reservados no INSERT e confirmados em qualquer ordem: a atualização
+# incremental relê as respostas criadas pouco antes da anterior
+REFRESH_LOOKBACK_SECONDS = 60.0
+
+ResponseRow = Tuple[int, Dict[str, Any], Optional[datetime]]
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _to_float(answer: Any) -> float:
+    if isinstance(answer, bool) or answer in EMPTY_VALUES:
+        return math.nan
+    try:
+        return float(answer)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_day(answer: Any) -> np.datetime64:
+    if answer in EMPTY_VALUES:
+        return NOT_A_DATE
+    try:
+        return np.datetime64(date.fromisoformat(str(answer)[:10]), "D")
+    except ValueError:
+        return NOT_A_DATE
+
+
+def _to_second(created_at: Optional[datetime]) -> np.datetime64:
+    if created_at is None:
+        return np.datetime64("NaT", "s")
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(created_at, "s")
+
+
+def _choice_label(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class NumberColumn:
+    """float64 por resposta; NaN quando o campo não foi respondido."""
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.float64)
+        self._chunks: List[np.ndarray] = []
+
+    def copy(self) -> "NumberColumn":
+        column = NumberColumn()
+        column.values = self.values
+        return column
+
+    def add(self, answers: Sequence[Any], start: int) -> None:
+        self._chunks.append(np.fromiter(map(_to_float, answers), dtype=np.float64, count=len(answers)))
+
+    def finish(self) -> None:
+        if self._chunks:
+            self.values = np.concatenate([self.values, *self._chunks])
+            self._chunks = []
+
+
+class DateColumn(NumberColumn):
+    """datetime64[D] por resposta; NaT quando o campo não foi respondido."""
+
+    def __init__(self):
+        self.values = np.empty(0, dtype="datetime64[D]")
+        self._chunks: List[np.ndarray] = []
+
+    def copy(self) -> "DateColumn":
+        column = DateColumn()
+        column.values = self.values
+        return column
+
+    def add(self, answers: Sequence[Any], start: int) -> None:
+        self._chunks.append(np.fromiter(map(_to_day, answers), dtype="datetime64[D]", count=len(answers)))
+
+
+class ChoiceColumn:
+    """
+    Opções escolhidas em formato de coordenadas: rows[i] é a linha da resposta
+    e codes[i] o índice da opção em categories. Campos de múltipla escolha
+    geram várias coordenadas por linha.
+    """
+
+    def __init__(self, categories: Iterable[str] = ()):
+        self.categories: List[str] = list(categories)
+        self._index: Dict[str, int] = {value: code for code, value in enumerate(self.categories)}
+        self.rows = np.empty(0, dtype=np.int64)
+        self.codes = np.empty(0, dtype=np.int32)
+        self._rows: List[int] = []
+        self._codes: List[int] = []
+
+    def copy(self) -> "ChoiceColumn":
+        column = ChoiceColumn(self.categories)
+        column.rows = self.rows
+        column.codes = self.codes
+        return column
+
+    def _code(self, value: Any) -> int:
+        label = _choice_label(value)
+        code = self._index.get(label)
+        if code is None:
+            # Valores fora da lista de opções (ex.: opções removidas do formulário)
+            code = self._index[label] = len(self.categories)
+            self.categories.append(label)
+        return code
+
+    def add(self, answers: Sequence[Any], start: int) -> None:
+        for row, answer in enumerate(answers, start):
+            if answer in EMPTY_VALUES:
+                continue
+            for value in answer if isinstance(answer, list) else (answer,):
+                self._rows.append(row)
+                self._codes.append(self._code(value))
+
+    def finish(self) -> None:
+        if self._rows:
+            self.rows = np.concatenate([self.rows, np.array(self._rows, dtype=np.int64)])
+            self.codes = np.concatenate([self.codes, np.array(self._codes, dtype=np.int32)])
+            self._rows, self._codes = [], []
+
+    def row_mask(self, code: int, size: int) -> np.ndarray:
+        mask = np.zeros(size, dtype=bool)
+        mask[self.rows[self.codes == code]] = True
+        return mask
+
+
+def _new_column(field_type: FieldType, options: Optional[Iterable[str]]):
+    if field_type == FieldType.NUMBER:
+        return NumberColumn()
+    if field_type == FieldType.DATE:
+        return DateColumn()
+    if field_type in CHOICE_TYPES or field_type in MULTI_CHOICE_TYPES:
+        return ChoiceColumn(sorted(options or ()))
+    return None
+
+
+class FormSnapshot:
+    """
+    Snapshot colunar das respostas de um formulário, uma coluna tipada por
+    campo analisável (número, data, escolha). Imutável depois de publicado:
+    appended() devolve um novo snapshot com as respostas novas no fim.
+    """
+
+    def __init__(self, form: Form):
+        self.form_id = form.id
+        self.version = form_fields_version(form)
+        self.last_response_id = 0
+        self.synced_at: Optional[float] = None
+        self.size = 0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.created_at = np.empty(0, dtype="datetime64[s]")
+        self.columns: Dict[str, Any] = {}
+        for field in get_form_validator(form).fields.values():
+            column = _new_column(field.type, field.options)
+            if column is not None:
+                self.columns[field.id] = column
+        self._created_chunks: List[np.ndarray] = []
+        self._id_chunks: List[np.ndarray] = []
+
+    def _copy(self) -> "FormSnapshot":
+        snapshot = object.__new__(FormSnapshot)
+        snapshot.form_id = self.form_id
+        snapshot.version = self.version
+        snapshot.last_response_id = self.last_response_id
+        snapshot.synced_at = self.synced_at
+        snapshot.size = self.size
+        snapshot.ids = self.ids
+        snapshot.created_at = self.created_at
+        snapshot.columns = {field_id: column.copy() for field_id, column in self.columns.items()}
+        snapshot._created_chunks = []
+        snapshot._id_chunks = []
+        return snapshot
+
+    def _add_chunk(self, rows: Sequence[ResponseRow]) -> None:
+        if not rows:
+            return
+        ids = np.fromiter((response_id for response_id, _, _ in rows), dtype=np.int64, count=len(rows))
+        if ids[0] <= self.last_response_id:
+            # Lote (ordenado por id) com linhas da releitura: descarta as já carregadas
+            loaded = np.isin(ids, self.ids[self.ids >= ids[0]])
+            if loaded.any():
+                rows = [row for row, known in zip(rows, loaded) if not known]
+                ids = ids[~loaded]
+                if not rows:
+                    return
+        for field_id, column in self.columns.items():
+            column.add([answers.get(field_id) for _, answers, _ in rows], self.size)
+        self._created_chunks.append(np.fromiter(
+            (_to_second(created_at) for _, _, created_at in rows), dtype="datetime64[s]", count=len(rows)
+        ))
+        self._id_chunks.append(ids)
+        self.size += len(rows)
+        self.last_response_id = max(self.last_response_id, int(ids[-1]))
+
+    def _finish(self, synced_at: Optional[float] = None) -> "FormSnapshot":
+        for column in self.columns.values():
+            column.finish()
+        if self._created_chunks:
+            self.created_at = np.concatenate([self.created_at, *self._created_chunks])
+            self.ids = np.concatenate([self.ids, *self._id_chunks])
+            self._created_chunks, self._id_chunks = [], []
+        self.synced_at = synced_at
+        return self
+
+    def appended(self, chunks: Iterable[Sequence[ResponseRow]], synced_at: Optional[float] = None) -> "FormSnapshot":
+        """
+        Novo snapshot com os lotes (ordenados por id) acrescentados; linhas
+        que já estão no snapshot são ignoradas.
+        """
+        snapshot = self._copy()
+        for rows in chunks:
+            snapshot._add_chunk(rows)
+        return snapshot._finish(synced_at)
+
+    def _column(self, field_id: str, kinds: Tuple[type, ...], expected: str):
+        column = self.columns.get(field_id)
+        if type(column) not in kinds:
+            raise _bad_request(f"Field '{field_id}' is not a {expected} field")
+        return column
+
+    def crosstab(self, row_field: str, column_field: str) -> CrossTab:
+        """Tabela de contingência entre dois campos de escolha."""
+        rows = self._column(row_field, (ChoiceColumn,), "choice")
+        columns = self._column(column_field, (ChoiceColumn,), "choice")
+        width = len(columns.categories)
+        counts = np.zeros((len(rows.categories), width), dtype=np.int64)
+        for code in range(len(rows.categories)):
+            # Opções da coluna escolhidas nas linhas que marcaram esta opção
+            mask = rows.row_mask(code, self.size)
+            counts[code] = np.bincount(columns.codes[mask[columns.rows]], minlength=width)
+        answered_rows = np.zeros(self.size, dtype=bool)
+        answered_rows[rows.rows] = True
+        answered_columns = np.zeros(self.size, dtype=bool)
+        answered_columns[columns.rows] = True
+        return CrossTab(
+            row_field=row_field,
+            column_field=column_field,
+            rows=rows.categories,
+            columns=columns.categories,
+            counts=counts.tolist(),
+            total=int(np.count_nonzero(answered_rows & answered_columns))
+        )
+
+    def percentiles(self, field_id: str, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> PercentileSummary:
+        """Percentis de um campo numérico, ignorando respostas em branco."""
+        if any(not 0 <= q <= 100 for q in percentiles):
+            raise _bad_request("Percentiles must be between 0 and 100")
+        values = self._column(field_id, (NumberColumn,), "number").values
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return PercentileSummary(field_id=field_id, count=0, percentiles={f"p{q:g}": None for q in percentiles})
+        results = np.percentile(values, percentiles)
+        return PercentileSummary(
+            field_id=field_id,
+            count=int(values.size),
+            mean=float(values.mean()),
+            percentiles={f"p{q:g}": float(value) for q, value in zip(percentiles, results)}
+        )
+
+    def date_histogram(self, field_id: Optional[str] = None, interval: str = "day") -> DateHistogram:
+        """Respostas por dia/semana/mês/ano de um campo de data (ou da data de envio)."""
+        if interval not in HISTOGRAM_INTERVALS:
+            raise _bad_request(f"Interval must be one of: {', '.join(HISTOGRAM_INTERVALS)}")
+        if field_id is None:
+            days = self.created_at.astype("datetime64[D]")
+        else:
+            days = self._column(field_id, (DateColumn,), "date").values
+        days = days[~np.isnat(days)]
+
+        if interval == "week":
+            # Semanas começando na segunda-feira (1970-01-01 foi uma quinta)
+            offsets = days.astype(np.int64) + 3
+            starts = (offsets - offsets % 7 - 3).astype("datetime64[D]")
+        elif interval == "month":
+            starts = days.astype("datetime64[M]").astype("datetime64[D]")
+        elif interval == "year":
+            starts = days.astype("datetime64[Y]").astype("datetime64[D]")
+        else:
+            starts = days
+        buckets, counts = np.unique(starts, return_counts=True)
+        return DateHistogram(
+            field_id=field_id,
+            interval=interval,
+            buckets=[
+                HistogramBucket(start=start.item(), count=int(count))
+                for start, count in zip(buckets, counts)
+            ]
+        )
+
+
+class SnapshotCache:
+    """Snapshots por form_id (LRU); cada um lembra o último id de resposta incluído."""
+
+    def __init__(self, maxsize: int):
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, form: Form) -> Optional[FormSnapshot]:
+        with self._lock:
+            snapshot = self._entries.get(form.id)
+        # Mudanças nos campos do formulário invalidam os tipos das colunas
+        if snapshot is not None and snapshot.version == form_fields_version(form):
+            return snapshot
+        return None
+
+    def put(self, snapshot: FormSnapshot) -> FormSnapshot:
+        with self._lock:
+            current = self._entries.get(snapshot.form_id)
+            # Duas atualizações concorrentes: fica o snapshot sincronizado por último
+            if current is None or current.version != snapshot.version \
+                    or (current.synced_at or 0) <= (snapshot.synced_at or 0):
+                self._entries[snapshot.form_id] = snapshot
+        return snapshot
+
+    def invalidate(self, form_id: int) -> None:
+        with self._lock:
+            self._entries.pop(form_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+snapshot_cache = SnapshotCache(settings.ANALYTICS_SNAPSHOT_CACHE_SIZE)
+
+
+def _response_stats_query(form_id: int):
+    return select(func.max(FormResponse.id), func.count(FormResponse.id)).where(FormResponse.form_id == form_id)
+
+
+def _new_responses_query(snapshot: FormSnapshot, chunk_size: int):
+    pending = FormResponse.id > snapshot.last_response_id
+    if snapshot.synced_at is not None:
+        since = datetime.fromtimestamp(snapshot.synced_at - REFRESH_LOOKBACK_SECONDS, tz=timezone.utc)
+        pending = or_(pending, FormResponse.created_at >= since)
+    return (
+        select(FormResponse.id, FormResponse.responses, FormResponse.created_at)
+        .where(FormResponse.form_id == snapshot.form_id, pending)
+        .order_by(FormResponse.id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+
+def _refresh_base(form: Form, last_id: Optional[int], total: int) -> Tuple[FormSnapshot, bool]:
+    """
+    Snapshot a partir do qual atualizar e se ele já tem todas as respostas.
+    Um total maior com o mesmo último id indica ids confirmados fora de
+    ordem; um total menor, respostas removidas.
+    """
+    snapshot = _cached_or_empty(form)
+    last_id = last_id or 0
+    if last_id == snapshot.last_response_id and total == snapshot.size:
+        return snapshot, True
+    if last_id < snapshot.last_response_id or total < snapshot.size:
+        return FormSnapshot(form), False
+    return snapshot, False
+
+
+def _cached_or_empty(form: Form) -> FormSnapshot:
+    return snapshot_cache.get(form) or FormSnapshot(form)
+
+
+class FormAnalyticsService:
+    """
+    Snapshots colunares para análises pesadas (tabulação cruzada, percentis,
+    histogramas). Respostas só são acrescentadas, então o snapshot em cache
+    é atualizado lendo apenas as linhas novas: id maior que o último
+    carregado ou criadas dentro de REFRESH_LOOKBACK_SECONDS da sincronização
+    anterior. Se ainda faltarem respostas, o snapshot é refeito do zero.
+    """
+
+    @staticmethod
+    def get_snapshot(db: Session, form: Form, chunk_size: Optional[int] = None) -> FormSnapshot:
+        synced_at = time.time()
+        last_id, total = db.execute(_response_stats_query(form.id)).one()
+        snapshot, current = _refresh_base(form, last_id, total)
+        if current:
+            return snapshot
+
+        chunk_size = chunk_size or settings.ANALYTICS_CHUNK_SIZE
+        updated = snapshot.appended(db.execute(_new_responses_query(snapshot, chunk_size)).partitions(), synced_at)
+        if updated.size < total:
+            snapshot = FormSnapshot(form)
+            updated = snapshot.appended(db.execute(_new_responses_query(snapshot, chunk_size)).partitions(), synced_at)
+        return snapshot_cache.put(updated)
+
+
+class AsyncFormAnalyticsService:
+    @staticmethod
+    async def _appended(db: AsyncSession, snapshot: FormSnapshot, chunk_size: int, synced_at: float) -> FormSnapshot:
+        result = await db.stream(_new_responses_query(snapshot, chunk_size))
+        # Converte lote a lote para não manter as linhas do banco em memória;
+        # montar as colunas NumPy é CPU e roda numa thread, fora do event loop
+        snapshot = snapshot._copy()
+        async for rows in result.partitions():
+            await anyio.to_thread.run_sync(snapshot._add_chunk, rows)
+        return await anyio.to_thread.run_sync(snapshot._finish, synced_at)
+
+    @staticmethod
+    async def get_snapshot(db: AsyncSession, form: Form, chunk_size: Optional[int] = None) -> FormSnapshot:
+        synced_at = time.time()
+        last_id, total = (await db.execute(_response_stats_query(form.id))).one()
+        snapshot, current = _refresh_base(form, last_id, total)
+        if current:
+            return snapshot
+
+        chunk_size = chunk_size or settings.ANALYTICS_CHUNK_SIZE
+        updated = await AsyncFormAnalyticsService._appended(db, snapshot, chunk_size, synced_at)
+        if updated.size < total:
+            updated = await AsyncFormAnalyticsService._appended(db, FormSnapshot(form), chunk_size, synced_at)
+        return snapshot_cache.put(updated)
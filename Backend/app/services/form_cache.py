@@ -0,0 +1,120 @@
+import threading
+from typing import Any, Dict, Optional
+from cachetools import LRUCache, TTLCache
+from app.core.config import get_settings
+from app.models.form import Form
+from app.schemas.form import Form as FormSchema
+from app.utils.compression import compress
+from app.utils.etag import body_etag
+
+settings = get_settings()
+
+
+class CachedForm:
+    """Definição de formulário já validada e serializada para resposta."""
+
+    __slots__ = ("form", "body", "etag", "_encoded")
+
+    def __init__(self, form: FormSchema, body: bytes):
+        self.form = form
+        self.body = body
+        self.etag = body_etag(body)
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        """Corpo comprimido, calculado uma única vez por codificação."""
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = compress(self.body, encoding)
+            self._encoded[encoding] = body
+        return body
+
+    @classmethod
+    def from_model(cls, form: Form) -> "CachedForm":
+        schema = FormSchema.model_validate(form)
+        return cls(schema, schema.model_dump_json().encode())
+
+
+class _InvalidationLog(LRUCache):
+    """Geração da última invalidação por id; guarda a maior geração descartada pelo LRU."""
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self.floor = 0
+
+    def popitem(self):
+        key, generation = super().popitem()
+        self.floor = max(self.floor, generation)
+        return key, generation
+
+    def last(self, form_id: int) -> int:
+        return self.get(form_id, self.floor)
+
+
+class FormDefinitionCache:
+    """
+    Cache read-through das definições de formulário, por id.
+
+    Limitado em tamanho (LRU) e em tempo (TTL); update_form e delete_form
+    invalidam a entrada explicitamente. A invalidação só vale para este
+    processo: nos demais a entrada expira pelo TTL.
+
+    Um miss pega generation() antes de ler o banco e a passa para put();
+    se o formulário foi invalidado no meio tempo, a leitura pode estar
+    desatualizada e não é guardada.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._invalidations = _InvalidationLog(maxsize)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, form_id: int) -> Optional[CachedForm]:
+        with self._lock:
+            entry = self._entries.get(form_id)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def put(self, form: Form, generation: Optional[int] = None) -> CachedForm:
+        """Serializa o formulário e o guarda, salvo se foi invalidado depois de generation."""
+        entry = CachedForm.from_model(form)
+        with self._lock:
+            if generation is None or self._invalidations.last(form.id) <= generation:
+                self._entries[form.id] = entry
+        return entry
+
+    def invalidate(self, form_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidations[form_id] = self._generation
+            self._entries.pop(form_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidations.clear()
+            self._invalidations.floor = self._generation
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self._entries.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+form_cache = FormDefinitionCache(settings.FORM_CACHE_SIZE, settings.FORM_CACHE_TTL)
@@ -1,32 +1,43 @@
-from typing import List, Optional
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.core.database import SessionLocal
 from app.models.form import Form
 from app.models.form_response import FormResponse
-from app.schemas.form import FormCreate, FormUpdate
+from app.models.form_summary import FormSummaryCounter
+from app.models.response_answer import ResponseAnswer
+from app.schemas.form import (
+    FormCreate,
+    FormUpdate,
+    FormSubmission,
+    FormSummary,
+    BulkSubmissionError,
+    BulkSubmissionResult,
+)
+from app.services.form_cache import CachedForm, form_cache
+from app.services.form_analytics import AsyncFormAnalyticsService, FormAnalyticsService, FormSnapshot, snapshot_cache
+from app.services.form_summary import AsyncFormSummaryService, FormSummaryService
+from app.services.form_validator import get_form_validator, invalidate_form_validator
+from app.services.response_answers import ResponseAnswerService
+from app.services.submission_dedup import submitted_respondents
+from app.utils.pagination import keyset_paginate, keyset_paginate_async
 from datetime import datetime
+import csv
+import io
 import json
 
+settings = get_settings()
+
 class FormService:
     @staticmethod
     def create_form(db: Session, form_data: FormCreate, owner_id: int) -> Form:
         """Cria um novo formulário."""
-        # Validar campos do formulário
-        for field in form_data.fields:
-            if field.type.value in ['select', 'multiselect', 'radio'] and not field.options:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Field '{field.label}' requires options"
-                )
-
-        # Criar o formulário
-        db_form = Form(
-            title=form_data.title,
-            description=form_data.description,
-            fields=json.loads(form_data.fields.json()),
-            settings=json.loads(form_data.settings.json()),
-            owner_id=owner_id
-        )
+        db_form = FormService._build_form(form_data, owner_id)
         
         db.add(db_form)
         db.commit()
@@ -37,37 +48,35 @@ class FormService:
     def get_form(db: Session, form_id: int, user_id: Optional[int] = None) -> Form:
         """Obtém um formulário por ID."""
         form = db.query(Form).filter(Form.id == form_id).first()
-        if not form:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Form not found"
-            )
-        
-        # Verificar permissão
-        if not form.settings.get('is_public', False) and (not user_id or form.owner_id != user_id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this form"
-            )
-        
+        FormService._check_read_access(form, user_id)
         return form
 
     @staticmethod
     def get_forms(db: Session, user_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Form]:
         """Lista todos os formulários acessíveis ao usuário."""
-        query = db.query(Form)
-        
+        return FormService._accessible_forms_query(db, user_id).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def get_forms_page(
+        db: Session,
+        user_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Form], Optional[str]]:
+        """Lista os formulários acessíveis ao usuário com paginação por cursor."""
+        return keyset_paginate(FormService._accessible_forms_query(db, user_id), Form, cursor, limit)
+
+    @staticmethod
+    def _accessible_forms_query(db: Session, user_id: Optional[int] = None):
+        return db.query(Form).filter(FormService._accessible_forms_criterion(user_id))
+
+    @staticmethod
+    def _accessible_forms_criterion(user_id: Optional[int] = None):
         if user_id:
             # Se o usuário estiver autenticado, retorna seus formulários e os públicos
-            query = query.filter(
-                (Form.owner_id == user_id) | 
-                (Form.settings['is_public'].as_boolean() == True)
-            )
-        else:
-            # Se não estiver autenticado, retorna apenas os formulários públicos
-            query = query.filter(Form.settings['is_public'].as_boolean() == True)
-        
-        return query.offset(skip).limit(limit).all()
+            return (Form.owner_id == user_id) | (Form.settings['is_public'].as_boolean() == True)
+        # Se não estiver autenticado, retorna apenas os formulários públicos
+        return Form.settings['is_public'].as_boolean() == True
 
     @staticmethod
     def get_user_forms(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Form]:
@@ -78,47 +87,57 @@ class FormService:
             .limit(limit)\
             .all()
 
+    @staticmethod
+    def get_user_forms_page(
+        db: Session,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Form], Optional[str]]:
+        """Lista os formulários do usuário com paginação por cursor."""
+        query = db.query(Form).filter(Form.owner_id == user_id)
+        return keyset_paginate(query, Form, cursor, limit)
+
     @staticmethod
     def update_form(db: Session, form_id: int, form_data: FormUpdate, user_id: int) -> Form:
         """Atualiza um formulário existente."""
         form = FormService.get_form(db, form_id, user_id)
-        
-        # Verificar propriedade
-        if form.owner_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to modify this form"
-            )
-
-        # Atualizar campos
-        for key, value in form_data.dict(exclude_unset=True).items():
-            if key == 'fields':
-                setattr(form, key, json.loads(value.json()))
-            elif key == 'settings':
-                setattr(form, key, json.loads(value.json()))
-            else:
-                setattr(form, key, value)
-
-        form.updated_at = datetime.utcnow()
+        FormService._check_owner(form, user_id, "Not authorized to modify this form")
+        enforced = FormService._enforces_one_response(form)
+        FormService._apply_update(form, form_data)
+        if FormService._enforces_one_response(form) != enforced:
+            db.execute(FormService._unique_respondents_statement(form_id, not enforced))
         db.commit()
         db.refresh(form)
+        invalidate_form_validator(form_id)
+        form_cache.invalidate(form_id)
+        snapshot_cache.invalidate(form_id)
         return form
 
     @staticmethod
     def delete_form(db: Session, form_id: int, user_id: int) -> bool:
         """Exclui um formulário."""
         form = FormService.get_form(db, form_id, user_id)
-        
-        if form.owner_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to delete this form"
-            )
+        FormService._check_owner(form, user_id, "Not authorized to delete this form")
 
+        for statement in FormService._delete_form_children(form_id):
+            db.execute(statement)
         db.delete(form)
         db.commit()
+        invalidate_form_validator(form_id)
+        form_cache.invalidate(form_id)
+        snapshot_cache.invalidate(form_id)
         return True
 
+    @staticmethod
+    def _delete_form_children(form_id: int):
+        """DELETEs em lote das linhas ligadas ao formulário, sem carregá-las na sessão."""
+        return (
+            delete(ResponseAnswer).where(ResponseAnswer.form_id == form_id),
+            delete(FormResponse).where(FormResponse.form_id == form_id),
+            delete(FormSummaryCounter).where(FormSummaryCounter.form_id == form_id),
+        )
+
     @staticmethod
     def submit_response(
         db: Session,
@@ -130,8 +149,343 @@ class FormService:
     ) -> FormResponse:
         """Submete uma resposta para um formulário."""
         form = FormService.get_form(db, form_id)
+        FormService._check_accepting_responses(form)
+
+        # Resposta única por usuário: o índice único decide, o cache só antecipa
+        unique = FormService._enforces_one_response(form) and user_id is not None
+        if unique and submitted_respondents.seen(form_id, user_id):
+            raise FormService._already_submitted()
+
+        # Validar respostas
+        FormService._validate_answers(form, answers)
+
+        # Criar resposta
+        response = FormResponse(
+            **FormService._build_response_row(form_id, answers, user_id, email, metadata, unique)
+        )
+
+        db.add(response)
+        try:
+            db.flush()
+        except IntegrityError as e:
+            db.rollback()
+            FormService._raise_if_duplicate(e, form_id, user_id, unique)
+            raise
+        ResponseAnswerService.save(db, form, [(response.id, answers)])
+        FormSummaryService.record(db, form, [(answers, response.created_at)])
+        db.commit()
+        if unique:
+            submitted_respondents.add(form_id, user_id)
+        db.refresh(response)
+        return response
+
+    @staticmethod
+    def submit_responses_bulk(
+        db: Session,
+        form_id: int,
+        items: Iterable[Tuple[int, Any]],
+        user_id: Optional[int] = None,
+        is_admin: bool = False
+    ) -> BulkSubmissionResult:
+        """Valida um lote de respostas e insere as válidas em uma única transação."""
+        form = db.get(Form, form_id)
+        FormService._check_import_access(form, user_id, is_admin)
+        FormService._check_accepting_responses(form)
+        rows, errors = FormService._prepare_bulk_rows(form, items)
+
+        if rows:
+            try:
+                inserted = db.execute(FormService._bulk_insert_statement(), rows).all()
+                answers = [row["responses"] for row in rows]
+                ResponseAnswerService.save(db, form, zip((row.id for row in inserted), answers))
+                FormSummaryService.record(db, form, zip(answers, (row.created_at for row in inserted)))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+        return BulkSubmissionResult(accepted=len(rows), rejected=len(errors), errors=errors)
+
+    @staticmethod
+    def _bulk_insert_statement():
+        """INSERT em lote que devolve id e created_at na ordem das linhas enviadas."""
+        return insert(FormResponse).returning(FormResponse.id, FormResponse.created_at, sort_by_parameter_order=True)
+
+    @staticmethod
+    def _prepare_bulk_rows(form: Form, items: Iterable[Tuple[int, Any]]) -> Tuple[List[dict], List[BulkSubmissionError]]:
+        """Valida os itens de um lote e monta as linhas das respostas válidas."""
+        validator = get_form_validator(form)
+        rows = []
+        errors = []
+        for index, item in items:
+            try:
+                submission = FormSubmission.model_validate(item)
+                validator.validate(submission.answers)
+            except ValidationError as e:
+                errors.append(BulkSubmissionError(index=index, detail=str(e.errors()[0]["msg"])))
+                continue
+            except HTTPException as e:
+                errors.append(BulkSubmissionError(index=index, detail=str(e.detail)))
+                continue
+            rows.append(FormService._build_response_row(
+                form.id,
+                submission.answers,
+                None,
+                submission.email,
+                submission.metadata
+            ))
+        return rows, errors
+
+    @staticmethod
+    def get_form_responses(
+        db: Session,
+        form_id: int,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[FormResponse]:
+        """Lista as respostas de um formulário do usuário."""
+        return FormService._form_responses_query(db, form_id, user_id)\
+            .offset(skip)\
+            .limit(limit)\
+            .all()
+
+    @staticmethod
+    def get_form_responses_page(
+        db: Session,
+        form_id: int,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[FormResponse], Optional[str]]:
+        """Lista as respostas de um formulário com paginação por cursor."""
+        query = FormService._form_responses_query(db, form_id, user_id)
+        return keyset_paginate(query, FormResponse, cursor, limit)
+
+    @staticmethod
+    def _form_responses_query(db: Session, form_id: int, user_id: int):
+        form = FormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to view responses of this form")
+
+        return db.query(FormResponse).filter(FormResponse.form_id == form_id)
+
+    @staticmethod
+    def get_summary(db: Session, form_id: int, user_id: int) -> FormSummary:
+        """Resumo das respostas a partir dos contadores incrementais."""
+        form = FormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to view responses of this form")
+        return FormSummaryService.get_summary(db, form)
+
+    @staticmethod
+    def rebuild_summary(db: Session, form_id: int, user_id: int) -> FormSummary:
+        """Recalcula os contadores do resumo a partir de todas as respostas."""
+        form = FormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to view responses of this form")
+        FormSummaryService.rebuild(db, form)
+        return FormSummaryService.get_summary(db, form)
+
+    @staticmethod
+    def get_analytics_snapshot(db: Session, form_id: int, user_id: int) -> FormSnapshot:
+        """Snapshot colunar das respostas, atualizado com as respostas novas."""
+        form = FormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to view responses of this form")
+        return FormAnalyticsService.get_snapshot(db, form)
+
+    @staticmethod
+    def export_responses(db: Session, form_id: int, user_id: int, export_format: str) -> Iterator[str]:
+        """Exporta as respostas de um formulário em CSV ou NDJSON, em streaming."""
+        form = FormService.get_form(db, form_id, user_id)
+        return FormService._export_stream(form, user_id, export_format)
+
+    @staticmethod
+    def _export_stream(form: Form, user_id: int, export_format: str) -> Iterator[str]:
+        FormService._check_owner(form, user_id, "Not authorized to export responses of this form")
+
+        if export_format == "csv":
+            fields = sorted(form.fields, key=lambda field: field.get('order', 0))
+            return FormService._stream_responses_csv(form.id, fields)
+        if export_format == "ndjson":
+            return FormService._stream_responses_ndjson(form.id)
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format '{export_format}'"
+        )
+
+    @staticmethod
+    def _iter_response_batches(form_id: int) -> Iterator[list]:
+        """Percorre as respostas com um cursor no servidor, um lote por vez."""
+        # Sessão própria: o cursor precisa sobreviver ao ciclo da requisição
+        with SessionLocal() as db:
+            result = db.execute(
+                select(
+                    FormResponse.id,
+                    FormResponse.respondent_id,
+                    FormResponse.respondent_email,
+                    FormResponse.responses,
+                    FormResponse.created_at
+                )
+                .where(FormResponse.form_id == form_id)
+                .order_by(FormResponse.id)
+                .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+            )
+            for batch in result.partitions():
+                yield batch
+
+    @staticmethod
+    def _stream_responses_csv(form_id: int, fields: List[dict]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        field_ids = [field['id'] for field in fields]
+        writer.writerow(
+            ["response_id", "submitted_at", "respondent_id", "respondent_email"]
+            + [field.get('label') or field['id'] for field in fields]
+        )
+
+        for batch in FormService._iter_response_batches(form_id):
+            for row in batch:
+                answers = row.responses or {}
+                values = []
+                for field_id in field_ids:
+                    value = answers.get(field_id)
+                    if isinstance(value, list):
+                        value = "; ".join(str(item) for item in value)
+                    values.append("" if value is None else value)
+                writer.writerow([
+                    row.id,
+                    row.created_at.isoformat() if row.created_at else "",
+                    row.respondent_id or "",
+                    row.respondent_email or "",
+                    *values
+                ])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Formulário sem respostas: envia apenas o cabeçalho
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def _stream_responses_ndjson(form_id: int) -> Iterator[str]:
+        for batch in FormService._iter_response_batches(form_id):
+            yield "".join(
+                json.dumps({
+                    "id": row.id,
+                    "respondent_id": row.respondent_id,
+                    "respondent_email": row.respondent_email,
+                    "answers": row.responses,
+                    "submitted_at": row.created_at.isoformat() if row.created_at else None,
+                }) + "\n"
+                for row in batch
+            )
+
+    @staticmethod
+    def _build_form(form_data: FormCreate, owner_id: int) -> Form:
+        # Validar campos do formulário
+        for field in form_data.fields:
+            if field.type.value in ['select', 'multiselect', 'radio'] and not field.options:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Field '{field.label}' requires options"
+                )
+
+        return Form(
+            title=form_data.title,
+            description=form_data.description,
+            fields=[field.model_dump(mode="json") for field in form_data.fields],
+            settings=form_data.settings.model_dump(mode="json"),
+            owner_id=owner_id
+        )
 
-        # Verificar se o formulário está ativo e dentro do prazo
+    @staticmethod
+    def _apply_update(form: Form, form_data: FormUpdate):
+        for key, value in form_data.dict(exclude_unset=True).items():
+            if key == 'fields':
+                value = [field.model_dump(mode="json") for field in form_data.fields]
+            elif key == 'settings':
+                value = form_data.settings.model_dump(mode="json")
+            setattr(form, key, value)
+
+        form.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def _check_read_access(form: Optional[Form], user_id: Optional[int]):
+        if not form:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Form not found"
+            )
+        FormService._check_visibility(form.settings.get('is_public', False), form.owner_id, user_id)
+
+    @staticmethod
+    def _check_visibility(is_public: bool, owner_id: int, user_id: Optional[int]):
+        # Verificar permissão
+        if not is_public and (not user_id or owner_id != user_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this form"
+            )
+
+    @staticmethod
+    def _check_owner(form: Form, user_id: int, detail: str):
+        if form.owner_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+
+    @staticmethod
+    def _check_import_access(form: Optional[Form], user_id: Optional[int], is_admin: bool):
+        """Importação em lote: as linhas são anônimas, então só o dono ou um administrador."""
+        if not form:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Form not found"
+            )
+        if not is_admin:
+            FormService._check_owner(form, user_id, "Not authorized to import responses into this form")
+
+    @staticmethod
+    def _already_submitted() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already submitted a response to this form"
+        )
+
+    @staticmethod
+    def _enforces_one_response(form: Form) -> bool:
+        return bool(form.settings.get('one_response_per_user', True))
+
+    @staticmethod
+    def _raise_if_duplicate(error: IntegrityError, form_id: int, user_id: Optional[int], unique: bool):
+        """Converte a violação do índice de resposta única em erro 400."""
+        if unique and "unique_respondent" in str(error.orig):
+            submitted_respondents.add(form_id, user_id)
+            raise FormService._already_submitted() from error
+
+    @staticmethod
+    def _unique_respondents_statement(form_id: int, enforce: bool):
+        """
+        Ajusta unique_respondent_id quando one_response_per_user muda: ao ligar,
+        marca a primeira resposta de cada usuário; ao desligar, limpa as marcas.
+        """
+        stmt = update(FormResponse).where(FormResponse.form_id == form_id)
+        if not enforce:
+            return stmt.values(unique_respondent_id=None)
+        first_responses = (
+            select(func.min(FormResponse.id))
+            .where(FormResponse.form_id == form_id, FormResponse.respondent_id.is_not(None))
+            .group_by(FormResponse.respondent_id)
+            .having(func.count(FormResponse.unique_respondent_id) == 0)
+        )
+        return stmt.where(FormResponse.id.in_(first_responses)).values(
+            unique_respondent_id=FormResponse.respondent_id
+        )
+
+    @staticmethod
+    def _check_accepting_responses(form: Form):
+        """Verifica se o formulário está ativo e dentro do prazo."""
         if not form.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -144,56 +498,280 @@ class FormService:
                 detail="This form has expired"
             )
 
-        # Verificar resposta única por usuário
-        if form.settings.get('one_response_per_user', True) and user_id:
-            existing_response = db.query(FormResponse)\
-                .filter(FormResponse.form_id == form_id)\
-                .filter(FormResponse.respondent_id == user_id)\
-                .first()
-            
-            if existing_response:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="You have already submitted a response to this form"
-                )
+    @staticmethod
+    def _build_response_row(
+        form_id: int,
+        answers: dict,
+        user_id: Optional[int],
+        email: Optional[str],
+        metadata: Optional[dict],
+        unique: bool = False
+    ) -> dict:
+        """Monta os valores de uma linha de form_responses."""
+        metadata = metadata or {}
+        return {
+            "form_id": form_id,
+            "respondent_id": user_id,
+            "unique_respondent_id": user_id if unique else None,
+            "respondent_email": email,
+            "responses": answers,
+            "ip_address": metadata.get("ip_address"),
+            "user_agent": metadata.get("user_agent"),
+            "browser_fingerprint": metadata.get("browser_fingerprint"),
+        }
+
+    @staticmethod
+    def _validate_answers(form: Form, answers: dict):
+        """Valida as respostas do formulário."""
+        get_form_validator(form).validate(answers)
+
+
+class AsyncFormService:
+    """Variante assíncrona de FormService para uso com AsyncSession."""
+
+    @staticmethod
+    async def create_form(db: AsyncSession, form_data: FormCreate, owner_id: int) -> Form:
+        """Cria um novo formulário."""
+        db_form = FormService._build_form(form_data, owner_id)
+
+        db.add(db_form)
+        await db.commit()
+        await db.refresh(db_form)
+        return db_form
+
+    @staticmethod
+    async def get_form(db: AsyncSession, form_id: int, user_id: Optional[int] = None) -> Form:
+        """Obtém um formulário por ID."""
+        form = await db.get(Form, form_id)
+        FormService._check_read_access(form, user_id)
+        return form
+
+    @staticmethod
+    async def get_form_definition(db: AsyncSession, form_id: int, user_id: Optional[int] = None) -> CachedForm:
+        """Obtém a definição serializada do formulário, passando pelo cache."""
+        cached = form_cache.get(form_id)
+        if cached is None:
+            generation = form_cache.generation()
+            form = await db.get(Form, form_id)
+            FormService._check_read_access(form, user_id)
+            return form_cache.put(form, generation)
+
+        FormService._check_visibility(cached.form.settings.is_public, cached.form.owner_id, user_id)
+        return cached
+
+    @staticmethod
+    async def get_forms(
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Form]:
+        """Lista todos os formulários acessíveis ao usuário."""
+        stmt = select(Form).where(FormService._accessible_forms_criterion(user_id))
+        return list(await db.scalars(stmt.offset(skip).limit(limit)))
+
+    @staticmethod
+    async def get_forms_page(
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Form], Optional[str]]:
+        """Lista os formulários acessíveis ao usuário com paginação por cursor."""
+        stmt = select(Form).where(FormService._accessible_forms_criterion(user_id))
+        return await keyset_paginate_async(db, stmt, Form, cursor, limit)
+
+    @staticmethod
+    async def get_forms_version(db: AsyncSession, user_id: Optional[int] = None) -> Tuple[Any, int]:
+        """Retorna (maior updated_at, total) dos formulários acessíveis, para o ETag da listagem."""
+        stmt = select(func.max(Form.updated_at), func.count(Form.id))\
+            .where(FormService._accessible_forms_criterion(user_id))
+        return tuple((await db.execute(stmt)).one())
+
+    @staticmethod
+    async def get_user_forms_version(db: AsyncSession, user_id: int) -> Tuple[Any, int]:
+        """Retorna (maior updated_at, total) dos formulários do usuário, para o ETag da listagem."""
+        stmt = select(func.max(Form.updated_at), func.count(Form.id)).where(Form.owner_id == user_id)
+        return tuple((await db.execute(stmt)).one())
+
+    @staticmethod
+    async def get_user_forms(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Form]:
+        """Lista todos os formulários do usuário."""
+        stmt = select(Form).where(Form.owner_id == user_id)
+        return list(await db.scalars(stmt.offset(skip).limit(limit)))
+
+    @staticmethod
+    async def get_user_forms_page(
+        db: AsyncSession,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Form], Optional[str]]:
+        """Lista os formulários do usuário com paginação por cursor."""
+        stmt = select(Form).where(Form.owner_id == user_id)
+        return await keyset_paginate_async(db, stmt, Form, cursor, limit)
+
+    @staticmethod
+    async def update_form(db: AsyncSession, form_id: int, form_data: FormUpdate, user_id: int) -> Form:
+        """Atualiza um formulário existente."""
+        form = await AsyncFormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to modify this form")
+        enforced = FormService._enforces_one_response(form)
+        FormService._apply_update(form, form_data)
+        if FormService._enforces_one_response(form) != enforced:
+            await db.execute(FormService._unique_respondents_statement(form_id, not enforced))
+        await db.commit()
+        await db.refresh(form)
+        invalidate_form_validator(form_id)
+        form_cache.invalidate(form_id)
+        snapshot_cache.invalidate(form_id)
+        return form
+
+    @staticmethod
+    async def delete_form(db: AsyncSession, form_id: int, user_id: int) -> bool:
+        """Exclui um formulário."""
+        form = await AsyncFormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to delete this form")
+
+        for statement in FormService._delete_form_children(form_id):
+            await db.execute(statement)
+        await db.delete(form)
+        await db.commit()
+        invalidate_form_validator(form_id)
+        form_cache.invalidate(form_id)
+        snapshot_cache.invalidate(form_id)
+        return True
+
+    @staticmethod
+    async def submit_response(
+        db: AsyncSession,
+        form_id: int,
+        answers: dict,
+        user_id: Optional[int] = None,
+        email: Optional[str] = None,
+        metadata: Optional[dict] = None
+    ) -> FormResponse:
+        """Submete uma resposta para um formulário."""
+        form = await AsyncFormService.get_form(db, form_id)
+        FormService._check_accepting_responses(form)
+
+        # Resposta única por usuário: o índice único decide, o cache só antecipa
+        unique = FormService._enforces_one_response(form) and user_id is not None
+        if unique and submitted_respondents.seen(form_id, user_id):
+            raise FormService._already_submitted()
 
-        # Validar respostas
         FormService._validate_answers(form, answers)
 
-        # Criar resposta
         response = FormResponse(
-            form_id=form_id,
-            respondent_id=user_id,
-            respondent_email=email,
-            answers=answers,
-            metadata=metadata or {}
+            **FormService._build_response_row(form_id, answers, user_id, email, metadata, unique)
         )
 
         db.add(response)
-        db.commit()
-        db.refresh(response)
+        try:
+            await db.flush()
+        except IntegrityError as e:
+            await db.rollback()
+            FormService._raise_if_duplicate(e, form_id, user_id, unique)
+            raise
+        await ResponseAnswerService.save_async(db, form, [(response.id, answers)])
+        await AsyncFormSummaryService.record(db, form, [(answers, response.created_at)])
+        await db.commit()
+        if unique:
+            submitted_respondents.add(form_id, user_id)
+        await db.refresh(response)
         return response
 
     @staticmethod
-    def _validate_answers(form: Form, answers: dict):
-        """Valida as respostas do formulário."""
-        form_fields = {field['id']: field for field in form.fields}
-        
-        # Verificar campos obrigatórios
-        for field_id, field in form_fields.items():
-            if field.get('required', False) and field_id not in answers:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Field '{field.get('label')}' is required"
-                )
+    async def submit_responses_bulk(
+        db: AsyncSession,
+        form_id: int,
+        items: Iterable[Tuple[int, Any]],
+        user_id: Optional[int] = None,
+        is_admin: bool = False
+    ) -> BulkSubmissionResult:
+        """Valida um lote de respostas e insere as válidas em uma única transação."""
+        form = await db.get(Form, form_id)
+        FormService._check_import_access(form, user_id, is_admin)
+        FormService._check_accepting_responses(form)
+        rows, errors = FormService._prepare_bulk_rows(form, items)
 
-        # Validar tipos e regras
-        for field_id, answer in answers.items():
-            if field_id not in form_fields:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Unknown field '{field_id}'"
-                )
+        if rows:
+            try:
+                inserted = (await db.execute(FormService._bulk_insert_statement(), rows)).all()
+                answers = [row["responses"] for row in rows]
+                await ResponseAnswerService.save_async(db, form, zip((row.id for row in inserted), answers))
+                await AsyncFormSummaryService.record(db, form, zip(answers, (row.created_at for row in inserted)))
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        return BulkSubmissionResult(accepted=len(rows), rejected=len(errors), errors=errors)
+
+    @staticmethod
+    async def get_form_responses(
+        db: AsyncSession,
+        form_id: int,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[FormResponse]:
+        """Lista as respostas de um formulário do usuário."""
+        stmt = await AsyncFormService._form_responses_select(db, form_id, user_id)
+        return list(await db.scalars(stmt.offset(skip).limit(limit)))
+
+    @staticmethod
+    async def get_form_responses_page(
+        db: AsyncSession,
+        form_id: int,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[FormResponse], Optional[str]]:
+        """Lista as respostas de um formulário com paginação por cursor."""
+        stmt = await AsyncFormService._form_responses_select(db, form_id, user_id)
+        return await keyset_paginate_async(db, stmt, FormResponse, cursor, limit)
+
+    @staticmethod
+    async def _form_responses_select(db: AsyncSession, form_id: int, user_id: int):
+        form = await AsyncFormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to view responses of this form")
+        return select(FormResponse).where(FormResponse.form_id == form_id)
+
+    @staticmethod
+    async def get_summary(db: AsyncSession, form_id: int, user_id: int) -> FormSummary:
+        """Resumo das respostas a partir dos contadores incrementais."""
+        form = await AsyncFormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to view responses of this form")
+        return await AsyncFormSummaryService.get_summary(db, form)
+
+    @staticmethod
+    async def rebuild_summary(db: AsyncSession, form_id: int, user_id: int) -> FormSummary:
+        """Recalcula os contadores do resumo a partir de todas as respostas."""
+        form = await AsyncFormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to view responses of this form")
+        await AsyncFormSummaryService.rebuild(db, form)
+        return await AsyncFormSummaryService.get_summary(db, form)
+
+    @staticmethod
+    async def get_analytics_snapshot(db: AsyncSession, form_id: int, user_id: int) -> FormSnapshot:
+        """Snapshot colunar das respostas, atualizado com as respostas novas."""
+        form = await AsyncFormService.get_form(db, form_id, user_id)
+        FormService._check_owner(form, user_id, "Not authorized to view responses of this form")
+        return await AsyncFormAnalyticsService.get_snapshot(db, form)
+
+    @staticmethod
+    async def export_responses(
+        db: AsyncSession,
+        form_id: int,
+        user_id: int,
+        export_format: str
+    ) -> Iterator[str]:
+        """
+        Verifica o acesso e retorna o gerador de exportação.
 
-            field = form_fields[field_id]
-            FormService._validate_field_answer(field, answer)
+        O gerador é síncrono e usa sua própria sessão com cursor no servidor;
+        o StreamingResponse o consome em uma thread do pool.
+        """
+        form = await AsyncFormService.get_form(db, form_id, user_id)
+        return FormService._export_stream(form, user_id, export_format)
@@ -0,0 +1,264 @@
+import random
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Row, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.models.form import FieldType, Form
+from app.models.form_response import FormResponse
+from app.models.form_summary import FormSummaryCounter
+from app.schemas.form import DailyCount, FieldSummary, FormSummary, NumericSummary
+from app.services.form_validator import EMPTY_VALUES, get_form_validator
+
+settings = get_settings()
+
+OPTION_TYPES = (FieldType.SELECT, FieldType.RADIO, FieldType.MULTISELECT, FieldType.CHECKBOX)
+CounterKey = Tuple[str, str, str]  # (kind, field_id, bucket)
+# Primeira chave dos advisory locks do PostgreSQL que protegem o rebuild
+SUMMARY_LOCK_NAMESPACE = 0x5355
+
+
+class SummaryAccumulator:
+    """Soma em memória os incrementos de um lote de respostas antes do upsert."""
+
+    def __init__(self, form: Form):
+        self.form_id = form.id
+        self.fields = get_form_validator(form).fields
+        self.counters: Dict[CounterKey, List[Optional[float]]] = defaultdict(lambda: [0, None, None, None])
+
+    def _bump(self, key: CounterKey, value: Optional[float] = None) -> None:
+        counter = self.counters[key]
+        counter[0] += 1
+        if value is not None:
+            counter[1] = value if counter[1] is None else counter[1] + value
+            counter[2] = value if counter[2] is None else min(counter[2], value)
+            counter[3] = value if counter[3] is None else max(counter[3], value)
+
+    def add(self, answers: dict, day: date) -> None:
+        self._bump(("total", "", ""))
+        self._bump(("day", "", day.isoformat()))
+        for field_id, answer in answers.items():
+            field = self.fields.get(field_id)
+            if field is None or answer in EMPTY_VALUES:
+                continue
+            if field.type in OPTION_TYPES:
+                values = answer if isinstance(answer, list) else [answer]
+                for value in values:
+                    if isinstance(value, bool):
+                        value = "true" if value else "false"
+                    self._bump(("option", field_id, str(value)[:255]))
+            elif field.type == FieldType.NUMBER and not isinstance(answer, bool):
+                try:
+                    self._bump(("number", field_id, ""), float(answer))
+                except (TypeError, ValueError):
+                    continue
+
+    def rows(self, shard: int = 0) -> List[Dict[str, Any]]:
+        # Ordem fixa das chaves: transações concorrentes travam as linhas na mesma ordem
+        return [
+            {
+                "form_id": self.form_id,
+                "kind": kind,
+                "field_id": field_id,
+                "bucket": bucket,
+                "shard": shard,
+                "count": count,
+                "value_sum": value_sum,
+                "value_min": value_min,
+                "value_max": value_max,
+            }
+            for (kind, field_id, bucket), (count, value_sum, value_min, value_max) in sorted(self.counters.items())
+        ]
+
+
+def _upsert_statement(dialect_name: str):
+    """INSERT ... ON CONFLICT que soma os incrementos aos contadores existentes."""
+    if dialect_name == "postgresql":
+        stmt = postgresql.insert(FormSummaryCounter)
+        least, greatest = func.least, func.greatest
+    else:
+        stmt = sqlite.insert(FormSummaryCounter)
+        # min()/max() com dois argumentos são funções escalares no SQLite
+        least, greatest = func.min, func.max
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=["form_id", "kind", "field_id", "bucket", "shard"],
+        set_={
+            "count": FormSummaryCounter.count + excluded.count,
+            "value_sum": FormSummaryCounter.value_sum + excluded.value_sum,
+            "value_min": least(FormSummaryCounter.value_min, excluded.value_min),
+            "value_max": greatest(FormSummaryCounter.value_max, excluded.value_max),
+        }
+    )
+
+
+def summary_day(created_at: Optional[datetime]) -> date:
+    """
+    Dia (UTC) de uma resposta a partir do created_at gravado, usado tanto no
+    registro incremental quanto no rebuild. No PostgreSQL o valor volta no fuso
+    da sessão; no SQLite volta sem fuso, já em UTC (CURRENT_TIMESTAMP).
+    """
+    if created_at is None:
+        return datetime.utcnow().date()
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+def _accumulate(form: Form, responses: Iterable[Tuple[dict, Optional[datetime]]]) -> SummaryAccumulator:
+    accumulator = SummaryAccumulator(form)
+    for answers, created_at in responses:
+        accumulator.add(answers, summary_day(created_at))
+    return accumulator
+
+
+def _build_summary(form: Form, counters: Iterable[Row]) -> FormSummary:
+    total = 0
+    daily: List[DailyCount] = []
+    options: Dict[str, Dict[str, int]] = defaultdict(dict)
+    numbers: Dict[str, NumericSummary] = {}
+    for counter in counters:
+        if counter.kind == "total":
+            total = counter.count
+        elif counter.kind == "day":
+            daily.append(DailyCount(date=date.fromisoformat(counter.bucket), count=counter.count))
+        elif counter.kind == "option":
+            options[counter.field_id][counter.bucket] = counter.count
+        elif counter.kind == "number":
+            numbers[counter.field_id] = NumericSummary(
+                count=counter.count,
+                min=counter.value_min,
+                max=counter.value_max,
+                mean=counter.value_sum / counter.count if counter.count else None
+            )
+
+    fields = []
+    for field in form.fields:
+        field_type = FieldType(field.get("type", FieldType.TEXT))
+        if field_type not in OPTION_TYPES and field_type != FieldType.NUMBER:
+            continue
+        fields.append(FieldSummary(
+            field_id=field["id"],
+            label=field.get("label") or field["id"],
+            type=field_type,
+            options=options.get(field["id"], {}) if field_type in OPTION_TYPES else None,
+            stats=numbers.get(field["id"]) if field_type == FieldType.NUMBER else None
+        ))
+
+    daily.sort(key=lambda item: item.date)
+    return FormSummary(form_id=form.id, total_responses=total, fields=fields, daily=daily)
+
+
+def _counters_query(form_id: int):
+    return (
+        select(
+            FormSummaryCounter.kind,
+            FormSummaryCounter.field_id,
+            FormSummaryCounter.bucket,
+            func.sum(FormSummaryCounter.count).label("count"),
+            func.sum(FormSummaryCounter.value_sum).label("value_sum"),
+            func.min(FormSummaryCounter.value_min).label("value_min"),
+            func.max(FormSummaryCounter.value_max).label("value_max"),
+        )
+        .where(FormSummaryCounter.form_id == form_id)
+        .group_by(FormSummaryCounter.kind, FormSummaryCounter.field_id, FormSummaryCounter.bucket)
+    )
+
+
+def _lock_statement(dialect_name: str, form_id: int, exclusive: bool):
+    """
+    Advisory lock (até o fim da transação) que separa record() de rebuild():
+    envios pegam o lock compartilhado e não se bloqueiam entre si; o rebuild
+    pega o exclusivo, espera os envios em andamento e segura os novos até o
+    commit. No SQLite não há nada a fazer: o rebuild apaga os contadores
+    antes de ler as respostas e, com isso, já segura a única escrita.
+    """
+    if dialect_name != "postgresql":
+        return None
+    lock = func.pg_advisory_xact_lock if exclusive else func.pg_advisory_xact_lock_shared
+    return select(lock(SUMMARY_LOCK_NAMESPACE, form_id))
+
+
+def _rebuild_query(form_id: int, batch_size: Optional[int]):
+    return (
+        select(FormResponse.responses, FormResponse.created_at)
+        .where(FormResponse.form_id == form_id)
+        .execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+    )
+
+
+class FormSummaryService:
+    """Contadores incrementais do resumo de respostas; record() não faz commit."""
+
+    @staticmethod
+    def record(db: Session, form: Form, responses: Iterable[Tuple[dict, Optional[datetime]]]) -> None:
+        """
+        Soma as respostas (answers, created_at) recém-inseridas aos contadores
+        de um shard sorteado, para que envios simultâneos caiam em linhas diferentes.
+        """
+        dialect_name = db.get_bind().dialect.name
+        rows = _accumulate(form, responses).rows(random.randrange(settings.FORM_SUMMARY_SHARDS))
+        lock = _lock_statement(dialect_name, form.id, exclusive=False)
+        if lock is not None:
+            db.execute(lock)
+        db.execute(_upsert_statement(dialect_name), rows)
+
+    @staticmethod
+    def get_summary(db: Session, form: Form) -> FormSummary:
+        """Resumo em O(campos × opções + dias), independente do número de respostas."""
+        return _build_summary(form, db.execute(_counters_query(form.id)))
+
+    @staticmethod
+    def rebuild(db: Session, form: Form, batch_size: Optional[int] = None) -> None:
+        """
+        Recalcula os contadores do zero a partir de form_responses. Envios
+        concorrentes esperam o commit (ver _lock_statement), então nenhum
+        incremento é perdido nem contado duas vezes.
+        """
+        dialect_name = db.get_bind().dialect.name
+        lock = _lock_statement(dialect_name, form.id, exclusive=True)
+        if lock is not None:
+            db.execute(lock)
+        db.execute(delete(FormSummaryCounter).where(FormSummaryCounter.form_id == form.id))
+
+        accumulator = SummaryAccumulator(form)
+        for answers, created_at in db.execute(_rebuild_query(form.id, batch_size)):
+            accumulator.add(answers, summary_day(created_at))
+        rows = accumulator.rows()
+        if rows:
+            db.execute(_upsert_statement(dialect_name), rows)
+        db.commit()
+
+
+class AsyncFormSummaryService:
+    @staticmethod
+    async def record(db: AsyncSession, form: Form, responses: Iterable[Tuple[dict, Optional[datetime]]]) -> None:
+        dialect_name = db.get_bind().dialect.name
+        rows = _accumulate(form, responses).rows(random.randrange(settings.FORM_SUMMARY_SHARDS))
+        lock = _lock_statement(dialect_name, form.id, exclusive=False)
+        if lock is not None:
+            await db.execute(lock)
+        await db.execute(_upsert_statement(dialect_name), rows)
+
+    @staticmethod
+    async def get_summary(db: AsyncSession, form: Form) -> FormSummary:
+        return _build_summary(form, await db.execute(_counters_query(form.id)))
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, form: Form) -> None:
+        dialect_name = db.get_bind().dialect.name
+        lock = _lock_statement(dialect_name, form.id, exclusive=True)
+        if lock is not None:
+            await db.execute(lock)
+        await db.execute(delete(FormSummaryCounter).where(FormSummaryCounter.form_id == form.id))
+
+        accumulator = SummaryAccumulator(form)
+        async for answers, created_at in await db.stream(_rebuild_query(form.id, None)):
+            accumulator.add(answers, summary_day(created_at))
+        rows = accumulator.rows()
+        if rows:
+            await db.execute(_upsert_statement(dialect_name), rows)
+        await db.commit()
@@ -0,0 +1,208 @@
+import re
+import threading
+from datetime import date
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple
+from cachetools import LRUCache
+from fastapi import HTTPException, status
+from app.core.config import get_settings
+from app.models.form import FieldType, ValidationRule, fields_version
+
+settings = get_settings()
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+CHOICE_TYPES = {FieldType.SELECT, FieldType.RADIO, FieldType.MULTISELECT}
+EMPTY_VALUES = (None, "", [], {})
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class CompiledField:
+    """Regras de um campo pré-processadas a partir do JSON do formulário."""
+
+    __slots__ = (
+        "id", "label", "type", "required", "pattern", "pattern_message",
+        "min_length", "max_length", "min_value", "max_value", "options", "messages",
+    )
+
+    def __init__(self, field: Dict[str, Any]):
+        self.id: str = field["id"]
+        self.label: str = field.get("label") or self.id
+        self.type = FieldType(field.get("type", FieldType.TEXT))
+        self.required: bool = bool(field.get("required", False))
+        self.pattern: Optional[Pattern] = None
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        self.min_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.messages: Dict[ValidationRule, str] = {}
+
+        for validation in field.get("validation") or []:
+            rule = ValidationRule(validation["rule"])
+            value = validation.get("value")
+            if validation.get("message"):
+                self.messages[rule] = validation["message"]
+            if rule == ValidationRule.REQUIRED:
+                self.required = bool(value) if value is not None else True
+            elif rule == ValidationRule.PATTERN:
+                self.pattern = re.compile(value)
+            elif rule == ValidationRule.MIN_LENGTH:
+                self.min_length = int(value)
+            elif rule == ValidationRule.MAX_LENGTH:
+                self.max_length = int(value)
+            elif rule == ValidationRule.MIN_VALUE:
+                self.min_value = float(value)
+            elif rule == ValidationRule.MAX_VALUE:
+                self.max_value = float(value)
+
+        self.options: Optional[FrozenSet[str]] = None
+        if self.type in CHOICE_TYPES or (self.type == FieldType.CHECKBOX and field.get("options")):
+            self.options = frozenset(
+                str(option.get("value", option.get("label")))
+                for option in field.get("options") or []
+            )
+
+    def _fail(self, rule: Optional[ValidationRule], default: str) -> HTTPException:
+        return _bad_request(self.messages.get(rule, default))
+
+    def validate(self, answer: Any) -> None:
+        """Valida a resposta de um campo já sabendo que ela não está vazia."""
+        if self.type == FieldType.NUMBER:
+            if isinstance(answer, str):
+                try:
+                    answer = float(answer)
+                except ValueError:
+                    answer = None
+            if not _is_number(answer):
+                raise _bad_request(f"Field '{self.label}' must be a number")
+            if self.min_value is not None and answer < self.min_value:
+                raise self._fail(
+                    ValidationRule.MIN_VALUE,
+                    f"Field '{self.label}' must be at least {self.min_value:g}"
+                )
+            if self.max_value is not None and answer > self.max_value:
+                raise self._fail(
+                    ValidationRule.MAX_VALUE,
+                    f"Field '{self.label}' must be at most {self.max_value:g}"
+                )
+            return
+
+        if self.type in (FieldType.MULTISELECT, FieldType.CHECKBOX) and isinstance(answer, list):
+            values = answer
+        elif self.type == FieldType.MULTISELECT:
+            raise _bad_request(f"Field '{self.label}' must be a list of options")
+        elif self.type == FieldType.CHECKBOX and isinstance(answer, bool):
+            return
+        else:
+            values = None
+
+        if self.options is not None:
+            for value in values if values is not None else (answer,):
+                if str(value) not in self.options:
+                    raise _bad_request(f"Invalid option '{value}' for field '{self.label}'")
+
+        if values is not None:
+            self._check_length(values)
+            return
+
+        if not isinstance(answer, str):
+            if self.type in (FieldType.SELECT, FieldType.RADIO):
+                return
+            raise _bad_request(f"Field '{self.label}' must be a string")
+
+        if self.type == FieldType.EMAIL and not EMAIL_PATTERN.match(answer):
+            raise _bad_request(f"Field '{self.label}' must be a valid email")
+        if self.type == FieldType.DATE:
+            try:
+                date.fromisoformat(answer[:10])
+            except ValueError:
+                raise _bad_request(f"Field '{self.label}' must be a valid date")
+
+        self._check_length(answer)
+        if self.pattern is not None and not self.pattern.fullmatch(answer):
+            raise self._fail(
+                ValidationRule.PATTERN,
+                f"Field '{self.label}' does not match the expected format"
+            )
+
+    def _check_length(self, value) -> None:
+        if self.min_length is not None and len(value) < self.min_length:
+            raise self._fail(
+                ValidationRule.MIN_LENGTH,
+                f"Field '{self.label}' must have at least {self.min_length} characters"
+            )
+        if self.max_length is not None and len(value) > self.max_length:
+            raise self._fail(
+                ValidationRule.MAX_LENGTH,
+                f"Field '{self.label}' must have at most {self.max_length} characters"
+            )
+
+
+class CompiledFormValidator:
+    """Validador de respostas compilado uma única vez por versão dos campos."""
+
+    __slots__ = ("version", "fields", "required")
+
+    def __init__(self, fields: List[Dict[str, Any]], version: Optional[str] = None):
+        self.version = version
+        self.fields: Dict[str, CompiledField] = {}
+        for field in fields or []:
+            compiled = CompiledField(field)
+            self.fields[compiled.id] = compiled
+        self.required: Tuple[CompiledField, ...] = tuple(
+            field for field in self.fields.values() if field.required
+        )
+
+    def validate(self, answers: dict) -> None:
+        """Valida as respostas em O(respostas + obrigatórios)."""
+        for field in self.required:
+            if answers.get(field.id) in EMPTY_VALUES:
+                raise field._fail(ValidationRule.REQUIRED, f"Field '{field.label}' is required")
+
+        fields = self.fields
+        for field_id, answer in answers.items():
+            field = fields.get(field_id)
+            if field is None:
+                raise _bad_request(f"Unknown field '{field_id}'")
+            if answer in EMPTY_VALUES:
+                continue
+            field.validate(answer)
+
+
+def form_fields_version(form) -> str:
+    """Versão gravada com o formulário; calculada só para objetos sem ela (ex.: linhas antigas)."""
+    return getattr(form, "fields_version", None) or fields_version(form.fields)
+
+
+_validators: LRUCache = LRUCache(maxsize=settings.FORM_VALIDATOR_CACHE_SIZE)
+_validators_lock = threading.Lock()
+
+
+def get_form_validator(form) -> CompiledFormValidator:
+    """Retorna o validador compilado do formulário, recompilando se os campos mudaram."""
+    version = form_fields_version(form)
+    with _validators_lock:
+        validator = _validators.get(form.id)
+    if validator is not None and validator.version == version:
+        return validator
+
+    validator = CompiledFormValidator(form.fields, version)
+    with _validators_lock:
+        _validators[form.id] = validator
+    return validator
+
+
+def invalidate_form_validator(form_id: int) -> None:
+    """Descarta o validador compilado de um formulário."""
+    with _validators_lock:
+        _validators.pop(form_id, None)
+
+
+def clear_form_validators() -> None:
+    with _validators_lock:
+        _validators.clear()
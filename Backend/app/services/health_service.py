@@ -0,0 +1,140 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from app.core.config import get_settings
+from app.core.database import get_pool_stats
+from app.services.audit_log_service import audit_log_writer
+from app.services.auth_cache import identity_cache, token_cache
+from app.services.batch_writer import BatchWriter
+from app.services.form_analytics import snapshot_cache
+from app.services.form_cache import form_cache
+from app.services.password_hasher import password_hasher
+from app.services.processing_log_service import processing_log_writer
+from app.services.submission_dedup import submitted_respondents
+
+settings = get_settings()
+
+STARTED_AT = time.monotonic()
+
+
+class EventLoopLagMonitor:
+    """
+    Tarefa que dorme interval segundos e mede o atraso ao acordar. O atraso
+    é o tempo em que o event loop ficou ocupado com outro código (CPU ou
+    chamadas bloqueantes) e não pôde atender requisições.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - expected)
+            self.max_lag = max(self.max_lag, self.lag)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"running": self.running, "lag": self.lag, "max_lag": self.max_lag}
+
+
+loop_monitor = EventLoopLagMonitor(settings.HEALTH_LOOP_LAG_INTERVAL)
+
+
+def _pool_utilization(stats: Dict[str, Any]) -> Optional[float]:
+    if "size" not in stats or "checkedout" not in stats:
+        return None
+    capacity = stats["size"] + max(settings.DB_MAX_OVERFLOW, 0)
+    return stats["checkedout"] / capacity if capacity else None
+
+
+def _writer_stats(writer: BatchWriter) -> Dict[str, Any]:
+    return {
+        "pending": writer.pending,
+        "max_queue": writer.max_queue,
+        "dropped": writer.dropped,
+        "failed": writer.failed,
+        "written": writer.written,
+    }
+
+
+class HealthService:
+    """Verificações baratas (só contadores em memória, sem consultas) para probes frequentes."""
+
+    @staticmethod
+    def uptime() -> float:
+        return time.monotonic() - STARTED_AT
+
+    @staticmethod
+    def liveness() -> Dict[str, Any]:
+        """O processo responde; não depende do banco."""
+        return {
+            "status": "healthy",
+            "uptime": HealthService.uptime(),
+            "cache_size": form_cache.stats()["size"],
+        }
+
+    @staticmethod
+    def readiness() -> Dict[str, Any]:
+        """Estado dos recursos que limitam o atendimento; ready=False tira a instância do balanceador."""
+        pools = get_pool_stats()
+        for stats in pools.values():
+            stats["utilization"] = _pool_utilization(stats)
+
+        writers = {
+            "audit_log": _writer_stats(audit_log_writer),
+            "processing_log": _writer_stats(processing_log_writer),
+        }
+        hasher = {
+            "pending": password_hasher.pending,
+            "max_pending": password_hasher.max_pending,
+        }
+
+        checks = {
+            "database_pool": all(
+                stats["utilization"] is None or stats["utilization"] < 1.0 for stats in pools.values()
+            ),
+            "event_loop": loop_monitor.lag < settings.HEALTH_MAX_LOOP_LAG,
+            "queues": all(
+                stats["max_queue"] is None or stats["pending"] < stats["max_queue"] for stats in writers.values()
+            ),
+            "password_hasher": hasher["pending"] < hasher["max_pending"],
+        }
+        ready = all(checks.values())
+        return {
+            "status": "ready" if ready else "not_ready",
+            "ready": ready,
+            "uptime": HealthService.uptime(),
+            "checks": checks,
+            "database": pools,
+            "caches": {
+                "forms": form_cache.stats(),
+                "tokens": token_cache.stats(),
+                "identities": identity_cache.stats(),
+                "analytics_snapshots": {"size": len(snapshot_cache)},
+                "submitted_respondents": {"size": len(submitted_respondents), "hits": submitted_respondents.hits},
+            },
+            "queues": {**writers, "password_hasher": hasher},
+            "event_loop": loop_monitor.stats(),
+        }
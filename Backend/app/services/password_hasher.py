@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.core.config import get_settings
+
+settings = get_settings()
+T = TypeVar("T")
+
+# Hashes com custo diferente de PASSWORD_HASH_ROUNDS são refeitos no login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS
+)
+
+
+class PasswordHasherPool:
+    """
+    Executa bcrypt fora do event loop, em um pool de threads de tamanho fixo.
+
+    O bcrypt libera o GIL, então threads bastam. No máximo
+    max_workers + max_queue operações ficam pendentes; acima disso a
+    requisição falha imediatamente com 503 em vez de enfileirar sem limite.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, try again later",
+                    headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+
+    def _release(self, _=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        self._acquire()
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Libera a vaga quando o bcrypt termina, mesmo se o cliente desconectar
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verifica a senha e, se o custo mudou, retorna também o novo hash."""
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
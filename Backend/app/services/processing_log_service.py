@@ -1,7 +1,34 @@
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.config import get_settings
 from app.models.processing_log import ProcessingLog
 from app.schemas.processing_log import ProcessingLogCreate
-from typing import List
+from app.services.batch_writer import BatchWriter
+from app.utils.pagination import keyset_paginate, keyset_paginate_async
+from typing import Any, Dict, List, Optional, Tuple
+
+settings = get_settings()
+
+processing_log_writer = BatchWriter(
+    ProcessingLog,
+    batch_size=settings.PROCESSING_LOG_BATCH_SIZE,
+    flush_interval=settings.PROCESSING_LOG_FLUSH_INTERVAL,
+    max_queue=settings.PROCESSING_LOG_MAX_QUEUE,
+    overflow=settings.PROCESSING_LOG_OVERFLOW
+)
+
+
+def _log_row(log: ProcessingLogCreate) -> Dict[str, Any]:
+    # created_at no momento do evento, não no momento do flush
+    return {
+        "user_id": log.user_id,
+        "action": log.action,
+        "details": log.details,
+        "status": log.status,
+        "created_at": datetime.utcnow(),
+    }
 
 class ProcessingLogService:
     @staticmethod
@@ -17,6 +44,16 @@ class ProcessingLogService:
         db.refresh(db_log)
         return db_log
 
+    @staticmethod
+    def create_log_buffered(log: ProcessingLogCreate) -> bool:
+        """
+        Enfileira o log para inserção em lote, sem abrir transação.
+
+        Use create_log quando o id da linha for necessário. Retorna False se
+        a fila estava cheia e o log foi descartado.
+        """
+        return processing_log_writer.enqueue(_log_row(log))
+
     @staticmethod
     def get_logs_by_user(db: Session, user_id: int) -> List[ProcessingLog]:
         return db.query(ProcessingLog).filter(ProcessingLog.user_id == user_id).all()
@@ -24,3 +61,46 @@ class ProcessingLogService:
     @staticmethod
     def get_all_logs(db: Session, skip: int = 0, limit: int = 100) -> List[ProcessingLog]:
         return db.query(ProcessingLog).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def get_all_logs_page(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[ProcessingLog], Optional[str]]:
+        return keyset_paginate(db.query(ProcessingLog), ProcessingLog, cursor, limit)
+
+
+class AsyncProcessingLogService:
+    @staticmethod
+    async def create_log(db: AsyncSession, log: ProcessingLogCreate) -> ProcessingLog:
+        db_log = ProcessingLog(
+            user_id=log.user_id,
+            action=log.action,
+            details=log.details,
+            status=log.status
+        )
+        db.add(db_log)
+        await db.commit()
+        await db.refresh(db_log)
+        return db_log
+
+    @staticmethod
+    async def create_log_buffered(log: ProcessingLogCreate) -> bool:
+        return await processing_log_writer.put(_log_row(log))
+
+    @staticmethod
+    async def get_logs_by_user(db: AsyncSession, user_id: int) -> List[ProcessingLog]:
+        return list(await db.scalars(select(ProcessingLog).where(ProcessingLog.user_id == user_id)))
+
+    @staticmethod
+    async def get_all_logs(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ProcessingLog]:
+        return list(await db.scalars(select(ProcessingLog).offset(skip).limit(limit)))
+
+    @staticmethod
+    async def get_all_logs_page(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[ProcessingLog], Optional[str]]:
+        return await keyset_paginate_async(db, select(ProcessingLog), ProcessingLog, cursor, limit)
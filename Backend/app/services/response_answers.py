@@ -0,0 +1,128 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.models.form import FieldType, Form
+from app.models.form_response import FormResponse
+from app.models.response_answer import ResponseAnswer
+from app.services.form_validator import EMPTY_VALUES, get_form_validator
+
+settings = get_settings()
+
+VALUE_TEXT_MAX_LENGTH = 255
+MULTI_VALUE_TYPES = (FieldType.MULTISELECT, FieldType.CHECKBOX)
+
+
+def _typed_values(field_type: FieldType, answer: Any) -> List[Dict[str, Any]]:
+    """Converte uma resposta nas colunas tipadas (uma entrada por valor)."""
+    if field_type == FieldType.FILE:
+        return []
+    if field_type in MULTI_VALUE_TYPES and isinstance(answer, list):
+        return [{"value_text": str(item)[:VALUE_TEXT_MAX_LENGTH]} for item in answer if item not in EMPTY_VALUES]
+    if isinstance(answer, bool):
+        return [{"value_text": "true" if answer else "false", "value_number": float(answer)}]
+    if field_type == FieldType.NUMBER:
+        try:
+            return [{"value_number": float(answer)}]
+        except (TypeError, ValueError):
+            return []
+    if field_type == FieldType.DATE:
+        try:
+            value = date.fromisoformat(str(answer)[:10])
+        except ValueError:
+            return []
+        return [{"value_text": value.isoformat(), "value_date": value}]
+    return [{"value_text": str(answer)[:VALUE_TEXT_MAX_LENGTH]}]
+
+
+def build_answer_rows(form: Form, response_id: int, answers: dict) -> List[Dict[str, Any]]:
+    """Linhas de response_answers para uma resposta já validada."""
+    fields = get_form_validator(form).fields
+    rows = []
+    for field_id, answer in answers.items():
+        field = fields.get(field_id)
+        if field is None or answer in EMPTY_VALUES:
+            continue
+        for values in _typed_values(field.type, answer):
+            rows.append({
+                "response_id": response_id,
+                "form_id": form.id,
+                "field_id": field_id,
+                "value_text": values.get("value_text"),
+                "value_number": values.get("value_number"),
+                "value_date": values.get("value_date"),
+            })
+    return rows
+
+
+def _rows_for(form: Form, responses: Iterable[Tuple[int, dict]]) -> List[Dict[str, Any]]:
+    rows = []
+    for response_id, answers in responses:
+        rows.extend(build_answer_rows(form, response_id, answers))
+    return rows
+
+
+class ResponseAnswerService:
+    """Tabela normalizada de respostas (response_answers); não faz commit."""
+
+    @staticmethod
+    def save(db: Session, form: Form, responses: Iterable[Tuple[int, dict]]) -> None:
+        if not settings.NORMALIZED_ANSWERS_ENABLED:
+            return
+        rows = _rows_for(form, responses)
+        if rows:
+            db.execute(insert(ResponseAnswer), rows)
+
+    @staticmethod
+    async def save_async(db: AsyncSession, form: Form, responses: Iterable[Tuple[int, dict]]) -> None:
+        if not settings.NORMALIZED_ANSWERS_ENABLED:
+            return
+        rows = _rows_for(form, responses)
+        if rows:
+            await db.execute(insert(ResponseAnswer), rows)
+
+    @staticmethod
+    def rebuild(db: Session, form: Form, batch_size: Optional[int] = None) -> int:
+        """Recria as linhas normalizadas de um formulário a partir do JSON."""
+        batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        db.execute(delete(ResponseAnswer).where(ResponseAnswer.form_id == form.id))
+        total = 0
+        result = db.execute(
+            select(FormResponse.id, FormResponse.responses)
+            .where(FormResponse.form_id == form.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            rows = _rows_for(form, partition)
+            if rows:
+                db.execute(insert(ResponseAnswer), rows)
+                total += len(rows)
+        db.commit()
+        return total
+
+    @staticmethod
+    def value_counts(db: Session, form_id: int, field_id: str) -> List[Tuple[str, int]]:
+        """Contagem de respostas por valor/opção, via índice (form_id, field_id, value_text)."""
+        return [
+            (value, count) for value, count in db.execute(
+                select(ResponseAnswer.value_text, func.count())
+                .where(ResponseAnswer.form_id == form_id, ResponseAnswer.field_id == field_id)
+                .group_by(ResponseAnswer.value_text)
+                .order_by(func.count().desc())
+            )
+        ]
+
+    @staticmethod
+    def numeric_stats(db: Session, form_id: int, field_id: str) -> Dict[str, Any]:
+        count, minimum, maximum, mean = db.execute(
+            select(
+                func.count(ResponseAnswer.value_number),
+                func.min(ResponseAnswer.value_number),
+                func.max(ResponseAnswer.value_number),
+                func.avg(ResponseAnswer.value_number)
+            )
+            .where(ResponseAnswer.form_id == form_id, ResponseAnswer.field_id == field_id)
+        ).one()
+        return {"count": count, "min": minimum, "max": maximum, "mean": mean}
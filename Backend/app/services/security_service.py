@@ -1,14 +1,13 @@
 from datetime import datetime
 from typing import List, Optional
-import geoip2.database
-from ..models.user import User
-from ..models.security import SecurityAlert, UserSession
-from ..schemas.security import AlertType, AlertSeverity
+from ..schemas.security import AlertSeverity, AlertType, SecurityAlert
 
 class SecurityService:
     def __init__(self):
         self.geoip_reader = None
         try:
+            # Importado só aqui: geoip2 é opcional e pesado na importação
+            import geoip2.database
             self.geoip_reader = geoip2.database.Reader('GeoLite2-City.mmdb')
         except Exception:
             print("Warning: GeoIP database not found")
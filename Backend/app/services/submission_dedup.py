@@ -0,0 +1,42 @@
+import threading
+from cachetools import LRUCache
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class SubmittedRespondentCache:
+    """
+    Pares (form_id, user_id) que já responderam a formulários com
+    one_response_per_user, mantidos em memória (LRU).
+
+    Um acerto rejeita a duplicata sem ir ao banco. A ausência não prova nada:
+    o índice único em form_responses continua sendo quem decide.
+    """
+
+    def __init__(self, maxsize: int):
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def seen(self, form_id: int, user_id: int) -> bool:
+        with self._lock:
+            found = self._entries.get((form_id, user_id)) is not None
+            if found:
+                self.hits += 1
+            return found
+
+    def add(self, form_id: int, user_id: int) -> None:
+        with self._lock:
+            self._entries[(form_id, user_id)] = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+submitted_respondents = SubmittedRespondentCache(settings.SUBMISSION_DEDUP_CACHE_SIZE)
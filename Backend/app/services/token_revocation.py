@@ -0,0 +1,199 @@
+import heapq
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.models.revoked_token import RevokedToken
+
+settings = get_settings()
+
+# Transações concorrentes podem confirmar ids fora de ordem: cada sincronização
+# relê também as revogações feitas desde pouco antes da anterior
+SYNC_LOOKBACK_SECONDS = 60.0
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _to_timestamp(value: datetime) -> float:
+    # SQLite devolve datetimes sem fuso; são gravados sempre em UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class TokenRevocationStore:
+    """
+    Lista de revogação de tokens consultada em memória, com O(1) por verificação.
+
+    A tabela revoked_tokens é a fonte durável; cada processo mantém uma cópia
+    com apenas as entradas ainda não expiradas e a sincroniza de forma
+    incremental (por id e por revoked_at recente) no máximo a cada
+    TOKEN_REVOCATION_SYNC_INTERVAL segundos. Entradas saem da memória quando o
+    token correspondente expira.
+    """
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._tokens: Dict[str, float] = {}  # jti -> exp
+        self._users: Dict[int, Tuple[float, float]] = {}  # user_id -> (revoked_at, exp)
+        self._expiry: List[Tuple[float, str, Any]] = []
+        self._last_id = 0
+        self._last_sync: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        """Verifica as claims de um token já validado."""
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            jti = claims.get("jti")
+            if jti is not None and jti in self._tokens:
+                return True
+            try:
+                user_id = int(claims["sub"])
+            except (KeyError, TypeError, ValueError):
+                return False
+            revoked = self._users.get(user_id)
+            # iat e revoked_at têm resolução abaixo do segundo (ver issued_at)
+            return revoked is not None and claims.get("iat", 0) <= revoked[0]
+
+    def needs_sync(self) -> bool:
+        return self._last_sync is None or time.time() - self._last_sync >= self.sync_interval
+
+    def _purge(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            _, kind, key = heapq.heappop(self._expiry)
+            if kind == "jti":
+                if self._tokens.get(key, now + 1) <= now:
+                    del self._tokens[key]
+            elif self._users.get(key, (0, now + 1))[1] <= now:
+                del self._users[key]
+
+    def _add(self, row: RevokedToken, synced: bool = True) -> None:
+        exp = _to_timestamp(row.expires_at)
+        with self._lock:
+            # Gravações locais não avançam o cursor: ids menores de outros
+            # processos ainda podem não ter sido lidos
+            if synced:
+                self._last_id = max(self._last_id, row.id)
+            if exp <= time.time():
+                return
+            if row.jti is not None:
+                self._tokens[row.jti] = exp
+                heapq.heappush(self._expiry, (exp, "jti", row.jti))
+            else:
+                revoked_at = _to_timestamp(row.revoked_at)
+                previous = self._users.get(row.user_id)
+                if previous is not None:
+                    revoked_at, exp = max(revoked_at, previous[0]), max(exp, previous[1])
+                self._users[row.user_id] = (revoked_at, exp)
+                heapq.heappush(self._expiry, (exp, "user", row.user_id))
+
+    def _pending_query(self, previous_sync: Optional[float]):
+        pending = RevokedToken.id > self._last_id
+        if previous_sync is not None:
+            pending = or_(pending, RevokedToken.revoked_at >= _to_datetime(previous_sync - SYNC_LOOKBACK_SECONDS))
+        return (
+            select(RevokedToken)
+            .where(pending, RevokedToken.expires_at > _to_datetime(time.time()))
+            .order_by(RevokedToken.id)
+        )
+
+    def _start_sync(self) -> Optional[float]:
+        previous, self._last_sync = self._last_sync, time.time()
+        return previous
+
+    def sync(self, db: Session) -> None:
+        """Carrega revogações feitas por outros processos desde a última sincronização."""
+        if not self.needs_sync():
+            return
+        for row in db.scalars(self._pending_query(self._start_sync())):
+            self._add(row)
+
+    async def sync_async(self, db: AsyncSession) -> None:
+        if not self.needs_sync():
+            return
+        for row in await db.scalars(self._pending_query(self._start_sync())):
+            self._add(row)
+
+    @staticmethod
+    def _token_row(claims: Dict[str, Any]) -> RevokedToken:
+        exp = claims.get("exp") or time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        user_id = claims.get("sub")
+        return RevokedToken(
+            jti=claims["jti"],
+            user_id=int(user_id) if user_id is not None else None,
+            expires_at=_to_datetime(exp),
+            revoked_at=_to_datetime(time.time())
+        )
+
+    @staticmethod
+    def _user_row(user_id: int) -> RevokedToken:
+        now = time.time()
+        # Qualquer token emitido antes de agora expira em até ACCESS_TOKEN_EXPIRE_MINUTES
+        return RevokedToken(
+            user_id=user_id,
+            expires_at=_to_datetime(now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+            revoked_at=_to_datetime(now)
+        )
+
+    @staticmethod
+    def _cleanup_statement():
+        return delete(RevokedToken).where(RevokedToken.expires_at <= _to_datetime(time.time()))
+
+    def _save(self, db: Session, row: RevokedToken) -> None:
+        db.execute(self._cleanup_statement())
+        db.add(row)
+        db.commit()
+        self._add(row, synced=False)
+
+    async def _save_async(self, db: AsyncSession, row: RevokedToken) -> None:
+        await db.execute(self._cleanup_statement())
+        db.add(row)
+        await db.commit()
+        self._add(row, synced=False)
+
+    def revoke_token(self, db: Session, claims: Dict[str, Any]) -> None:
+        """Revoga um token específico (ex.: logout)."""
+        if claims.get("jti") is not None and claims["jti"] not in self._tokens:
+            self._save(db, self._token_row(claims))
+
+    async def revoke_token_async(self, db: AsyncSession, claims: Dict[str, Any]) -> None:
+        if claims.get("jti") is not None and claims["jti"] not in self._tokens:
+            await self._save_async(db, self._token_row(claims))
+
+    def revoke_user(self, db: Session, user_id: int) -> None:
+        """Revoga todos os tokens já emitidos para o usuário (ex.: bloqueio)."""
+        self._save(db, self._user_row(user_id))
+
+    async def revoke_user_async(self, db: AsyncSession, user_id: int) -> None:
+        await self._save_async(db, self._user_row(user_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+            self._expiry.clear()
+            self._last_id = 0
+            self._last_sync = None
+
+
+def issued_at(now: datetime) -> float:
+    """
+    iat com microssegundos (NumericDate aceita frações): comparado a revoked_at
+    na mesma resolução, um token emitido logo após revoke_user, no mesmo
+    segundo, continua válido.
+    """
+    return now.replace(tzinfo=timezone.utc).timestamp()
+
+
+revocation_store = TokenRevocationStore(settings.TOKEN_REVOCATION_SYNC_INTERVAL)
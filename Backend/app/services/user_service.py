@@ -1,13 +1,26 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
-from ..models.user import User
-from ..models.security import UserSession
+from sqlalchemy.orm import Session
+from ..models.user import User, UserSession
 from .security_service import SecurityService
+from ..utils.pagination import keyset_paginate
 
 class UserService:
     def __init__(self):
         self.security_service = SecurityService()
 
+    @staticmethod
+    def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
+        return db.query(User).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def get_users_page(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[User], Optional[str]]:
+        return keyset_paginate(db.query(User), User, cursor, limit)
+
     async def create_user_session(
         self,
         user_id: int,
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Optional
+from fastapi import Response, status
+
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts, weak: bool = False) -> str:
+    """
+    Gera um ETag a partir das partes que identificam a versão.
+
+    Fracos (W/) servem para respostas que o CompressionMiddleware pode
+    comprimir: o mesmo validador vale para todas as codificações.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    etag = f'"{digest[:24]}"'
+    return f"W/{etag}" if weak else etag
+
+
+def body_etag(body: bytes) -> str:
+    """ETag forte do conteúdo: muda com qualquer byte, mesmo dentro do mesmo segundo."""
+    return f'"{hashlib.sha1(body).hexdigest()[:24]}"'
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """ETag forte da representação comprimida; a RFC 9110 exige um por content-coding."""
+    if not encoding or etag.startswith("W/"):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara If-None-Match com o ETag (comparação fraca, como pede a RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = _opaque_tag(etag)
+    return any(_opaque_tag(candidate.strip()) == etag for candidate in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    )
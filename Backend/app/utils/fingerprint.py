@@ -0,0 +1,42 @@
+import hashlib
+from typing import Mapping
+from starlette.datastructures import Headers
+
+# Cabeçalhos estáveis por navegador, em ordem fixa. Ficam de fora os que
+# variam a cada requisição (cookie, authorization, content-length, referer...)
+# e accept, que muda entre navegação e XHR/fetch do mesmo navegador.
+FINGERPRINT_HEADERS = (
+    "user-agent",
+    "accept-language",
+    "accept-encoding",
+    "sec-ch-ua",
+    "sec-ch-ua-mobile",
+    "sec-ch-ua-platform",
+    "dnt",
+)
+
+
+def browser_fingerprint(headers: Mapping[str, str]) -> str:
+    """
+    SHA-256 do subconjunto canônico de cabeçalhos, alimentado campo a campo
+    (sem montar e serializar um dicionário). Independe da ordem e da caixa
+    dos nomes dos cabeçalhos.
+    """
+    if not isinstance(headers, Headers):
+        headers = {name.lower(): value for name, value in headers.items()}
+    digest = hashlib.sha256()
+    for name in FINGERPRINT_HEADERS:
+        digest.update(name.encode())
+        digest.update(b"\x00")
+        digest.update(headers.get(name, "").encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def request_fingerprint(request) -> str:
+    """Fingerprint da requisição, calculada uma única vez e guardada em request.state."""
+    fingerprint = getattr(request.state, "browser_fingerprint", None)
+    if fingerprint is None:
+        fingerprint = browser_fingerprint(request.headers)
+        request.state.browser_fingerprint = fingerprint
+    return fingerprint
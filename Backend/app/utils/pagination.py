@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Codifica (created_at, id) em um cursor opaco."""
+    payload = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica um cursor gerado por encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _keyset_criterion(model, cursor: str):
+    created_at, item_id = decode_cursor(cursor)
+    # Convertido pelo próprio tipo da coluna, no mesmo formato em que é gravado
+    # (ver app.core.database.utcnow): a comparação usa o índice (created_at, id)
+    created_at = literal(created_at, model.created_at.type)
+    return or_(
+        model.created_at < created_at,
+        and_(model.created_at == created_at, model.id < item_id)
+    )
+
+
+def _ordering(model):
+    return model.created_at.desc(), model.id.desc()
+
+
+def _split_page(items: List, limit: int) -> Tuple[List, Optional[str]]:
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(last.created_at, last.id)
+
+
+def keyset_paginate(query: Query, model, cursor: Optional[str], limit: int) -> Tuple[List, Optional[str]]:
+    """
+    Pagina por (created_at, id) decrescente a partir do cursor.
+
+    Retorna os itens da página e o cursor da próxima página (None na última).
+    Um cursor vazio retorna a primeira página.
+    """
+    if cursor:
+        query = query.filter(_keyset_criterion(model, cursor))
+
+    items = query.order_by(*_ordering(model)).limit(limit + 1).all()
+    return _split_page(items, limit)
+
+
+async def keyset_paginate_async(
+    db: AsyncSession,
+    stmt: Select,
+    model,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List, Optional[str]]:
+    """Versão de keyset_paginate para AsyncSession e consultas select()."""
+    if cursor:
+        stmt = stmt.where(_keyset_criterion(model, cursor))
+
+    result = await db.scalars(stmt.order_by(*_ordering(model)).limit(limit + 1))
+    return _split_page(list(result), limit)
@@ -1,16 +1,15 @@
 from typing import Dict, List
 from datetime import datetime, timedelta
-import hashlib
-import json
-from user_agents import parse
-from geoip2.database import Reader
 from ..models.user import User, UserSession
+from .fingerprint import browser_fingerprint
 from sqlalchemy.orm import Session
 
 class SecurityAnalyzer:
     def __init__(self, db: Session):
         self.db = db
         # Você precisará baixar o banco de dados GeoLite2 da MaxMind
+        # (importe geoip2 aqui, não no topo do módulo: é opcional e lento)
+        # from geoip2.database import Reader
         # self.geo_reader = Reader('path/to/GeoLite2-City.mmdb')
 
     def calculate_risk_score(self, user: User) -> float:
@@ -69,18 +68,10 @@ class SecurityAnalyzer:
 
     def generate_browser_fingerprint(self, request_headers: Dict, user_agent_string: str) -> str:
         """Gera uma fingerprint única do navegador"""
-        user_agent = parse(user_agent_string)
-        
-        fingerprint_data = {
-            "user_agent": user_agent_string,
-            "browser": user_agent.browser.family,
-            "browser_version": user_agent.browser.version_string,
-            "os": user_agent.os.family,
-            "device": user_agent.device.family,
-            "headers": dict(request_headers)
-        }
-        
-        return hashlib.sha256(json.dumps(fingerprint_data).encode()).hexdigest()
+        # Navegador/sistema derivam do próprio User-Agent, que já entra no hash
+        if user_agent_string and "user-agent" not in {name.lower() for name in request_headers}:
+            request_headers = {**request_headers, "user-agent": user_agent_string}
+        return browser_fingerprint(request_headers)
 
     def detect_vpn(self, ip_address: str) -> bool:
         """Detecta se um IP está usando VPN"""
@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# User-Agents maiores que isso são truncados antes de servir de chave do cache
+MAX_USER_AGENT_LENGTH = 512
+
+
+class UserAgentInfo(NamedTuple):
+    browser: str
+    browser_version: str
+    os: str
+    device: str
+
+
+UNKNOWN_USER_AGENT = UserAgentInfo("Other", "", "Other", "Other")
+
+
+def parse_user_agent(user_agent_string: str) -> Optional[Any]:
+    """
+    Interpreta o User-Agent com a biblioteca user_agents, importada só no
+    primeiro uso (ela compila centenas de regexes ao ser importada).
+    Retorna None se a biblioteca não estiver instalada.
+    """
+    try:
+        from user_agents import parse
+    except ImportError:  # user_agents é opcional
+        return None
+    return parse(user_agent_string)
+
+
+@lru_cache(maxsize=settings.USER_AGENT_CACHE_SIZE)
+def _user_agent_info(user_agent_string: str) -> UserAgentInfo:
+    user_agent = parse_user_agent(user_agent_string)
+    if user_agent is None:
+        return UNKNOWN_USER_AGENT
+    return UserAgentInfo(
+        browser=user_agent.browser.family,
+        browser_version=user_agent.browser.version_string,
+        os=user_agent.os.family,
+        device=user_agent.device.family,
+    )
+
+
+def user_agent_info(user_agent_string: str) -> UserAgentInfo:
+    """
+    Navegador, sistema e dispositivo ("Other" quando não identificados).
+    Memoizado por string: poucos User-Agents distintos cobrem quase todo o tráfego.
+    """
+    return _user_agent_info((user_agent_string or "")[:MAX_USER_AGENT_LENGTH])
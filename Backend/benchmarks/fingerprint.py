@@ -0,0 +1,77 @@
+"""
+Micro-benchmark do custo por requisição de identificar o navegador.
+
+Compara o caminho antigo (interpretar o User-Agent a cada chamada e
+serializar todos os cabeçalhos com json.dumps antes do SHA-256) com o atual
+(interpretação memoizada por User-Agent e hash incremental do subconjunto
+canônico de cabeçalhos).
+
+Uso (a partir de Backend/):
+    PYTHONPATH=. python benchmarks/fingerprint.py --calls 20000
+"""
+import argparse
+import hashlib
+import json
+import timeit
+
+from app.utils.fingerprint import browser_fingerprint
+from app.utils.user_agent import parse_user_agent, user_agent_info
+
+HEADERS = {
+    "host": "forms.example.com",
+    "user-agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "accept-language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+    "accept-encoding": "gzip, deflate, br",
+    "sec-ch-ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+    "cookie": "session=" + "x" * 400,
+    "authorization": "Bearer " + "y" * 200,
+    "referer": "https://forms.example.com/forms/42",
+    "x-forwarded-for": "203.0.113.10",
+    "connection": "keep-alive",
+}
+
+
+def before() -> str:
+    user_agent_string = HEADERS["user-agent"]
+    user_agent = parse_user_agent(user_agent_string)
+    fingerprint_data = {
+        "user_agent": user_agent_string,
+        "browser": user_agent.browser.family if user_agent else "Other",
+        "browser_version": user_agent.browser.version_string if user_agent else "",
+        "os": user_agent.os.family if user_agent else "Other",
+        "device": user_agent.device.family if user_agent else "Other",
+        "headers": dict(HEADERS),
+    }
+    return hashlib.sha256(json.dumps(fingerprint_data).encode()).hexdigest()
+
+
+def after() -> str:
+    user_agent_info(HEADERS["user-agent"])
+    return browser_fingerprint(HEADERS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if parse_user_agent("") is None:
+        print("user_agents não instalado: o caminho antigo mede só a serialização dos cabeçalhos\n")
+
+    results = {}
+    for name, function in (("antes", before), ("depois", after)):
+        best = min(timeit.repeat(function, number=args.calls, repeat=args.repeat))
+        results[name] = best / args.calls * 1e6
+        print(f"{name:>7}: {results[name]:8.2f} µs por requisição")
+    print(f"{'ganho':>7}: {results['antes'] / results['depois']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark de partida a frio de um worker.
+
+Cada amostra roda num interpretador novo e mede:
+  - import: importar o módulo da aplicação (ex.: app.main)
+  - startup: executar o lifespan (criação de tabelas, tarefas de fundo)
+  - first_request: latência da primeira requisição
+
+Uso (a partir de Backend/):
+    python benchmarks/startup.py --app app.main:app --path /health --runs 5
+    python benchmarks/startup.py --imports 15   # módulos mais lentos de importar
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+from fastapi.testclient import TestClient
+started = time.perf_counter()
+module_name, _, attribute = sys.argv[1].partition(":")
+module = __import__(module_name, fromlist=["_"])
+app = getattr(module, attribute or "app")
+imported = time.perf_counter()
+
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    status = client.get(sys.argv[2]).status_code
+    answered = time.perf_counter()
+
+print(json.dumps({
+    "import": imported - started,
+    "startup": ready - imported,
+    "first_request": answered - ready,
+    "status": status,
+}))
+"""
+
+
+def run_once(target: str, path: str, env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, target, path],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(target: str, count: int, env: dict) -> list:
+    """Módulos com maior tempo acumulado segundo python -X importtime."""
+    module_name = target.partition(":")[0]
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="app.main:app", help="módulo:atributo da aplicação ASGI")
+    parser.add_argument("--path", default="/health", help="rota da primeira requisição")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--imports", type=int, default=0, help="lista os N imports mais lentos")
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR}
+    samples = [run_once(args.app, args.path, env) for _ in range(args.runs)]
+    for phase in ("import", "startup", "first_request"):
+        values = [sample[phase] * 1000 for sample in samples]
+        print(f"{phase:>14}: mediana {statistics.median(values):8.1f} ms   mín {min(values):8.1f} ms")
+    print(f"{'status':>14}: {samples[-1]['status']}")
+
+    if args.imports:
+        print("\nImports mais lentos (acumulado):")
+        for microseconds, name in slowest_imports(args.app, args.imports, env):
+            print(f"{microseconds / 1000:10.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from app.core.database import get_db
+from app.models import Form, ProcessingLog, User
+from app.models.user import UserSession
+from app.api.deps import get_current_admin_user
+from app.core.instrumentation import SlowQuery, metrics
+from app.routes import admin
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.services.audit_log_service import AuditLogService
+from app.services.auth_cache import AuthIdentity
+
+ADMIN = AuthIdentity(id=42, is_active=True, is_admin=True)
+
+
+def build_app(engine, users: int, sessions_per_user: int):
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        for index in range(users):
+            user = User(email=f"user{index}@example.com", full_name=f"User {index}", hashed_password="x")
+            user.sessions = [
+                UserSession(
+                    session_id=f"{index}-{number}",
+                    user_agent="pytest",
+                    ip_address=f"10.0.{index}.{number}",
+                    browser_fingerprint="fp",
+                    is_suspicious=number == 0,
+                )
+                for number in range(sessions_per_user)
+            ]
+            user.forms = [Form(title="Formulário", description="", fields=[], settings={})]
+            user.processing_logs = [ProcessingLog(action="upload", details="dados.csv", status="success")]
+            db.add(user)
+        db.commit()
+
+    app = FastAPI()
+    app.include_router(admin.router)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: ADMIN
+    return app
+
+
+def statements_per_endpoint(engine, users: int, sessions_per_user: int):
+    app = build_app(engine, users, sessions_per_user)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    client = TestClient(app)
+    counts = {}
+    for name, method, url in (
+        ("list", "GET", "/admin/users"),
+        ("page", "GET", "/admin/users?limit=1&cursor="),
+        ("detail", "GET", "/admin/users/1"),
+        ("investigate", "POST", "/admin/security/investigate/1"),
+    ):
+        statements.clear()
+        response = client.request(method, url)
+        assert response.status_code == 200, response.text
+        counts[name] = (len(statements), response.json())
+    return counts
+
+
+def test_admin_endpoints_issue_constant_number_of_statements(engine_factory):
+    small = statements_per_endpoint(engine_factory(), users=2, sessions_per_user=1)
+    large = statements_per_endpoint(engine_factory(), users=25, sessions_per_user=8)
+
+    assert {name: count for name, (count, _) in small.items()} == \
+        {name: count for name, (count, _) in large.items()}
+    assert large["list"][0] == 1
+    assert large["investigate"][0] == 2
+
+    users = large["list"][1]
+    assert len(users) == 25
+    assert users[0]["session_count"] == 8
+    assert users[0]["form_count"] == 1
+    assert users[0]["processing_log_count"] == 1
+    assert "hashed_password" not in users[0]
+
+    investigation = large["investigate"][1]
+    assert len(investigation["sessions"]) == 8
+    assert len(investigation["suspicious_activities"]) == 1
+
+
+def test_user_view_not_found(engine):
+    app = build_app(engine, users=1, sessions_per_user=0)
+
+    assert TestClient(app).get("/admin/users/99").status_code == 404
+
+
+def test_user_page_counts_only_its_own_users(engine):
+    app = build_app(engine, users=5, sessions_per_user=2)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    response = TestClient(app).get("/admin/users?limit=2&cursor=")
+
+    assert [user["session_count"] for user in response.json()] == [2, 2]
+    # Contadores correlacionados com a página, sem GROUP BY sobre as tabelas inteiras
+    assert len(statements) == 1 and "GROUP BY" not in statements[0]
+
+
+def test_admin_actions_are_logged_with_the_acting_admin(engine, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(AuditLogService, "record", lambda **entry: recorded.append(entry))
+    client = TestClient(build_app(engine, users=2, sessions_per_user=1))
+
+    assert client.post("/admin/security/investigate/1").status_code == 200
+    assert client.post("/admin/users/2/block", params={"reason": "spam"}).status_code == 200
+
+    assert [(entry["action"], entry["admin_id"]) for entry in recorded] == \
+        [("investigate_user", ADMIN.id), ("block_user", ADMIN.id)]
+
+
+def test_first_page_is_limited(engine):
+    client = TestClient(build_app(engine, users=5, sessions_per_user=0))
+
+    response = client.get("/admin/users", params={"limit": 2})
+    assert len(response.json()) == 2
+    following = client.get("/admin/users", params={"limit": 10, "cursor": response.headers[NEXT_CURSOR_HEADER]})
+    assert len(following.json()) == 3 and NEXT_CURSOR_HEADER not in following.headers
+
+
+def test_toggle_user_status_is_mounted(engine):
+    client = TestClient(build_app(engine, users=2, sessions_per_user=0))
+
+    response = client.put("/admin/users/1/toggle-status")
+    assert response.status_code == 200 and response.json()["is_active"] is False
+
+
+def test_slow_queries_are_exposed_to_admins(engine):
+    client = TestClient(build_app(engine, users=1, sessions_per_user=0))
+    metrics.clear()
+    metrics.slow_queries.append(SlowQuery("SELECT * FROM users WHERE id = ?", 0.5, "/admin/users"))
+
+    [group] = client.get("/admin/metrics/slow-queries").json()
+    assert (group["statement"], group["count"], group["paths"]) == ("SELECT * FROM users WHERE id = ?", 1, ["/admin/users"])
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.database import Base, get_async_database_url
+from app.models import User
+from app.schemas.form import FormCreate
+from app.services.form_service import AsyncFormService
+
+FORM = {
+    "title": "Pesquisa",
+    "description": "Avaliação do atendimento",
+    "fields": [
+        {"id": "nota", "type": "number", "label": "Nota", "required": True, "order": 0,
+         "validation": [{"rule": "max_value", "value": 10}]},
+    ],
+    "settings": {"is_public": True, "one_response_per_user": True},
+}
+
+
+def test_async_database_url():
+    assert get_async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert get_async_database_url("postgresql://u:p@db/forms") == "postgresql+asyncpg://u:p@db/forms"
+
+
+def test_async_form_service_submit_flow():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with session_factory() as db:
+            owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+            db.add(owner)
+            await db.commit()
+
+            form = await AsyncFormService.create_form(db, FormCreate(**FORM), owner.id)
+            response = await AsyncFormService.submit_response(db, form.id, {"nota": 7}, owner.id)
+            assert response.responses == {"nota": 7}
+
+            with pytest.raises(HTTPException) as exc:
+                await AsyncFormService.submit_response(db, form.id, {"nota": 8}, owner.id)
+            assert exc.value.status_code == 400
+
+            result = await AsyncFormService.submit_responses_bulk(
+                db, form.id, [(0, {"answers": {"nota": 1}}), (1, {"answers": {"nota": 11}})], owner.id
+            )
+            assert (result.accepted, result.rejected) == (1, 1)
+
+            responses, next_cursor = await AsyncFormService.get_form_responses_page(
+                db, form.id, owner.id, "", 1
+            )
+            assert len(responses) == 1 and next_cursor
+            responses, next_cursor = await AsyncFormService.get_form_responses_page(
+                db, form.id, owner.id, next_cursor, 1
+            )
+            assert len(responses) == 1 and next_cursor is None
+
+        await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models import SecurityAuditLog
+from app.services.audit_log_service import AuditLogService
+from app.services.batch_writer import BatchWriter
+
+
+def make_event(minutes_ago: int, admin_id: int = 1) -> dict:
+    return {
+        "timestamp": datetime(2024, 1, 1, 12) - timedelta(minutes=minutes_ago),
+        "action": "block_user",
+        "admin_id": admin_id,
+        "target_user_id": 2,
+        "details": {},
+        "ip_address": "127.0.0.1",
+        "geolocation": {},
+    }
+
+
+async def wait_for(condition, timeout: float = 2.0) -> bool:
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+def test_batches_flush_on_size_time_and_stop(tmp_path):
+    url = f"sqlite:///{tmp_path / 'audit.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    session_factory = async_sessionmaker(async_engine)
+
+    async def scenario():
+        by_size = BatchWriter(SecurityAuditLog, batch_size=3, flush_interval=60, session_factory=session_factory)
+        by_size.start()
+        for minutes in range(2):
+            by_size.enqueue(make_event(minutes))
+        await asyncio.sleep(0.05)
+        assert by_size.written == 0
+        by_size.enqueue(make_event(2))
+        assert await wait_for(lambda: by_size.written == 3)
+
+        by_size.enqueue(make_event(20))
+        await by_size.stop()
+        assert (by_size.pending, by_size.written) == (0, 4)
+
+        by_time = BatchWriter(SecurityAuditLog, batch_size=100, flush_interval=0.05, session_factory=session_factory)
+        by_time.start()
+        by_time.enqueue(make_event(10, admin_id=7))
+        assert await wait_for(lambda: by_time.written == 1)
+        await by_time.stop()
+        await async_engine.dispose()
+
+    asyncio.run(scenario())
+
+    with sessionmaker(bind=sync_engine)() as db:
+        assert len(AuditLogService.get_logs(db)) == 5
+        logs = AuditLogService.get_logs(
+            db,
+            start_date=datetime(2024, 1, 1, 11, 45),
+            end_date=datetime(2024, 1, 1, 11, 59)
+        )
+        assert [log.admin_id for log in logs] == [1, 1, 7]
+        assert len(AuditLogService.get_logs(db, admin_id=7)) == 1
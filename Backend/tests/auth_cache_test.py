@@ -0,0 +1,61 @@
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from jose import JWTError
+from sqlalchemy import event
+from app.api.deps import get_current_active_user, get_current_user
+from app.models import User
+from app.services.auth_cache import identity_cache, token_cache
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture
+def db(db, engine):
+    db.statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: db.statements.append(args[2]))
+    return db
+
+
+def make_user(db) -> User:
+    user = User(email="user@example.com", full_name="User", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_token_and_identity_are_cached(db):
+    user = make_user(db)
+    token = AuthService.create_access_token({"sub": str(user.id)}, timedelta(minutes=5))
+
+    first = get_current_user(db, token)
+    db.statements.clear()
+    second = get_current_user(db, token)
+    assert first is second
+    assert (first.id, first["id"], first.is_active) == (user.id, user.id, True)
+    assert db.statements == []
+
+
+def test_identity_invalidation_reflects_blocked_user(db):
+    user = make_user(db)
+    token = AuthService.create_access_token({"sub": str(user.id)}, timedelta(minutes=5))
+    get_current_active_user(get_current_user(db, token))
+
+    user.is_active = False
+    db.commit()
+    identity_cache.invalidate(user.id)
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_active_user(get_current_user(db, token))
+    assert exc.value.status_code == 400
+
+
+def test_invalid_and_expired_tokens_are_not_cached(db):
+    expired = AuthService.create_access_token({"sub": "1"}, timedelta(seconds=-1))
+    for token in ("not-a-token", expired):
+        with pytest.raises(JWTError):
+            token_cache.decode(token)
+    assert len(token_cache) == 0
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(db, expired)
+    assert exc.value.status_code == 401
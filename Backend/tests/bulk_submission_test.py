@@ -0,0 +1,141 @@
+import json
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.api.endpoints import forms
+from app.core.database import Base, get_async_db
+from app.middleware.auth_middleware import verify_token
+from app.models import FormResponse, User
+from app.schemas.form import FormCreate
+from app.services.form_service import FormService
+
+FORM = {
+    "title": "Inscrição",
+    "description": "Evento",
+    "fields": [
+        {"id": "nome", "type": "text", "label": "Nome", "required": True, "order": 0},
+        {"id": "idade", "type": "number", "label": "Idade", "order": 1},
+    ],
+    "settings": {"is_public": True},
+}
+
+
+def create_form(db):
+    owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    return FormService.create_form(db, FormCreate(**FORM), owner.id)
+
+
+def count_responses(db, form_id):
+    return db.scalar(select(func.count()).where(FormResponse.form_id == form_id))
+
+
+def test_parse_json_array():
+    items, errors = forms._parse_bulk_body(b'[{"answers": {}}, {"answers": {"a": 1}}]', "application/json")
+    assert items == [(0, {"answers": {}}), (1, {"answers": {"a": 1}})]
+    assert errors == []
+
+
+def test_parse_ndjson_reports_bad_lines_by_index():
+    body = b'{"answers": {"nome": "Ana"}}\n\nnot json\n{"answers": {"nome": "Bia"}}\n'
+    items, errors = forms._parse_bulk_body(body, "application/x-ndjson")
+    assert [index for index, _ in items] == [0, 2]
+    assert [(error.index, error.detail) for error in errors] == [(1, "Invalid JSON")]
+
+
+@pytest.mark.parametrize("body", [b"not json", b'{"answers": {}}'])
+def test_parse_rejects_non_array_json(body):
+    with pytest.raises(HTTPException) as exc:
+        forms._parse_bulk_body(body, "application/json")
+    assert exc.value.status_code == 400
+
+
+def test_bulk_submission_keeps_valid_items(db):
+    form = create_form(db)
+    result = FormService.submit_responses_bulk(db, form.id, enumerate([
+        {"answers": {"nome": "Ana", "idade": 30}},
+        {"answers": {"idade": 20}},
+        "não é um objeto",
+        {"answers": {"nome": "Bia", "outro": 1}},
+        {"answers": {"nome": "Caio"}},
+    ]), form.owner_id)
+
+    assert (result.accepted, result.rejected) == (2, 3)
+    assert [error.index for error in result.errors] == [1, 2, 3]
+    assert result.errors[0].detail == "Field 'Nome' is required"
+    assert count_responses(db, form.id) == 2
+
+
+@pytest.fixture
+def client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'bulk.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        form = create_form(db)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bulk.db'}", poolclass=NullPool)
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(forms.router, prefix="/forms")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[verify_token] = lambda: {"id": form.owner_id}
+    client = TestClient(app)
+    client.form_id = form.id
+    client.engine = engine
+    yield client
+    engine.dispose()
+
+
+def test_endpoint_merges_parse_and_validation_errors(client):
+    body = b'{"answers": {"nome": "Ana"}}\n{broken\n{"answers": {}}\n'
+    response = client.post(
+        f"/forms/{client.form_id}/submit/bulk", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["accepted"] == 1
+    assert [error["index"] for error in response.json()["errors"]] == [1, 2]
+    with sessionmaker(bind=client.engine)() as db:
+        assert count_responses(db, client.form_id) == 1
+
+
+def test_endpoint_enforces_item_cap(client, monkeypatch):
+    monkeypatch.setattr(forms.settings, "BULK_SUBMISSION_MAX_ITEMS", 2)
+    body = json.dumps([{"answers": {"nome": str(index)}} for index in range(3)])
+    response = client.post(f"/forms/{client.form_id}/submit/bulk", content=body)
+    assert response.status_code == 413
+    with sessionmaker(bind=client.engine)() as db:
+        assert count_responses(db, client.form_id) == 0
+
+
+def test_endpoint_enforces_byte_limit_before_reading(client, monkeypatch):
+    monkeypatch.setattr(forms.settings, "BULK_SUBMISSION_MAX_BYTES", 64)
+    body = json.dumps([{"answers": {"nome": "x" * 100}}]).encode()
+    url = f"/forms/{client.form_id}/submit/bulk"
+
+    assert client.post(url, content=body).status_code == 413
+    # Sem Content-Length (chunked): recusado durante a leitura
+    assert client.post(url, content=iter([body[:50], body[50:]])).status_code == 413
+    assert client.post(url, content=b'[{"answers": {"nome": "Ana"}}]').status_code == 200
+
+
+@pytest.mark.parametrize("identity, expected", [
+    ({"id": 999, "is_admin": False}, 403),
+    ({"id": 999, "is_admin": True}, 200),
+])
+def test_endpoint_is_restricted_to_owner_or_admin(client, identity, expected):
+    client.app.dependency_overrides[verify_token] = lambda: identity
+    response = client.post(f"/forms/{client.form_id}/submit/bulk", content=b'[{"answers": {"nome": "Ana"}}]')
+
+    assert response.status_code == expected
+    with sessionmaker(bind=client.engine)() as db:
+        assert count_responses(db, client.form_id) == (1 if expected == 200 else 0)
@@ -0,0 +1,64 @@
+import gzip
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.middleware.compression import CompressionMiddleware
+from app.utils.compression import select_encoding
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+@app.get("/big")
+def big():
+    return PlainTextResponse("x" * 5000)
+
+
+@app.get("/small")
+def small():
+    return PlainTextResponse("x" * 10)
+
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse(iter([b"a" * 1000, b"b" * 1000]), media_type="text/csv")
+
+
+@app.get("/precompressed")
+def precompressed():
+    return Response(gzip.compress(b"y" * 1000), headers={"Content-Encoding": "gzip"})
+
+
+client = TestClient(app)
+
+
+def test_compresses_above_threshold():
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < 5000
+    assert response.text == "x" * 5000
+    assert "accept-encoding" in response.headers["vary"].lower()
+
+
+def test_skips_small_bodies_and_clients_without_gzip():
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_and_precompressed_responses():
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == b"a" * 1000 + b"b" * 1000
+
+    response = client.get("/precompressed", headers={"Accept-Encoding": "gzip"})
+    assert response.content == b"y" * 1000
+
+
+def test_select_encoding():
+    assert select_encoding(None) is None
+    assert select_encoding("gzip;q=0, deflate") is None
+    assert select_encoding("deflate, gzip") == "gzip"
+    assert select_encoding("*") is not None
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.services.auth_cache import identity_cache, token_cache
+from app.services.form_analytics import snapshot_cache
+from app.services.form_cache import form_cache
+from app.services.form_validator import clear_form_validators
+from app.services.submission_dedup import submitted_respondents
+from app.services.token_revocation import revocation_store
+
+# Caches globais do processo; bancos em memória reaproveitam ids entre os testes
+GLOBAL_CACHES = (form_cache, snapshot_cache, submitted_respondents, token_cache, identity_cache, revocation_store)
+
+
+def _clear_caches() -> None:
+    clear_form_validators()
+    for cache in GLOBAL_CACHES:
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    _clear_caches()
+    yield
+    _clear_caches()
+
+
+@pytest.fixture
+def engine_factory():
+    """Cria bancos SQLite em memória já com o schema; cada um é uma única conexão compartilhada."""
+    engines = []
+
+    def create():
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        engines.append(engine)
+        return engine
+
+    yield create
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def engine(engine_factory):
+    return engine_factory()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
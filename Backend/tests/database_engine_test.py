@@ -0,0 +1,71 @@
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+from app.core import database
+from app.core.config import Settings
+
+
+def make_settings(url: str, **overrides) -> Settings:
+    return Settings(DATABASE_URL=url, METRICS_ENABLED=False, **overrides)
+
+
+def pragma(connection, name: str):
+    return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_file_database_uses_pool_settings_and_pragmas(tmp_path):
+    settings = make_settings(
+        f"sqlite:///{tmp_path / 'app.db'}", DB_POOL_SIZE=3, DB_MAX_OVERFLOW=2, SQLITE_BUSY_TIMEOUT_MS=1234
+    )
+    engine = database.create_db_engine(settings)
+    try:
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == 3
+        assert engine.pool._max_overflow == 2
+        with engine.connect() as connection:
+            assert pragma(connection, "journal_mode") == "wal"
+            assert pragma(connection, "synchronous") == 1  # NORMAL
+            assert pragma(connection, "busy_timeout") == 1234
+    finally:
+        engine.dispose()
+
+
+def test_memory_database_keeps_dialect_pool_and_skips_wal():
+    engine = database.create_db_engine(make_settings("sqlite://"))
+    try:
+        assert not isinstance(engine.pool, QueuePool)
+        with engine.connect() as connection:
+            assert pragma(connection, "journal_mode") == "memory"
+            assert pragma(connection, "busy_timeout") == 5000
+    finally:
+        engine.dispose()
+
+
+def test_async_engine_applies_pragmas(tmp_path):
+    async def scenario():
+        engine = database.create_async_db_engine(make_settings(f"sqlite:///{tmp_path / 'app.db'}"))
+        try:
+            async with engine.connect() as connection:
+                journal_mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+            return journal_mode, database._pool_stats(engine.sync_engine)
+        finally:
+            await engine.dispose()
+
+    journal_mode, stats = asyncio.run(scenario())
+    assert journal_mode == "wal"
+    assert stats["pool"] == "AsyncAdaptedQueuePool"
+    assert stats["checkedout"] == 0
+
+
+def test_pool_stats_track_checked_out_connections(tmp_path):
+    engine = database.create_db_engine(make_settings(f"sqlite:///{tmp_path / 'app.db'}"))
+    try:
+        with engine.connect():
+            stats = database._pool_stats(engine)
+            assert stats["pool"] == "QueuePool"
+            assert (stats["size"], stats["checkedout"]) == (5, 1)
+        assert database._pool_stats(engine)["checkedout"] == 0
+    finally:
+        engine.dispose()
+
+    assert set(database.get_pool_stats()) == {"sync", "async"}
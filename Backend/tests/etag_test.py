@@ -0,0 +1,130 @@
+import gzip
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.api.endpoints import forms
+from app.core.database import Base, get_async_db
+from app.middleware.auth_middleware import verify_token
+from app.middleware.compression import CompressionMiddleware
+from app.models import Form, User
+from app.schemas.form import FormCreate
+from app.services.form_service import FormService
+from app.utils.etag import encoded_etag, etag_matches, make_etag
+
+FORM = {
+    "title": "Cadastro",
+    "description": "Dados básicos " * 20,
+    "fields": [{"id": "nome", "type": "text", "label": "Nome", "order": 0}],
+    "settings": {"is_public": True},
+}
+
+
+def test_etag_helpers():
+    strong = make_etag("form", 1)
+    assert strong == make_etag("form", 1) != make_etag("form", 2)
+    assert make_etag("form", 1, weak=True) == f"W/{strong}"
+    assert encoded_etag(strong, "gzip") == strong[:-1] + '-gzip"'
+    assert encoded_etag(strong, None) == strong
+    assert encoded_etag(f"W/{strong}", "gzip") == f"W/{strong}"
+
+    assert etag_matches(f'"other", W/{strong}', strong)
+    assert etag_matches(strong, f"W/{strong}")
+    assert etag_matches("*", strong)
+    assert not etag_matches('"other"', strong)
+    assert not etag_matches(None, strong)
+
+
+@pytest.fixture
+def client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'etag.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+        db.add(owner)
+        db.commit()
+        form = FormService.create_form(db, FormCreate(**FORM), owner.id)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'etag.db'}", poolclass=NullPool)
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as session:
+            yield session
+
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    app.include_router(forms.router, prefix="/forms")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[verify_token] = lambda: {"id": form.owner_id}
+    client = TestClient(app)
+    client.form_id, client.owner_id, client.sessions = form.id, form.owner_id, Session
+    yield client
+    engine.dispose()
+
+
+def test_form_returns_304_for_matching_tag(client):
+    url = f"/forms/{client.form_id}"
+    first = client.get(url, headers={"accept-encoding": "identity"})
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and not etag.startswith("W/")
+
+    cached = client.get(url, headers={"accept-encoding": "identity", "if-none-match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    stale = client.get(url, headers={"accept-encoding": "identity", "if-none-match": '"0123456789abcdef01234567"'})
+    assert stale.status_code == 200
+    assert stale.json()["id"] == client.form_id
+
+
+def test_form_tag_differs_per_content_coding(client):
+    url = f"/forms/{client.form_id}"
+    identity = client.get(url, headers={"accept-encoding": "identity"}).headers["etag"]
+    # stream=True: lê os bytes ainda comprimidos
+    with client.stream("GET", url, headers={"accept-encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        compressed_etag = response.headers["etag"]
+        body = gzip.decompress(b"".join(response.iter_raw()))
+    assert compressed_etag == encoded_etag(identity, "gzip")
+    assert b'"title":"Cadastro"' in body
+
+    headers = {"accept-encoding": "gzip"}
+    assert client.get(url, headers={**headers, "if-none-match": compressed_etag}).status_code == 304
+    assert client.get(url, headers={**headers, "if-none-match": identity}).status_code == 200
+
+
+def test_listing_tag_follows_count_and_last_update(client):
+    first = client.get("/forms/")
+    etag = first.headers["etag"]
+    assert etag.startswith("W/")
+    assert client.get("/forms/", headers={"if-none-match": etag}).status_code == 304
+
+    with client.sessions() as db:
+        FormService.create_form(db, FormCreate(**FORM), client.owner_id)
+    added = client.get("/forms/", headers={"if-none-match": etag})
+    assert added.status_code == 200
+    assert len(added.json()) == 2
+
+    etag = added.headers["etag"]
+    with client.sessions() as db:
+        db.execute(update(Form).where(Form.id == client.form_id).values(updated_at=datetime(2100, 1, 1)))
+        db.commit()
+    assert client.get("/forms/", headers={"if-none-match": etag}).status_code == 200
+
+
+def test_compressed_listing_keeps_weak_tag(client):
+    with client.sessions() as db:
+        for _ in range(5):
+            FormService.create_form(db, FormCreate(**FORM), client.owner_id)
+    response = client.get("/forms/", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+    assert client.get("/forms/", headers={"accept-encoding": "gzip", "if-none-match": etag}).status_code == 304
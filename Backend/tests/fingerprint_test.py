@@ -0,0 +1,78 @@
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from app.middleware.auth import get_client_info
+from app.utils.fingerprint import browser_fingerprint, request_fingerprint
+from app.utils.security import SecurityAnalyzer
+from app.utils.user_agent import MAX_USER_AGENT_LENGTH, _user_agent_info, user_agent_info
+
+CHROME = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
+HEADERS = {
+    "User-Agent": CHROME,
+    "Accept": "text/html",
+    "Accept-Language": "pt-BR,pt;q=0.9",
+    "Accept-Encoding": "gzip, br",
+}
+
+
+def test_fingerprint_ignores_order_case_and_volatile_headers():
+    reordered = {name.lower(): value for name, value in reversed(list(HEADERS.items()))}
+    volatile = {**HEADERS, "Cookie": "session=abc", "Authorization": "Bearer x", "Content-Length": "12"}
+    # Accept de uma chamada XHR do mesmo navegador
+    xhr = {**HEADERS, "Accept": "application/json"}
+    fingerprint = browser_fingerprint(HEADERS)
+    assert browser_fingerprint(reordered) == fingerprint
+    assert browser_fingerprint(volatile) == fingerprint
+    assert browser_fingerprint(xhr) == fingerprint
+    assert browser_fingerprint(Headers(HEADERS)) == fingerprint
+
+
+def test_fingerprint_changes_with_canonical_headers():
+    fingerprint = browser_fingerprint(HEADERS)
+    assert browser_fingerprint({**HEADERS, "Accept-Language": "en-US"}) != fingerprint
+    assert browser_fingerprint({**HEADERS, "Sec-CH-UA-Platform": '"Linux"'}) != fingerprint
+    # Separadores impedem que valores deslocados entre cabeçalhos colidam
+    assert browser_fingerprint({"accept-language": "a", "accept-encoding": "b"}) != browser_fingerprint(
+        {"accept-language": "ab", "accept-encoding": ""}
+    )
+
+
+def test_security_analyzer_uses_user_agent_argument():
+    headers = {name: value for name, value in HEADERS.items() if name != "User-Agent"}
+    assert SecurityAnalyzer.generate_browser_fingerprint(None, headers, CHROME) == browser_fingerprint(HEADERS)
+
+
+def test_request_fingerprint_is_computed_once_per_request():
+    scope = {
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in HEADERS.items()],
+    }
+    request = Request(scope)
+    assert request_fingerprint(request) == browser_fingerprint(HEADERS)
+    request.state.browser_fingerprint = "cached"
+    assert request_fingerprint(request) == "cached"
+
+
+def test_client_info_keeps_only_fingerprint_headers():
+    headers = {**HEADERS, "Authorization": "Bearer x", "Cookie": "session=abc"}
+    request = Request({
+        "type": "http",
+        "client": ("203.0.113.7", 4321),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+    info = get_client_info(request)
+    assert info["headers"] == {
+        "user-agent": CHROME, "accept-language": "pt-BR,pt;q=0.9", "accept-encoding": "gzip, br"
+    }
+    assert info["fingerprint"] == browser_fingerprint(headers)
+
+
+def test_user_agent_info_is_memoized_and_bounded():
+    _user_agent_info.cache_clear()
+    first = user_agent_info(CHROME)
+    assert user_agent_info(CHROME) is first
+    assert _user_agent_info.cache_info().hits == 1
+
+    user_agent_info("x" * (MAX_USER_AGENT_LENGTH * 4))
+    user_agent_info("x" * (MAX_USER_AGENT_LENGTH * 2))
+    assert _user_agent_info.cache_info().hits == 2
+    assert _user_agent_info.cache_info().currsize == 2
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from datetime import date, datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.models import FormResponse, User
+from app.schemas.form import FormCreate, FormUpdate
+from app.services.form_analytics import FormSnapshot
+from app.services.form_service import AsyncFormService, FormService
+
+FORM = {
+    "title": "Pesquisa",
+    "description": "Perfil dos clientes",
+    "fields": [
+        {"id": "idade", "type": "number", "label": "Idade", "order": 0},
+        {"id": "plano", "type": "radio", "label": "Plano", "order": 1,
+         "options": [{"value": "basico", "label": "Básico"}, {"value": "pro", "label": "Pro"}]},
+        {"id": "canais", "type": "multiselect", "label": "Canais", "order": 2,
+         "options": [{"value": "email", "label": "E-mail"}, {"value": "sms", "label": "SMS"}]},
+        {"id": "inicio", "type": "date", "label": "Início", "order": 3},
+        {"id": "nome", "type": "text", "label": "Nome", "order": 4},
+    ],
+    "settings": {"is_public": True, "one_response_per_user": False},
+}
+ANSWERS = [
+    {"idade": 20, "plano": "basico", "canais": ["email"], "inicio": "2024-01-01", "nome": "Ana"},
+    {"idade": 30, "plano": "pro", "canais": ["email", "sms"], "inicio": "2024-01-02"},
+    {"idade": 40, "plano": "pro", "canais": ["sms"], "inicio": "2024-01-08"},
+    {"plano": "basico", "inicio": "2024-02-15"},
+]
+
+
+@pytest.fixture
+def form(db):
+    owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    form = FormService.create_form(db, FormCreate(**FORM), owner.id)
+    for answers in ANSWERS:
+        FormService.submit_response(db, form.id, answers)
+    return form
+
+
+def test_snapshot_statistics(db, form):
+    snapshot = FormService.get_analytics_snapshot(db, form.id, form.owner_id)
+    assert snapshot.size == 4
+    assert set(snapshot.columns) == {"idade", "plano", "canais", "inicio"}
+
+    crosstab = snapshot.crosstab("plano", "canais")
+    assert crosstab.rows == ["basico", "pro"]
+    assert crosstab.columns == ["email", "sms"]
+    assert crosstab.counts == [[1, 0], [1, 2]]
+    assert crosstab.total == 3
+
+    stats = snapshot.percentiles("idade", [0, 50, 100])
+    assert stats.count == 3
+    assert stats.mean == 30.0
+    assert stats.percentiles == {"p0": 20.0, "p50": 30.0, "p100": 40.0}
+
+    weekly = snapshot.date_histogram("inicio", "week")
+    assert [(b.start, b.count) for b in weekly.buckets] == [
+        (date(2024, 1, 1), 2), (date(2024, 1, 8), 1), (date(2024, 2, 12), 1)
+    ]
+    monthly = snapshot.date_histogram("inicio", "month")
+    assert [(b.start, b.count) for b in monthly.buckets] == [(date(2024, 1, 1), 3), (date(2024, 2, 1), 1)]
+    assert sum(b.count for b in snapshot.date_histogram().buckets) == 4
+
+    with pytest.raises(HTTPException):
+        snapshot.percentiles("plano")
+    with pytest.raises(HTTPException):
+        snapshot.date_histogram("inicio", "hour")
+
+
+def test_refresh_appends_only_new_responses(engine, db, form):
+    first = FormService.get_analytics_snapshot(db, form.id, form.owner_id)
+    assert FormService.get_analytics_snapshot(db, form.id, form.owner_id) is first
+
+    # Gravada direto: opção que não existe mais na definição do formulário
+    db.add(FormResponse(form_id=form.id, responses={"idade": 50, "plano": "vip", "canais": ["sms"]}))
+    db.commit()
+    loaded = []
+
+    def count_loaded(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT FORM_RESPONSES.ID"):
+            loaded.append(parameters)
+
+    event.listen(engine, "before_cursor_execute", count_loaded)
+    try:
+        second = FormService.get_analytics_snapshot(db, form.id, form.owner_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_loaded)
+
+    assert len(loaded) == 1 and first.last_response_id in loaded[0]
+    assert first.size == 4
+    assert second.size == 5
+    assert second.last_response_id > first.last_response_id
+    # Opções desconhecidas viram novas categorias no fim
+    assert second.crosstab("plano", "canais").rows == ["basico", "pro", "vip"]
+    assert second.percentiles("idade", [100]).percentiles == {"p100": 50.0}
+
+
+def test_form_update_discards_snapshot(db, form):
+    first = FormService.get_analytics_snapshot(db, form.id, form.owner_id)
+    FormService.update_form(db, form.id, FormUpdate(**{**FORM, "title": "Outro título"}), form.owner_id)
+    assert FormService.get_analytics_snapshot(db, form.id, form.owner_id) is not first
+
+
+def test_fields_change_in_the_same_second_discards_snapshot(db, form):
+    first = FormService.get_analytics_snapshot(db, form.id, form.owner_id)
+    # Sem passar por update_form (outro worker) e com o mesmo updated_at
+    updated_at = form.updated_at
+    form.fields = [field for field in form.fields if field["id"] != "idade"]
+    form.updated_at = updated_at
+    db.commit()
+
+    second = FormService.get_analytics_snapshot(db, form.id, form.owner_id)
+    assert second is not first
+    assert "idade" not in second.columns
+
+
+@pytest.mark.parametrize("created_at", [None, datetime(2020, 1, 1)], ids=["recent", "before-lookback"])
+def test_responses_committed_out_of_id_order_are_loaded(db, form, created_at):
+    last_id = FormService.get_analytics_snapshot(db, form.id, form.owner_id).last_response_id
+    db.add(FormResponse(id=last_id + 10, form_id=form.id, responses={"idade": 50}))
+    db.commit()
+    FormService.get_analytics_snapshot(db, form.id, form.owner_id)
+    # Id reservado antes do último, mas confirmado depois do snapshot
+    db.add(FormResponse(id=last_id + 5, form_id=form.id, responses={"idade": 99}, created_at=created_at))
+    db.commit()
+
+    snapshot = FormService.get_analytics_snapshot(db, form.id, form.owner_id)
+    assert snapshot.size == 6
+    assert sorted(snapshot.ids.tolist()) == sorted(set(snapshot.ids.tolist()))
+    assert snapshot.percentiles("idade", [100]).percentiles == {"p100": 99.0}
+
+
+def test_async_snapshot(monkeypatch):
+    add_chunk = FormSnapshot._add_chunk
+    threads = set()
+
+    def tracked(self, rows):
+        threads.add(threading.get_ident())
+        add_chunk(self, rows)
+
+    monkeypatch.setattr(FormSnapshot, "_add_chunk", tracked)
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+            db.add(owner)
+            await db.commit()
+            form = await AsyncFormService.create_form(db, FormCreate(**FORM), owner.id)
+            for answers in ANSWERS:
+                await AsyncFormService.submit_response(db, form.id, answers)
+
+            snapshot = await AsyncFormService.get_analytics_snapshot(db, form.id, owner.id)
+            assert snapshot.size == 4
+            assert snapshot.crosstab("plano", "plano").counts == [[2, 0], [0, 2]]
+        await engine.dispose()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    # Colunas NumPy montadas fora do event loop
+    assert threads and loop_thread not in threads
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.models import User
+from app.schemas.form import FormCreate, FormUpdate
+from app.services.form_cache import FormDefinitionCache, form_cache
+from app.services.form_service import AsyncFormService, FormService
+
+FORM = {
+    "title": "Cadastro",
+    "description": "Dados básicos",
+    "fields": [{"id": "nome", "type": "text", "label": "Nome", "order": 0}],
+    "settings": {"is_public": True},
+}
+
+
+@pytest.fixture
+def forms(db):
+    owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    return [FormService.create_form(db, FormCreate(**FORM), owner.id) for _ in range(3)]
+
+
+def test_hits_misses_and_invalidation(forms):
+    cache = FormDefinitionCache(maxsize=8, ttl=60)
+    form = forms[0]
+    assert cache.get(form.id) is None
+    entry = cache.put(form)
+    assert cache.get(form.id) is entry
+    assert entry.form.title == "Cadastro"
+    assert entry.encoded("gzip") is entry.encoded("gzip")
+
+    cache.invalidate(form.id)
+    assert cache.get(form.id) is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+
+
+def test_miss_overlapping_an_invalidation_is_not_stored(forms):
+    cache = FormDefinitionCache(maxsize=8, ttl=60)
+    form, other = forms[0], forms[1]
+    generation = cache.generation()
+    # update_form invalida enquanto o miss ainda lia o banco
+    cache.invalidate(form.id)
+    assert cache.put(form, generation).form.id == form.id
+    assert cache.get(form.id) is None
+
+    # Invalidar outro formulário não impede guardar este
+    generation = cache.generation()
+    cache.invalidate(other.id)
+    cache.put(form, generation)
+    assert cache.get(form.id) is not None
+
+
+def test_evicted_invalidations_are_treated_conservatively(forms):
+    cache = FormDefinitionCache(maxsize=1, ttl=60)
+    generation = cache.generation()
+    cache.invalidate(forms[0].id)
+    cache.invalidate(forms[1].id)  # descarta o registro de forms[0]
+    cache.put(forms[0], generation)
+    assert cache.get(forms[0].id) is None
+
+    cache.put(forms[0], cache.generation())
+    assert cache.get(forms[0].id) is not None
+
+
+def test_async_definition_is_cached_and_invalidated_on_update():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+            db.add(owner)
+            await db.commit()
+            form = await AsyncFormService.create_form(db, FormCreate(**FORM), owner.id)
+
+            first = await AsyncFormService.get_form_definition(db, form.id)
+            assert await AsyncFormService.get_form_definition(db, form.id) is first
+
+            private = {**FORM, "title": "Privado", "settings": {"is_public": False}}
+            await AsyncFormService.update_form(db, form.id, FormUpdate(**private), owner.id)
+            with pytest.raises(HTTPException) as exc:
+                await AsyncFormService.get_form_definition(db, form.id)
+            assert exc.value.status_code == 403
+            refreshed = await AsyncFormService.get_form_definition(db, form.id, owner.id)
+            assert refreshed.form.title == "Privado"
+            # Entrada em cache também aplica a visibilidade
+            with pytest.raises(HTTPException):
+                await AsyncFormService.get_form_definition(db, form.id)
+        await engine.dispose()
+
+    asyncio.run(scenario())
+    assert form_cache.stats()["hits"] >= 1
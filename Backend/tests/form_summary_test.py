@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.models import FormSummaryCounter, User
+from app.schemas.form import FormCreate
+from app.services.form_service import AsyncFormService, FormService
+from app.services import form_summary
+from app.services.form_summary import FormSummaryService
+
+FORM = {
+    "title": "Pesquisa",
+    "description": "Avaliação do atendimento",
+    "fields": [
+        {"id": "nota", "type": "number", "label": "Nota", "order": 0},
+        {"id": "canal", "type": "radio", "label": "Canal", "order": 1,
+         "options": [{"value": "site", "label": "Site"}, {"value": "loja", "label": "Loja"}]},
+        {"id": "temas", "type": "multiselect", "label": "Temas", "order": 2,
+         "options": [{"value": "preco", "label": "Preço"}, {"value": "prazo", "label": "Prazo"}]},
+        {"id": "comentario", "type": "text", "label": "Comentário", "order": 3},
+    ],
+    "settings": {"is_public": True, "one_response_per_user": False},
+}
+ANSWERS = [
+    {"nota": 8, "canal": "site", "temas": ["preco", "prazo"], "comentario": "ok"},
+    {"nota": 2, "canal": "loja", "temas": ["preco"]},
+    {"nota": 5, "canal": "site"},
+]
+
+
+@pytest.fixture
+def form(db):
+    owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    form = FormService.create_form(db, FormCreate(**FORM), owner.id)
+    return form
+
+
+def test_summary_is_updated_incrementally(db, form):
+    FormService.submit_response(db, form.id, ANSWERS[0])
+    FormService.submit_responses_bulk(db, form.id, enumerate({"answers": a} for a in ANSWERS[1:]), form.owner_id)
+
+    summary = FormService.get_summary(db, form.id, form.owner_id)
+    assert summary.total_responses == 3
+    fields = {field.field_id: field for field in summary.fields}
+    assert set(fields) == {"nota", "canal", "temas"}
+    assert fields["canal"].options == {"site": 2, "loja": 1}
+    assert fields["temas"].options == {"preco": 2, "prazo": 1}
+    assert fields["nota"].stats.model_dump() == {"count": 3, "min": 2.0, "max": 8.0, "mean": 5.0}
+    assert sum(day.count for day in summary.daily) == 3
+
+
+def test_rebuild_matches_incremental_counters(db, form):
+    for answers in ANSWERS:
+        FormService.submit_response(db, form.id, answers)
+    incremental = FormService.get_summary(db, form.id, form.owner_id)
+
+    db.query(FormSummaryCounter).delete()
+    db.commit()
+    rebuilt = FormService.rebuild_summary(db, form.id, form.owner_id)
+    assert rebuilt.model_dump(exclude={"daily"}) == incremental.model_dump(exclude={"daily"})
+    assert sum(day.count for day in rebuilt.daily) == 3
+
+
+def test_async_summary():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+            db.add(owner)
+            await db.commit()
+            form = await AsyncFormService.create_form(db, FormCreate(**FORM), owner.id)
+            for answers in ANSWERS:
+                await AsyncFormService.submit_response(db, form.id, answers)
+
+            summary = await AsyncFormService.get_summary(db, form.id, owner.id)
+            assert summary.total_responses == 3
+            assert summary.daily[-1].date == date.today() or len(summary.daily) == 1
+            rebuilt = await AsyncFormService.rebuild_summary(db, form.id, owner.id)
+            assert rebuilt.total_responses == 3
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_daily_buckets_use_the_utc_day_of_created_at(db, form):
+    # 22h em São Paulo já é o dia seguinte em UTC, como o rebuild lê do PostgreSQL
+    created_at = datetime(2024, 1, 1, 22, 30, tzinfo=timezone(timedelta(hours=-3)))
+    FormSummaryService.record(db, form, [(ANSWERS[0], created_at), (ANSWERS[1], created_at.replace(tzinfo=None))])
+    db.commit()
+
+    daily = FormService.get_summary(db, form.id, form.owner_id).daily
+    assert [(day.date, day.count) for day in daily] == [(date(2024, 1, 1), 1), (date(2024, 1, 2), 1)]
+
+
+
+def test_submissions_spread_over_shards(db, form, monkeypatch):
+    shards = itertools.cycle(range(3))
+    monkeypatch.setattr(form_summary.random, "randrange", lambda stop: next(shards))
+    for answers in ANSWERS:
+        FormService.submit_response(db, form.id, answers)
+
+    totals = db.query(FormSummaryCounter).filter_by(form_id=form.id, kind="total").all()
+    assert sorted(counter.shard for counter in totals) == [0, 1, 2]
+    summary = FormService.get_summary(db, form.id, form.owner_id)
+    assert summary.total_responses == 3
+    fields = {field.field_id: field for field in summary.fields}
+    assert fields["canal"].options == {"site": 2, "loja": 1}
+    assert fields["nota"].stats.model_dump() == {"count": 3, "min": 2.0, "max": 8.0, "mean": 5.0}
+
+    rebuilt = FormService.rebuild_summary(db, form.id, form.owner_id)
+    assert rebuilt == summary
+    assert db.query(FormSummaryCounter).filter_by(form_id=form.id, kind="total").count() == 1
+
+
+def test_rebuild_excludes_concurrent_submissions_with_an_advisory_lock():
+    def compiled(exclusive):
+        statement = form_summary._lock_statement("postgresql", 7, exclusive)
+        return str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "pg_advisory_xact_lock_shared(" in compiled(False)
+    assert "pg_advisory_xact_lock(" in compiled(True)
+    assert form_summary._lock_statement("sqlite", 7, True) is None
@@ -0,0 +1,101 @@
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from fastapi import HTTPException
+from app.models import Form
+from app.models.form import fields_version
+from app.services import form_validator
+from app.services.form_validator import (
+    CompiledFormValidator,
+    get_form_validator,
+    invalidate_form_validator,
+)
+
+FIELDS = [
+    {"id": "name", "type": "text", "label": "Nome", "required": True, "order": 0,
+     "validation": [{"rule": "pattern", "value": "[A-Za-z ]+"},
+                    {"rule": "max_length", "value": 10}]},
+    {"id": "age", "type": "number", "label": "Idade", "order": 1,
+     "validation": [{"rule": "min_value", "value": 18},
+                    {"rule": "max_value", "value": 99, "message": "Idade inválida"}]},
+    {"id": "color", "type": "radio", "label": "Cor", "order": 2,
+     "options": [{"label": "Azul", "value": "blue"}, {"label": "Verde", "value": "green"}]},
+    {"id": "tags", "type": "multiselect", "label": "Tags", "order": 3,
+     "options": [{"label": "A", "value": "a"}, {"label": "B", "value": "b"}]},
+    {"id": "email", "type": "email", "label": "Email", "order": 4},
+]
+
+
+def make_form(form_id=1, fields=FIELDS, updated_at=None):
+    return SimpleNamespace(id=form_id, fields=fields, updated_at=updated_at or datetime(2024, 1, 1))
+
+
+def assert_rejected(validator, answers, detail=None):
+    with pytest.raises(HTTPException) as exc:
+        validator.validate(answers)
+    assert exc.value.status_code == 400
+    if detail:
+        assert exc.value.detail == detail
+
+
+def test_valid_answers():
+    validator = CompiledFormValidator(FIELDS)
+    validator.validate({"name": "Ana", "age": 30, "color": "blue", "tags": ["a", "b"],
+                        "email": "ana@example.com"})
+    validator.validate({"name": "Ana", "age": "42", "email": ""})
+
+
+def test_invalid_answers():
+    validator = CompiledFormValidator(FIELDS)
+    assert_rejected(validator, {}, "Field 'Nome' is required")
+    assert_rejected(validator, {"name": ""}, "Field 'Nome' is required")
+    assert_rejected(validator, {"name": "Ana1"})
+    assert_rejected(validator, {"name": "Ana Maria Silva"})
+    assert_rejected(validator, {"name": "Ana", "age": 10})
+    assert_rejected(validator, {"name": "Ana", "age": 120}, "Idade inválida")
+    assert_rejected(validator, {"name": "Ana", "age": True})
+    assert_rejected(validator, {"name": "Ana", "color": "red"})
+    assert_rejected(validator, {"name": "Ana", "tags": "a"})
+    assert_rejected(validator, {"name": "Ana", "tags": ["a", "z"]})
+    assert_rejected(validator, {"name": "Ana", "email": "not-an-email"})
+    assert_rejected(validator, {"name": "Ana", "other": 1}, "Unknown field 'other'")
+
+
+def test_validator_is_cached_per_fields_version():
+    form = make_form()
+    validator = get_form_validator(form)
+    assert get_form_validator(form) is validator
+
+    form.updated_at = datetime(2024, 1, 2)
+    assert get_form_validator(form) is validator
+
+    cached = get_form_validator(form)
+    invalidate_form_validator(1)
+    assert get_form_validator(form) is not cached
+
+
+def test_changed_fields_recompile_without_invalidation():
+    # Mesmo id e mesmo updated_at: outro worker editou no mesmo segundo ou o id foi reaproveitado
+    validator = get_form_validator(make_form())
+    optional = [{**field, "required": False} for field in FIELDS]
+    replaced = get_form_validator(make_form(fields=optional))
+    assert replaced is not validator
+    replaced.validate({})
+
+
+def test_form_stores_fields_version_on_write():
+    form = Form(title="F", fields=FIELDS, owner_id=1)
+    assert form.fields_version == fields_version(FIELDS)
+    form.fields = FIELDS[:1]
+    assert form.fields_version == fields_version(FIELDS[:1])
+
+
+def test_stored_version_skips_hashing_the_fields(monkeypatch):
+    form = Form(id=1, title="F", fields=FIELDS, owner_id=1)
+    validator = get_form_validator(form)
+
+    def fail(fields):
+        raise AssertionError("fields hashed on submission")
+
+    monkeypatch.setattr(form_validator, "fields_version", fail)
+    assert get_form_validator(form) is validator
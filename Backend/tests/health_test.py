@@ -0,0 +1,55 @@
+import asyncio
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.endpoints import monitoring
+from app.services import health_service
+from app.services.health_service import EventLoopLagMonitor
+
+app = FastAPI()
+app.include_router(monitoring.router)
+client = TestClient(app)
+
+
+def test_liveness():
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["uptime"] >= 0
+    assert "cache_size" in data
+
+
+def test_readiness_reports_resources():
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert set(data["checks"]) == {"database_pool", "event_loop", "queues", "password_hasher"}
+    assert {"sync", "async"} <= set(data["database"])
+    assert data["caches"]["forms"]["hit_ratio"] >= 0
+    assert "hit_ratio" in data["caches"]["tokens"]
+    assert data["queues"]["processing_log"]["max_queue"] > 0
+    assert "lag" in data["event_loop"]
+
+
+def test_readiness_fails_when_event_loop_lags(monkeypatch):
+    monkeypatch.setattr(health_service.loop_monitor, "lag", 5.0)
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["event_loop"] is False
+
+
+def test_event_loop_lag_monitor_measures_blocking():
+    async def scenario():
+        monitor = EventLoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # bloqueia o loop
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(scenario())
+    assert monitor.max_lag >= 0.05
+    assert not monitor.running
@@ -0,0 +1,118 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.api.endpoints import monitoring
+from app.core.instrumentation import Metrics, instrument_engine
+from app.middleware.metrics import MetricsMiddleware
+
+registry = Metrics(slow_query_threshold=0.0, slow_query_samples=5)
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+async_engine = create_async_engine("sqlite+aiosqlite://")
+instrument_engine(engine, registry)
+instrument_engine(async_engine.sync_engine, registry)
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware, registry=registry, server_timing=True)
+app.include_router(monitoring.router)
+
+
+@app.get("/items/{item_id}")
+def get_item(item_id: int):
+    with engine.connect() as conn:
+        for _ in range(3):
+            conn.execute(text("SELECT :id"), {"id": item_id})
+    return {"id": item_id}
+
+
+@app.get("/async-items/{item_id}")
+async def get_async_item(item_id: int):
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT :id"), {"id": item_id})
+    return {"id": item_id}
+
+
+@app.get("/broken")
+def broken():
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("SELECT * FROM missing_table"))
+        except Exception:
+            pass
+        conn.execute(text("SELECT 1"))
+    return {}
+
+
+client = TestClient(app)
+
+
+def series(histogram, labels):
+    return histogram.snapshot()[labels]
+
+
+def test_records_statements_and_latency_per_route():
+    registry.clear()
+    for item_id in (1, 2):
+        response = client.get(f"/items/{item_id}")
+        assert response.status_code == 200
+        assert 'desc="3 queries"' in response.headers["server-timing"]
+
+    assert series(registry.request_statements, ("GET", "/items/{item_id}"))[-1] == 2
+    assert series(registry.request_statements, ("GET", "/items/{item_id}"))[-2] == 6
+    assert series(registry.request_latency, ("GET", "/items/{item_id}", "200"))[-1] == 2
+    assert registry.slow_queries[-1].path == "/items/2"
+
+
+def test_async_engine_statements_are_counted():
+    registry.clear()
+    response = client.get("/async-items/7")
+    assert 'desc="1 queries"' in response.headers["server-timing"]
+    assert series(registry.request_statements, ("GET", "/async-items/{item_id}"))[-2] == 1
+
+
+def test_failed_statements_do_not_leak_timers():
+    registry.clear()
+    response = client.get("/broken")
+    assert 'desc="1 queries"' in response.headers["server-timing"]
+    client.get("/items/1")
+    assert series(registry.request_statements, ("GET", "/items/{item_id}"))[-2] == 3
+
+
+def test_unmatched_routes_share_one_label():
+    registry.clear()
+    client.get("/nope/1")
+    client.get("/nope/2")
+    assert series(registry.request_latency, ("GET", "<unmatched>", "404"))[-1] == 2
+
+
+def test_prometheus_text_format():
+    registry.clear()
+    client.get("/items/1")
+    body = registry.render()
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_sql_statements_bucket{method="GET",route="/items/{item_id}",le="2"} 0' in body
+    assert 'http_request_sql_statements_bucket{method="GET",route="/items/{item_id}",le="3"} 1' in body
+    assert 'http_request_sql_statements_bucket{method="GET",route="/items/{item_id}",le="+Inf"} 1' in body
+    assert 'http_request_sql_statements_count{method="GET",route="/items/{item_id}"} 1' in body
+    assert "sql_statement_duration_seconds_count 3" in body
+
+
+def test_metrics_endpoint():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+
+def test_slow_query_report_groups_samples_by_statement():
+    registry.clear()
+    client.get("/items/1")
+    client.get("/broken")
+
+    report = registry.slow_query_report()
+    assert sorted((group["statement"], group["count"]) for group in report) == [("SELECT 1", 1), ("SELECT ?", 3)]
+    assert [group["max_duration"] for group in report] == sorted((group["max_duration"] for group in report), reverse=True)
+    grouped = {group["statement"]: group for group in report}
+    assert grouped["SELECT ?"]["paths"] == ["/items/1"]
+    assert len({group["fingerprint"] for group in report}) == 2
@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+from app.core.config import get_settings
+from app.core.database import Base
+from app.models.form import fields_version
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def migrations(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    monkeypatch.setattr(get_settings(), "DATABASE_URL", url)
+    config = Config(str(BACKEND / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    engine = create_engine(url)
+    yield config, engine
+    engine.dispose()
+
+
+def seed_baseline(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, full_name, hashed_password, is_active, is_admin) "
+            "VALUES (1, 'a@example.com', 'A', 'x', 1, 0), (2, 'b@example.com', 'B', 'x', 1, 0)"
+        ))
+        for form_id, settings in ((1, {}), (2, {"one_response_per_user": False})):
+            conn.execute(text(
+                "INSERT INTO forms (id, title, description, fields, settings, is_active, owner_id) "
+                "VALUES (:id, 'F', '', '[]', :settings, 1, 1)"
+            ), {"id": form_id, "settings": json.dumps(settings)})
+        # Duplicatas de antes do índice único: só a primeira de cada usuário é marcada
+        for response_id, form_id, respondent_id in ((1, 1, 1), (2, 1, 1), (3, 1, 2), (4, 1, None), (5, 2, 1), (6, 2, 1)):
+            conn.execute(text(
+                "INSERT INTO form_responses (id, form_id, respondent_id, responses) VALUES (:id, :form_id, :user, '{}')"
+            ), {"id": response_id, "form_id": form_id, "user": respondent_id})
+
+
+def test_upgrade_backfills_unique_respondents(migrations):
+    config, engine = migrations
+    command.upgrade(config, "fad329416961")
+    seed_baseline(engine)
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        marked = conn.execute(text("SELECT id, unique_respondent_id FROM form_responses ORDER BY id")).all()
+    assert marked == [(1, 1), (2, None), (3, 2), (4, None), (5, None), (6, None)]
+
+
+def test_upgrade_normalizes_sqlite_timestamps(migrations):
+    config, engine = migrations
+    command.upgrade(config, "fad329416961")
+    seed_baseline(engine)
+
+    command.upgrade(config, "head")
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO form_responses (id, form_id, responses, unique_respondent_id) VALUES (7, 1, '{}', NULL)"
+        ))
+        lengths = conn.execute(text("SELECT DISTINCT length(created_at) FROM form_responses")).scalars().all()
+    # Linhas antigas completadas e o server_default já no formato do SQLAlchemy
+    assert lengths == [26]
+
+
+def test_upgrade_backfills_fields_version(migrations):
+    config, engine = migrations
+    command.upgrade(config, "fad329416961")
+    seed_baseline(engine)
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        versions = conn.execute(text("SELECT fields_version FROM forms ORDER BY id")).scalars().all()
+    assert versions == [fields_version([]), fields_version([])]
+
+
+def test_downgrade_merges_summary_shards(migrations):
+    config, engine = migrations
+    command.upgrade(config, "fad329416961")
+    seed_baseline(engine)
+    command.upgrade(config, "head")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO form_summary_counters (form_id, kind, field_id, bucket, shard, count, value_sum, value_min, value_max) "
+            "VALUES (1, 'number', 'n', '', 0, 2, 5.0, 1.0, 4.0), (1, 'number', 'n', '', 3, 1, 7.0, 7.0, 7.0)"
+        ))
+
+    command.downgrade(config, "dfab491ec0d0")
+
+    with engine.connect() as conn:
+        merged = conn.execute(text("SELECT count, value_sum, value_min, value_max FROM form_summary_counters")).all()
+    assert merged == [(3, 12.0, 1.0, 7.0)]
+
+
+def test_migrations_match_models(migrations):
+    config, engine = migrations
+    command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+
+    command.downgrade(config, "base")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'alembic_version'")).all() == []
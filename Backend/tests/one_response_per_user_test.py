@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.models import FormResponse, User
+from app.schemas.form import FormCreate, FormUpdate
+from app.services.form_service import AsyncFormService, FormService
+from app.services.submission_dedup import submitted_respondents
+
+
+def form_data(one_response_per_user: bool) -> dict:
+    return {
+        "title": "Inscrição",
+        "description": "Uma inscrição por pessoa",
+        "fields": [{"id": "nome", "type": "text", "label": "Nome", "order": 0}],
+        "settings": {"is_public": True, "one_response_per_user": one_response_per_user},
+    }
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="ana@example.com", full_name="Ana", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def create_form(db, user, one_response_per_user=True):
+    form = FormService.create_form(db, FormCreate(**form_data(one_response_per_user)), user.id)
+    return form
+
+
+def count_responses(db, form_id):
+    return db.scalar(select(func.count()).where(FormResponse.form_id == form_id))
+
+
+def test_unique_index_rejects_second_response(db, user):
+    form = create_form(db, user)
+    FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+
+    # Sem o cache, o conflito vem do índice único
+    submitted_respondents.clear()
+    with pytest.raises(HTTPException) as error:
+        FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+    assert error.value.status_code == 400
+    assert count_responses(db, form.id) == 1
+
+    # Anônimos não são restringidos
+    FormService.submit_response(db, form.id, {"nome": "Anônimo"})
+    FormService.submit_response(db, form.id, {"nome": "Anônimo"})
+    assert count_responses(db, form.id) == 3
+
+
+def test_cached_duplicate_is_rejected_without_queries(engine, db, user):
+    form = create_form(db, user)
+    FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+    assert submitted_respondents.seen(form.id, user.id)
+
+    inserts = []
+
+    def record_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_insert)
+    try:
+        with pytest.raises(HTTPException):
+            FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_insert)
+    assert inserts == []
+
+
+def test_forms_without_restriction_accept_repeated_responses(db, user):
+    form = create_form(db, user, one_response_per_user=False)
+    FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+    FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+    assert count_responses(db, form.id) == 2
+    assert not submitted_respondents.seen(form.id, user.id)
+
+
+def test_enabling_restriction_marks_existing_respondents(db, user):
+    form = create_form(db, user, one_response_per_user=False)
+    FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+    FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+
+    FormService.update_form(db, form.id, FormUpdate(**form_data(True)), user.id)
+    marked = db.scalars(
+        select(FormResponse.unique_respondent_id)
+        .where(FormResponse.form_id == form.id)
+        .order_by(FormResponse.id)
+    ).all()
+    assert marked == [user.id, None]
+    with pytest.raises(HTTPException):
+        FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+
+    FormService.update_form(db, form.id, FormUpdate(**form_data(False)), user.id)
+    submitted_respondents.clear()
+    FormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+    assert count_responses(db, form.id) == 3
+
+
+def test_concurrent_async_submissions_store_one_response(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'forms.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as db:
+            user = User(email="ana@example.com", full_name="Ana", hashed_password="x")
+            db.add(user)
+            await db.commit()
+            form = await AsyncFormService.create_form(db, FormCreate(**form_data(True)), user.id)
+
+        async def submit():
+            async with sessions() as db:
+                try:
+                    await AsyncFormService.submit_response(db, form.id, {"nome": "Ana"}, user_id=user.id)
+                    return True
+                except HTTPException:
+                    return False
+
+        results = await asyncio.gather(*(submit() for _ in range(5)))
+        async with sessions() as db:
+            stored = await db.scalar(select(func.count()).where(FormResponse.form_id == form.id))
+        await engine.dispose()
+        return results, stored
+
+    results, stored = asyncio.run(scenario())
+    assert results.count(True) == 1
+    assert stored == 1
@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import text
+from app.models import User
+from app.utils.pagination import _keyset_criterion, _ordering, decode_cursor, encode_cursor, keyset_paginate
+
+
+def walk(db, limit):
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        users, cursor = keyset_paginate(db.query(User), User, cursor, limit)
+        seen.extend(user.id for user in users)
+    return seen
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 250)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_invalid_cursor():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_keyset_pagination_walks_every_row_once(db):
+    # Todos criados no mesmo segundo: o id desempata a ordenação
+    db.add_all(User(email=f"user{i}@example.com", full_name="User", hashed_password="x") for i in range(25))
+    db.commit()
+
+    seen = walk(db, 10)
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 25
+
+
+def test_keyset_pagination_with_whole_second_timestamps(db):
+    db.add_all(
+        User(email=f"user{i}@example.com", full_name="User", hashed_password="x",
+             created_at=datetime(2024, 1, 1, 0, 0, i % 2))
+        for i in range(7)
+    )
+    db.commit()
+
+    assert walk(db, 2) == [6, 4, 2, 7, 5, 3, 1]
+
+
+def test_keyset_pagination_mixes_server_default_and_python_timestamps(db):
+    # Linhas gravadas pelo server_default (SQL puro) e pelo SQLAlchemy
+    for i in range(9):
+        if i % 2:
+            db.execute(text(
+                "INSERT INTO users (email, full_name, hashed_password, is_active, is_admin, updated_at) "
+                "VALUES (:email, 'User', 'x', 1, 0, CURRENT_TIMESTAMP)"
+            ), {"email": f"raw{i}@example.com"})
+        else:
+            db.add(User(email=f"user{i}@example.com", full_name="User", hashed_password="x"))
+        db.flush()
+    db.commit()
+
+    expected = [user.id for user in db.query(User).order_by(User.created_at.desc(), User.id.desc())]
+    assert walk(db, 2) == expected
+    assert db.scalars(text("SELECT DISTINCT length(created_at) FROM users")).all() == [26]
+
+
+def test_keyset_pagination_uses_the_created_at_index(db):
+    cursor = encode_cursor(datetime(2024, 1, 1), 10)
+    statement = db.query(User).filter(_keyset_criterion(User, cursor)).order_by(*_ordering(User)).limit(3).statement
+    compiled = statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+
+    plan = " ".join(row[3] for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "ix_users_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_keyset_pagination_with_microseconds(db):
+    db.add_all(
+        User(
+            email=f"user{i}@example.com",
+            full_name="User",
+            hashed_password="x",
+            created_at=datetime(2024, 1, 1, 0, 0, i % 3, 500)
+        )
+        for i in range(7)
+    )
+    db.commit()
+
+    seen = walk(db, 2)
+
+    assert len(seen) == len(set(seen)) == 7
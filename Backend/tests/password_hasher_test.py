@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.models import User
+from app.services.auth_service import AsyncAuthService
+from app.services.password_hasher import PasswordHasherPool, pwd_context
+
+
+def test_pool_rejects_when_saturated():
+    pool = PasswordHasherPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc:
+            await pool.hash("secret")
+        assert exc.value.status_code == 503
+        release.set()
+        await asyncio.gather(*running)
+        assert pool.pending == 0
+
+    asyncio.run(scenario())
+    pool.shutdown()
+
+
+def test_login_rehashes_when_cost_changes():
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            db.add(User(email="user@example.com", full_name="User", hashed_password=old_hash))
+            await db.commit()
+
+            assert await AsyncAuthService.authenticate_user(db, "user@example.com", "wrong") is None
+            user = await AsyncAuthService.authenticate_user(db, "user@example.com", "secret")
+            assert user.hashed_password != old_hash
+            assert not pwd_context.needs_update(user.hashed_password)
+        await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import threading
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.core.config import get_settings
+from app import main
+from app.core.database import Base
+from app.models import ProcessingLog
+from app.schemas.processing_log import ProcessingLogCreate
+from app.services.audit_log_service import audit_log_writer
+from app.services import batch_writer
+from app.services.batch_writer import OVERFLOW_BLOCK, BatchWriter
+from app.services.processing_log_service import _log_row
+
+settings = get_settings()
+LOG = ProcessingLogCreate(user_id=1, action="import", details="step", status="ok")
+
+
+async def make_writer(**options) -> BatchWriter:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return BatchWriter(ProcessingLog, session_factory=async_sessionmaker(engine), **options)
+
+
+def test_drop_policy_discards_when_full():
+    async def scenario():
+        writer = await make_writer(batch_size=10, flush_interval=60, max_queue=2)
+        assert [writer.enqueue(_log_row(LOG)) for _ in range(3)] == [True, True, False]
+        assert (writer.pending, writer.dropped) == (2, 1)
+        assert await writer.flush() == 2
+
+    asyncio.run(scenario())
+
+
+def test_block_policy_applies_backpressure():
+    async def scenario():
+        writer = await make_writer(batch_size=2, flush_interval=60, max_queue=2, overflow=OVERFLOW_BLOCK)
+        for _ in range(5):
+            assert await writer.put(_log_row(LOG))
+        assert (writer.written, writer.pending, writer.dropped) == (4, 1, 0)
+
+        # Em outra thread, enqueue espera o flusher liberar espaço
+        writer.start()
+        writer.enqueue(_log_row(LOG))
+        thread = threading.Thread(target=lambda: writer.enqueue(_log_row(LOG)))
+        thread.start()
+        while thread.is_alive():
+            await asyncio.sleep(0.01)
+        await writer.stop()
+        assert (writer.written, writer.pending, writer.dropped) == (7, 0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_rejected_rows_are_isolated_after_retries():
+    async def scenario():
+        writer = await make_writer(batch_size=10, flush_interval=60, max_retries=2)
+        rows = [_log_row(LOG) for _ in range(7)]
+        rows[4]["action"] = None  # NOT NULL
+        for row in rows:
+            writer.enqueue(row)
+
+        with pytest.raises(IntegrityError):
+            await writer.flush()
+        assert (writer.pending, writer.written, writer.failed) == (7, 0, 0)
+
+        assert await writer.flush() == 6
+        assert (writer.pending, writer.written, writer.failed) == (0, 6, 1)
+        writer.enqueue(_log_row(LOG))
+        assert await writer.flush() == 1
+
+    asyncio.run(scenario())
+
+
+def test_database_outage_keeps_rows_queued():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        writer = BatchWriter(ProcessingLog, batch_size=10, flush_interval=60,
+                             session_factory=async_sessionmaker(engine), max_retries=1)
+        for _ in range(3):
+            writer.enqueue(_log_row(LOG))
+        # Sem a tabela o SQLite levanta OperationalError, como um banco indisponível
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await writer.flush()
+        assert (writer.pending, writer.failed) == (3, 0)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        assert await writer.flush() == 3
+
+    asyncio.run(scenario())
+
+
+def test_stop_logs_flush_failures_instead_of_raising(caplog, monkeypatch):
+    # fileConfig do Alembic (migrations_test) desativa os loggers já criados
+    monkeypatch.setattr(batch_writer.logger, "disabled", False)
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        writer = BatchWriter(ProcessingLog, batch_size=10, flush_interval=60,
+                             session_factory=async_sessionmaker(engine))
+        writer.start()
+        writer.enqueue(_log_row(LOG))
+        await writer.stop()
+        assert writer.pending == 1
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(scenario())
+    assert "1 linhas perdidas" in caplog.text
+
+
+def test_lifespan_runs_every_shutdown_step(monkeypatch):
+    stopped = []
+
+    def component(name, fail=False):
+        async def stop():
+            stopped.append(name)
+            if fail:
+                raise OperationalError("INSERT", {}, Exception("database is down"))
+        return SimpleNamespace(start=lambda: None, stop=stop)
+
+    monkeypatch.setattr(main.settings, "DB_CREATE_TABLES", False)
+    monkeypatch.setattr(main, "loop_monitor", component("loop_monitor"))
+    monkeypatch.setattr(main, "processing_log_writer", component("processing_log_writer", fail=True))
+    monkeypatch.setattr(main, "audit_log_writer", component("audit_log_writer"))
+    monkeypatch.setattr(main, "password_hasher", SimpleNamespace(shutdown=lambda: stopped.append("password_hasher")))
+
+    async def scenario():
+        async with main.lifespan(main.app):
+            pass
+
+    asyncio.run(scenario())
+    assert stopped == ["loop_monitor", "processing_log_writer", "audit_log_writer", "password_hasher"]
+
+
+def test_audit_log_queue_is_bounded():
+    assert audit_log_writer.max_queue == settings.AUDIT_LOG_MAX_QUEUE
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from app.core.config import Settings
+from app.middleware.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitMiddleware,
+    SQLiteRateLimitBackend,
+    parse_rate,
+)
+
+settings = Settings(RATE_LIMIT_DEFAULT="5/minute", RATE_LIMIT_LOGIN="2/minute")
+
+
+def make_client(backend=None) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, settings=settings, backend=backend if backend is not None else InMemoryRateLimitBackend())
+
+    @app.get("/items")
+    def items():
+        return []
+
+    @app.post(f"{settings.API_V1_STR}/login")
+    def login():
+        return {}
+
+    @app.get("/health")
+    @app.get("/health/ready")
+    @app.get("/metrics")
+    def health():
+        return {"status": "healthy"}
+
+    return TestClient(app)
+
+
+def test_token_bucket_refills_over_time():
+    backend = InMemoryRateLimitBackend()
+    capacity, rate = parse_rate("2/second")
+    assert backend.take(["k"], capacity, rate, 0.0) == (True, 0.0)
+    assert backend.take(["k"], capacity, rate, 0.0)[0]
+    allowed, retry_after = backend.take(["k"], capacity, rate, 0.0)
+    assert not allowed and retry_after == 0.5
+    assert backend.take(["k"], capacity, rate, 0.5)[0]
+
+
+def test_in_memory_backend_is_bounded():
+    backend = InMemoryRateLimitBackend(max_keys=3)
+    for i in range(10):
+        backend.take([f"k{i}"], 1, 1, 0.0)
+    assert len(backend) == 3
+
+
+def test_route_budgets_and_429():
+    client = make_client()
+    assert [client.post(f"{settings.API_V1_STR}/login").status_code for _ in range(3)] == [200, 200, 429]
+
+    statuses = [client.get("/items").status_code for _ in range(6)]
+    assert statuses == [200] * 5 + [429]
+    response = client.get("/items")
+    assert int(response.headers["retry-after"]) >= 1
+
+
+def test_monitoring_routes_are_not_limited():
+    client = make_client()
+    for path in ("/health", "/health/ready", "/metrics"):
+        assert {client.get(path).status_code for _ in range(20)} == {200}
+    # O tráfego de monitoramento não consome o orçamento padrão
+    assert [client.get("/items").status_code for _ in range(6)] == [200] * 5 + [429]
+
+
+def test_per_user_bucket_applies_across_ips():
+    backend = InMemoryRateLimitBackend()
+    token = jwt.encode({"sub": "user@example.com"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def get(ip: str) -> int:
+        transport = httpx.ASGITransport(app=make_client(backend).app, client=(ip, 1234))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.get("/items", headers=headers)).status_code
+
+    assert [asyncio.run(get("10.0.0.1")) for _ in range(5)] == [200] * 5
+    # O bucket do novo IP está cheio, mas o do usuário já foi consumido
+    assert asyncio.run(get("10.0.0.2")) == 429
+
+
+@pytest.mark.parametrize("make_backend", [
+    lambda tmp_path: InMemoryRateLimitBackend(),
+    lambda tmp_path: SQLiteRateLimitBackend(str(tmp_path / "ratelimit.db")),
+])
+def test_rejected_request_is_not_charged_to_other_buckets(tmp_path, make_backend):
+    backend = make_backend(tmp_path)
+    assert backend.take(["user"], 1, 0.001, 100.0)[0]
+    for _ in range(3):
+        assert not backend.take(["ip", "user"], 1, 0.001, 100.0)[0]
+    # Recusado pelo bucket do usuário: o do IP continua cheio
+    assert backend.take(["ip"], 1, 0.001, 100.0) == (True, 0.0)
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    first, second = SQLiteRateLimitBackend(path), SQLiteRateLimitBackend(path)
+    assert first.take(["k"], 1, 0.001, 100.0)[0]
+    assert not second.take(["k"], 1, 0.001, 100.0)[0]
+
+
+def test_sqlite_backend_runs_off_the_event_loop(tmp_path):
+    class RecordingBackend(SQLiteRateLimitBackend):
+        def take(self, *args):
+            self.thread = threading.current_thread()
+            return super().take(*args)
+
+    backend = RecordingBackend(str(tmp_path / "ratelimit.db"))
+    assert make_client(backend).get("/items").status_code == 200
+    assert backend.thread is not threading.main_thread()
+
+    async def acquire():
+        loop_thread = threading.current_thread()
+        await backend.acquire(["k"], 1, 1, 0.0)
+        return loop_thread
+
+    assert asyncio.run(acquire()) is not backend.thread
@@ -0,0 +1,44 @@
+import pytest
+from jose import JWTError
+from app.models import User
+from app.models.user import UserSession
+from app.services.auth_cache import token_cache
+from app.services.auth_service import AuthService
+from app.services.token_revocation import revocation_store
+
+
+@pytest.fixture
+def user(db) -> User:
+    user = User(email="user@example.com", full_name="User", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_refresh_rotates_session_token(db, user):
+    tokens = AuthService.create_session_tokens(db, user, "pytest", "127.0.0.1")
+    rotated = AuthService.refresh_token(db, tokens.refresh_token)
+
+    assert rotated.refresh_token != tokens.refresh_token
+    assert token_cache.decode(rotated.access_token)["sid"] == db.query(UserSession).one().id
+    AuthService.refresh_token(db, rotated.refresh_token)
+
+
+def test_reusing_rotated_token_ends_session(db, user):
+    tokens = AuthService.create_session_tokens(db, user, "pytest", "127.0.0.1")
+    rotated = AuthService.refresh_token(db, tokens.refresh_token)
+
+    with pytest.raises(ValueError):
+        AuthService.refresh_token(db, tokens.refresh_token)
+    assert db.query(UserSession).count() == 0
+    assert revocation_store.is_revoked(token_cache.decode(rotated.access_token))
+    with pytest.raises(ValueError):
+        AuthService.refresh_token(db, rotated.refresh_token)
+
+
+def test_token_types_are_not_interchangeable(db, user):
+    tokens = AuthService.create_session_tokens(db, user, "pytest", "127.0.0.1")
+    with pytest.raises(ValueError):
+        AuthService.refresh_token(db, tokens.access_token)
+    with pytest.raises(JWTError):
+        token_cache.decode(tokens.refresh_token)
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import event, func, select
+from app.models import FormResponse, ResponseAnswer, User
+from app.schemas.form import FormCreate
+from app.services.form_service import FormService
+from app.services.response_answers import ResponseAnswerService
+
+FORM = {
+    "title": "Pesquisa",
+    "description": "Avaliação do atendimento",
+    "fields": [
+        {"id": "nota", "type": "number", "label": "Nota", "order": 0},
+        {"id": "canal", "type": "radio", "label": "Canal", "order": 1,
+         "options": [{"value": "site", "label": "Site"}, {"value": "loja", "label": "Loja"}]},
+        {"id": "temas", "type": "multiselect", "label": "Temas", "order": 2,
+         "options": [{"value": "preco", "label": "Preço"}, {"value": "prazo", "label": "Prazo"}]},
+        {"id": "data", "type": "date", "label": "Data", "order": 3},
+    ],
+    "settings": {"is_public": True, "one_response_per_user": False},
+}
+
+
+@pytest.fixture
+def form(db):
+    owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    form = FormService.create_form(db, FormCreate(**FORM), owner.id)
+    return form
+
+
+def test_submit_populates_typed_rows(db, form):
+    FormService.submit_response(db, form.id, {"nota": 8, "canal": "site", "temas": ["preco", "prazo"],
+                                              "data": "2024-05-01"})
+    FormService.submit_responses_bulk(db, form.id, enumerate([
+        {"answers": {"nota": 4, "canal": "loja", "temas": ["preco"]}},
+        {"answers": {"nota": 6, "canal": "site"}},
+    ]), form.owner_id)
+
+    assert ResponseAnswerService.value_counts(db, form.id, "canal") == [("site", 2), ("loja", 1)]
+    assert ResponseAnswerService.value_counts(db, form.id, "temas") == [("preco", 2), ("prazo", 1)]
+    assert ResponseAnswerService.numeric_stats(db, form.id, "nota") == {"count": 3, "min": 4.0, "max": 8.0, "mean": 6.0}
+    row = db.scalars(select(ResponseAnswer).where(ResponseAnswer.field_id == "data")).one()
+    assert row.value_date.isoformat() == "2024-05-01"
+
+
+def test_rebuild_matches_incremental_rows(db, form):
+    for nota in (1, 2, 3):
+        FormService.submit_response(db, form.id, {"nota": nota, "temas": ["prazo"]})
+    count = db.scalar(select(func.count()).select_from(ResponseAnswer))
+
+    assert ResponseAnswerService.rebuild(db, form, batch_size=2) == count
+    assert db.scalar(select(func.count()).select_from(ResponseAnswer)) == count
+    assert ResponseAnswerService.numeric_stats(db, form.id, "nota")["mean"] == 2.0
+
+
+def test_delete_form_does_not_load_responses(db, engine, form):
+    for nota in range(5):
+        FormService.submit_response(db, form.id, {"nota": nota, "temas": ["preco", "prazo"]})
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    FormService.delete_form(db, form.id, form.owner_id)
+
+    selects = [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+    assert not any("form_responses" in statement or "response_answers" in statement for statement in selects)
+    assert db.scalar(select(func.count()).select_from(ResponseAnswer)) == 0
+    assert db.scalar(select(func.count()).select_from(FormResponse)) == 0
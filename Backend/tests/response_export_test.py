@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+from app.models import User
+from app.schemas.form import FormCreate
+from app.services import form_service
+from app.services.form_service import FormService
+
+FORM = {
+    "title": "Evento",
+    "description": "Inscrições",
+    "fields": [
+        {"id": "temas", "type": "multiselect", "label": "Temas", "order": 1,
+         "options": [{"value": "a", "label": "A"}, {"value": "b", "label": "B"}]},
+        {"id": "nome", "type": "text", "label": "Nome", "order": 0},
+    ],
+    "settings": {"is_public": True},
+}
+
+
+@pytest.fixture
+def form(db, engine, monkeypatch):
+    # A exportação abre a própria sessão, que precisa enxergar o banco do teste
+    monkeypatch.setattr(form_service, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(form_service.settings, "EXPORT_BATCH_SIZE", 2)
+    owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    return FormService.create_form(db, FormCreate(**FORM), owner.id)
+
+
+def submit_all(db, form, count):
+    for index in range(count):
+        FormService.submit_response(db, form.id, {"nome": f"P{index}", "temas": ["a", "b"][:index % 3]})
+
+
+def test_csv_export_streams_one_chunk_per_batch(db, form):
+    submit_all(db, form, 5)
+    chunks = list(FormService.export_responses(db, form.id, form.owner_id, "csv"))
+    assert len(chunks) == 3
+
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == ["response_id", "submitted_at", "respondent_id", "respondent_email", "Nome", "Temas"]
+    assert [row[4] for row in rows[1:]] == [f"P{index}" for index in range(5)]
+    assert [row[5] for row in rows[1:4]] == ["", "a", "a; b"]
+
+
+def test_csv_export_of_empty_form_has_header_only(db, form):
+    content = "".join(FormService.export_responses(db, form.id, form.owner_id, "csv"))
+    assert content.splitlines() == ["response_id,submitted_at,respondent_id,respondent_email,Nome,Temas"]
+
+
+def test_ndjson_export_keeps_answers(db, form):
+    submit_all(db, form, 3)
+    lines = "".join(FormService.export_responses(db, form.id, form.owner_id, "ndjson")).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["answers"]["nome"] for record in records] == ["P0", "P1", "P2"]
+    assert records[2]["answers"]["temas"] == ["a", "b"]
+    assert all(record["submitted_at"] for record in records)
+
+
+def test_export_checks_owner_and_format(db, form):
+    with pytest.raises(HTTPException) as exc:
+        FormService.export_responses(db, form.id, form.owner_id + 1, "csv")
+    assert exc.value.status_code == 403
+    with pytest.raises(HTTPException) as exc:
+        FormService.export_responses(db, form.id, form.owner_id, "xlsx")
+    assert exc.value.status_code == 400
@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+from sqlalchemy import create_engine, inspect
+from app.core.database import Base, create_tables
+from app.utils.user_agent import user_agent_info
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_CHECK = """
+import json, sys
+import app.main
+print(json.dumps({"loaded": [name for name in ("user_agents", "geoip2") if name in sys.modules]}))
+"""
+
+STARTUP_CHECK = """
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    print(json.dumps({path: client.get(path).status_code for path in ("/health", "/metrics", "/api/v1/admin/users")}))
+"""
+
+
+def run_backend(code: str, database) -> str:
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR, "DATABASE_URL": f"sqlite:///{database}"}
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return output.stdout.strip().splitlines()[-1]
+
+
+def test_importing_the_app_does_not_touch_the_database(tmp_path):
+    database = tmp_path / "startup.db"
+    assert json.loads(run_backend(IMPORT_CHECK, database)) == {"loaded": []}
+    assert not database.exists()
+
+
+def test_app_starts_and_mounts_its_routes(tmp_path):
+    statuses = json.loads(run_backend(STARTUP_CHECK, tmp_path / "startup.db"))
+    # O router administrativo exige autenticação
+    assert statuses == {"/health": 200, "/metrics": 200, "/api/v1/admin/users": 401}
+
+
+def test_create_tables_registers_every_model():
+    engine = create_engine("sqlite://")
+    create_tables(engine)
+    assert set(inspect(engine).get_table_names()) == set(Base.metadata.tables)
+    assert {"users", "forms", "form_responses", "response_answers"} <= set(Base.metadata.tables)
+
+
+def test_user_agent_info_always_returns_every_field():
+    info = user_agent_info("Mozilla/5.0 (X11; Linux x86_64) Firefox/120.0")
+    assert info._fields == ("browser", "browser_version", "os", "device")
+    assert all(isinstance(value, str) for value in info)
@@ -0,0 +1,98 @@
+import time
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from app.api.deps import get_current_user
+from app.models import User
+from app.services.auth_cache import token_cache
+from app.services.auth_service import AuthService
+from app.services.token_revocation import TokenRevocationStore, revocation_store
+
+
+def make_token(user_id: int, minutes: int = 5) -> str:
+    return AuthService.create_access_token({"sub": str(user_id)}, timedelta(minutes=minutes))
+
+
+@pytest.fixture
+def user(db) -> User:
+    user = User(email="user@example.com", full_name="User", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_revoked_token_is_rejected(db, user):
+    revoked, other = make_token(user.id), make_token(user.id)
+    revocation_store.revoke_token(db, token_cache.decode(revoked))
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(db, revoked)
+    assert exc.value.status_code == 401
+    assert get_current_user(db, other).id == user.id
+
+
+def test_revoke_user_rejects_previously_issued_tokens(db, user):
+    token = make_token(user.id)
+    revocation_store.revoke_user(db, user.id)
+    with pytest.raises(HTTPException):
+        get_current_user(db, token)
+
+
+def test_other_processes_sync_from_table(db, user):
+    claims = token_cache.decode(make_token(user.id))
+    revocation_store.revoke_token(db, claims)
+
+    worker = TokenRevocationStore(sync_interval=60)
+    assert not worker.is_revoked(claims)
+    worker.sync(db)
+    assert worker.is_revoked(claims)
+    assert len(worker) == 1
+
+
+def test_entries_expire_with_the_token(db, user):
+    claims = token_cache.decode(make_token(user.id))
+    revocation_store.revoke_token(db, dict(claims, exp=time.time() + 0.05))
+    assert revocation_store.is_revoked(claims)
+    time.sleep(0.1)
+    assert not revocation_store.is_revoked(claims)
+    assert len(revocation_store) == 0
+
+
+def test_token_issued_after_revoke_user_in_the_same_second_is_valid(db, user):
+    before = make_token(user.id)
+    revocation_store.revoke_user(db, user.id)
+    after = make_token(user.id)
+
+    with pytest.raises(HTTPException):
+        get_current_user(db, before)
+    assert get_current_user(db, after).id == user.id
+
+
+def test_local_revocation_does_not_skip_other_workers_rows(db, user):
+    worker = TokenRevocationStore(sync_interval=0)
+    worker.sync(db)
+    # Outro processo confirma uma revogação que este worker ainda não leu...
+    other = token_cache.decode(make_token(user.id))
+    TokenRevocationStore(sync_interval=0).revoke_token(db, other)
+    # ...e depois este worker revoga um token próprio, com id maior
+    worker.revoke_token(db, token_cache.decode(make_token(user.id)))
+
+    worker.sync(db)
+    assert worker.is_revoked(other)
+
+
+def test_sync_rereads_rows_committed_out_of_id_order(db, user):
+    worker = TokenRevocationStore(sync_interval=0)
+    late = TokenRevocationStore._token_row(token_cache.decode(make_token(user.id)))
+    early = TokenRevocationStore._token_row(token_cache.decode(make_token(user.id)))
+    late.id = 2
+    db.add(late)
+    db.commit()
+    worker.sync(db)
+    # id 1 reservado antes, mas confirmado depois da sincronização
+    early.id = 1
+    db.add(early)
+    db.commit()
+
+    worker.sync(db)
+    assert worker.is_revoked({"jti": early.jti})